@@ -9,19 +9,52 @@ Or from inside backend/:
     uvicorn app:app --port 8000 --reload
 """
 
-from fastapi import FastAPI, HTTPException
+import asyncio
+import contextlib
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from typing import Iterator, NamedTuple, Optional
 import os
 
 import cache
 import feats as feats_catalog
 import nba_client
+import responses
+import scheduler
+import static_assets
+import stats_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prewarm every ranking and keep live ones refreshed while the app runs."""
+    print(f"[startup] Mock index   : {nba_client.preload_mocks()} files")
+    refresher = scheduler.RefreshScheduler(
+        warm=warm_ranking,
+        refresh=refresh_ranking,
+        warm_many=warm_rankings,
+        feat_ids=feats_catalog.FEATS,
+        live_feat_ids=[
+            f["id"] for f in feats_catalog.FEATS.values() if f["source_strategy"] == "live"
+        ],
+        ttl=cache.DEFAULT_TTL,
+    )
+    if scheduler.ENABLED:
+        await refresher.start()
+    yield
+    await refresher.stop()
+    await stats_client.aclose()
+
 
 app = FastAPI(
     title="Rodman Historic Feats API",
     description="Because The Worm deserves an API.",
     version="2.0.0",
+    lifespan=lifespan,
+    default_response_class=responses.FastJSONResponse,
 )
 
 app.add_middleware(
@@ -44,86 +77,415 @@ print(f"[startup] Frontend dir : {FRONTEND_DIR}")
 print(f"[startup] index.html   : {os.path.isfile(os.path.join(FRONTEND_DIR, 'index.html'))}")
 
 
+# Whole frontend held in memory, precompressed, CSS/JS under fingerprinted URLs
+ASSETS = static_assets.AssetStore(FRONTEND_DIR)
+
+
+def _serve_asset(request: Request, path: str) -> Response:
+    response = ASSETS.respond(
+        path,
+        request.headers.get("accept-encoding"),
+        request.headers.get("if-none-match"),
+    )
+    if response is None:
+        raise HTTPException(status_code=404, detail="Not found.")
+    return response
+
+
 @app.get("/", include_in_schema=False)
-def serve_index():
-    return FileResponse(os.path.join(FRONTEND_DIR, "index.html"))
+def serve_index(request: Request):
+    return _serve_asset(request, "/index.html")
 
 @app.get("/timeline", include_in_schema=False)
-def serve_timeline():
-    return FileResponse(os.path.join(FRONTEND_DIR, "timeline.html"))
+def serve_timeline(request: Request):
+    return _serve_asset(request, "/timeline.html")
 
 @app.get("/career", include_in_schema=False)
-def serve_career():
-    return FileResponse(os.path.join(FRONTEND_DIR, "career.html"))
+def serve_career(request: Request):
+    return _serve_asset(request, "/career.html")
 
 @app.get("/ranking", include_in_schema=False)
-def serve_ranking():
-    return FileResponse(os.path.join(FRONTEND_DIR, "ranking.html"))
+def serve_ranking(request: Request):
+    return _serve_asset(request, "/ranking.html")
 
 @app.get("/style.css", include_in_schema=False)
-def serve_css():
-    return FileResponse(os.path.join(FRONTEND_DIR, "style.css"))
+def serve_css(request: Request):
+    return _serve_asset(request, "/style.css")
 
 @app.get("/app.js", include_in_schema=False)
-def serve_js():
-    return FileResponse(os.path.join(FRONTEND_DIR, "app.js"))
+def serve_js(request: Request):
+    return _serve_asset(request, "/app.js")
+
+@app.get("/assets/{filename}", include_in_schema=False)
+def serve_fingerprinted(request: Request, filename: str):
+    return _serve_asset(request, f"/assets/{filename}")
 
 
 # ---------------------------------------------------------------------------
 # API Routes
 # ---------------------------------------------------------------------------
 
+def _send(request: Request, encoded: responses.EncodedBody) -> Response:
+    """
+    Cached body out with its ETag (304 if the client has it), TTL-aligned
+    freshness and the best encoding the client accepts (compressed once, cached).
+    """
+    return responses.to_response(
+        encoded,
+        request.headers.get("if-none-match"),
+        cache.DEFAULT_TTL,
+        request.headers.get("accept-encoding"),
+    )
+
+
+async def _send_async(request: Request, encoded: responses.EncodedBody) -> Response:
+    """_send for async routes: compressing and the variant cache stay off the event loop."""
+    return await responses.to_response_async(
+        encoded,
+        request.headers.get("if-none-match"),
+        cache.DEFAULT_TTL,
+        request.headers.get("accept-encoding"),
+    )
+
+
 @app.get("/api/feats", summary="List all historic feats")
-def list_feats():
-    return {
+def list_feats(request: Request):
+    encoded = cache.get_or_set("feats:all", lambda: responses.encode({
         "feats": feats_catalog.get_all_feats(),
         "total": len(feats_catalog.FEATS),
-    }
+    }))
+    return _send(request, encoded)
+
+
+# Catalog fields that drive fetching and never leave the server
+INTERNAL_FEAT_FIELDS = ("source_strategy", "mock_file", "live_query")
 
 
 @app.get("/api/feats/{feat_id}", summary="Get feat metadata")
-def get_feat_meta(feat_id: str):
+def get_feat_meta(feat_id: str, request: Request):
     feat = feats_catalog.get_feat(feat_id)
     if feat is None:
         raise HTTPException(status_code=404, detail=f"Feat '{feat_id}' not found.")
-    return {k: v for k, v in feat.items() if k not in ("source_strategy", "mock_file")}
+    encoded = cache.get_or_set(f"feats:{feat_id}", lambda: responses.encode(
+        {k: v for k, v in feat.items() if k not in INTERNAL_FEAT_FIELDS}
+    ))
+    return _send(request, encoded)
+
+
+# Rankings are fetched and cached once per feat at the deepest allowed top_n;
+# every smaller top_n is a prefix of that list, so it is served by slicing.
+MAX_TOP_N = 25
+
+
+class CachedRanking(NamedTuple):
+    """One feat's full-depth ranking plus the encoded response for every top_n."""
+    full: dict
+    bodies: tuple  # bodies[n - 1] is the encoded top-n response
+
+    def body_for(self, top_n: int) -> responses.EncodedBody:
+        # Rankings shorter than MAX_TOP_N give the same body for every larger top_n
+        return self.bodies[min(top_n, len(self.bodies)) - 1]
+
+
+cache.register(CachedRanking)
 
 
 @app.get("/api/feats/{feat_id}/ranking", summary="Get top-N ranking for a feat")
-def get_ranking(feat_id: str, top_n: int = 10):
+async def get_ranking(feat_id: str, request: Request, top_n: int = 10, if_cached: bool = False):
+    # Async end to end: a cold live crawl awaits upstream on the event loop
+    # instead of holding one of the threadpool's workers for its duration.
+    # if_cached=true answers 204 rather than starting a crawl, so the ranking
+    # page can take a warm ranking with ETag/compression and stream a cold one.
     feat = feats_catalog.get_feat(feat_id)
     if feat is None:
         raise HTTPException(status_code=404, detail=f"Feat '{feat_id}' not found.")
 
-    top_n = max(1, min(top_n, 25))
+    top_n = max(1, min(top_n, MAX_TOP_N))
+
+    key = f"ranking:{feat_id}"
+    if if_cached:
+        cached = await cache.get_async(key)
+        if cached is None:
+            return Response(status_code=204, headers={"Cache-Control": "no-store"})
+    else:
+        cached = await cache.get_or_set_async(key, lambda: _build_ranking_async(feat))
+    return await _send_async(request, cached.body_for(top_n))
+
+
+def _build_ranking(feat: dict) -> CachedRanking:
+    """
+    Run the (possibly live) fetch for one feat at MAX_TOP_N and pre-encode the
+    response for each top_n. Called once per cache miss.
+    """
+    print(f"[cache] MISS ranking:{feat['id']}")
+    ranking, source = nba_client.fetch_ranking(feat, top_n=MAX_TOP_N)
+    return _encode_ranking(feat, ranking, source)
+
+
+@app.get("/api/feats/{feat_id}/ranking/stream", summary="Stream a feat's ranking as it is crawled")
+async def stream_ranking(feat_id: str, top_n: int = 10):
+    """
+    Server-Sent Events. A cached ranking is sent straight away as the one
+    "final" event. Otherwise "update" events come first: the mock ranking at
+    once, then the running live top-N each time an arriving season changes
+    it (source "partial", with seasons_done/seasons_total). A "final" event
+    carries the finished ranking (source "live", or "mock" if the crawl
+    failed), which is also cached for the plain ranking route.
+
+    The crawl goes through the same single-flight as the plain route, so a
+    feat is crawled once however many streams and plain requests want it.
+    Its steps are fanned out to every stream of the feat: one that arrives
+    mid-crawl gets the mock ranking and the latest live step at once, then
+    the rest as they come.
+    """
+    feat = feats_catalog.get_feat(feat_id)
+    if feat is None:
+        raise HTTPException(status_code=404, detail=f"Feat '{feat_id}' not found.")
+
+    top_n = max(1, min(top_n, MAX_TOP_N))
+    return StreamingResponse(
+        _ranking_events(feat, top_n),
+        media_type=responses.SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Crawls whose client went away keep running, so the flight's followers
+# still get a result; held here so they aren't garbage-collected meanwhile
+_crawls: set[asyncio.Task] = set()
+
+
+class _CrawlProgress:
+    """One feat's streamed-crawl steps, fanned out to every stream of that feat."""
 
-    cache_key = f"ranking:{feat_id}:{top_n}"
-    cached = cache.get(cache_key)
-    if cached:
-        print(f"[cache] HIT  {cache_key}")
-        return cached
+    def __init__(self):
+        self.latest: Optional[dict] = None   # newest step of the crawl in progress
+        self.subscribers: list[asyncio.Queue] = []
 
-    ranking, source = nba_client.fetch_ranking(feat, top_n=top_n)
+    def publish(self, step: Optional[dict]) -> None:
+        # None marks the crawl over; later subscribers have nothing to catch up on
+        self.latest = step
+        if step is not None:
+            for steps in self.subscribers:
+                steps.put_nowait(step)
 
-    response = {
-        "feat_id":           feat_id,
-        "title":             feat["title"],
-        "subtitle":          feat["subtitle"],
-        "unit":              feat["unit"],
-        "source":            source,
+
+_progress: dict[str, _CrawlProgress] = {}
+
+
+@contextlib.contextmanager
+def _subscribed(feat_id: str) -> Iterator[asyncio.Queue]:
+    """A queue of feat_id's crawl steps, starting with the latest one, for one stream."""
+    progress = _progress.setdefault(feat_id, _CrawlProgress())
+    steps: asyncio.Queue = asyncio.Queue()
+    if progress.latest is not None:
+        steps.put_nowait(progress.latest)
+    progress.subscribers.append(steps)
+    try:
+        yield steps
+    finally:
+        progress.subscribers.remove(steps)
+        if not progress.subscribers and progress.latest is None:
+            _progress.pop(feat_id, None)
+
+
+async def _ranking_events(feat: dict, top_n: int):
+    key = f"ranking:{feat['id']}"
+    cached = await cache.get_async(key)
+    if cached is not None:
+        yield responses.sse("final", _slice_ranking(cached.full, top_n))
+        return
+
+    async def crawl() -> CachedRanking:
+        # Run by the flight leader only; every stream of the feat sees its steps
+        print(f"[cache] MISS {key}")
+        stream = nba_client.stream_ranking(feat, top_n=MAX_TOP_N)
+        try:
+            async with contextlib.aclosing(stream):
+                async for step in stream:
+                    if step["final"]:
+                        return await asyncio.to_thread(_encode_ranking, feat, step["ranking"], step["source"])
+                    # Looked up per step: streams come and go while the crawl runs
+                    _progress.setdefault(feat["id"], _CrawlProgress()).publish(step)
+        finally:
+            progress = _progress.get(feat["id"])
+            if progress is not None:
+                progress.publish(None)
+                if not progress.subscribers:
+                    del _progress[feat["id"]]
+        raise RuntimeError("stream_ranking ended without a final step")
+
+    with _subscribed(feat["id"]) as steps:
+        flight = asyncio.create_task(cache.get_or_set_async(key, crawl))
+        _crawls.add(flight)
+        flight.add_done_callback(_crawls.discard)
+
+        shown = None
+        if feat["source_strategy"] == "live":
+            # First byte at mock speed, whoever runs the crawl and however long
+            # it takes; the crawl's own mock step then repeats it and is skipped
+            mock = _slice_ranking(_ranking_payload(feat, nba_client.mock_ranking(feat, top_n), "mock"), top_n)
+            shown = mock["ranking"]
+            yield responses.sse("update", {**mock, "seasons_done": 0, "seasons_total": 0})
+
+        # Steps queued before the flight landed are still sent, in order
+        while not (flight.done() and steps.empty()):
+            if steps.empty():
+                next_step = asyncio.ensure_future(steps.get())
+                try:
+                    await asyncio.wait({flight, next_step}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    if not next_step.done():
+                        next_step.cancel()
+                if not next_step.done() or next_step.cancelled():
+                    continue
+                step = next_step.result()
+            else:
+                step = steps.get_nowait()
+            view = _slice_ranking(_ranking_payload(feat, step["ranking"], step["source"]), top_n)
+            # Changes below the requested depth don't change what the client sees
+            if view["ranking"] != shown:
+                shown = view["ranking"]
+                yield responses.sse("update", {
+                    **view,
+                    "seasons_done":  step["seasons_done"],
+                    "seasons_total": step["seasons_total"],
+                })
+    yield responses.sse("final", _slice_ranking(flight.result().full, top_n))
+
+
+@app.get("/api/rankings", summary="Get top-N rankings for several feats at once")
+async def get_rankings(request: Request, feats: str = "all", top_n: int = 10):
+    """
+    Every listed ranking (comma-separated ids, or "all") in one response, in
+    the order asked. Each is resolved concurrently through the same cache and
+    single-flight as /api/feats/{id}/ranking, and reports its source, how it
+    was served ("cache": hit, miss, or coalesced onto a crawl already in
+    flight) and how long it took.
+    """
+    if feats == "all":
+        feat_ids = list(feats_catalog.FEATS)
+    else:
+        feat_ids = list(dict.fromkeys(f.strip() for f in feats.split(",") if f.strip()))
+    unknown = [f for f in feat_ids if feats_catalog.get_feat(f) is None]
+    if unknown or not feat_ids:
+        raise HTTPException(status_code=404, detail=f"Unknown feats: {', '.join(unknown) or '(none given)'}")
+
+    top_n = max(1, min(top_n, MAX_TOP_N))
+    start = time.perf_counter()
+    rankings = await asyncio.gather(*(_timed_ranking(f, top_n) for f in feat_ids))
+    # Timings differ per call, so the combined body is encoded (and compressed) per request
+    encoded = responses.encode({
+        "top_n":      top_n,
+        "rankings":   rankings,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    })
+    return await responses.to_response_async(
+        encoded, accept_encoding=request.headers.get("accept-encoding"), reuse=False
+    )
+
+
+async def _timed_ranking(feat_id: str, top_n: int) -> dict:
+    feat = feats_catalog.get_feat(feat_id)
+    start = time.perf_counter()
+    cached, outcome = await cache.resolve_async(f"ranking:{feat_id}", lambda: _build_ranking_async(feat))
+    return {
+        **_slice_ranking(cached.full, top_n),
+        "cache":      outcome,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+
+
+async def _build_ranking_async(feat: dict) -> CachedRanking:
+    """_build_ranking for the async route; encoding every top_n body runs off the loop."""
+    print(f"[cache] MISS ranking:{feat['id']}")
+    ranking, source = await nba_client.fetch_ranking_async(feat, top_n=MAX_TOP_N)
+    return await asyncio.to_thread(_encode_ranking, feat, ranking, source)
+
+
+def _ranking_payload(feat: dict, ranking: list[dict], source: str) -> dict:
+    return {
+        "feat_id":  feat["id"],
+        "title":    feat["title"],
+        "subtitle": feat["subtitle"],
+        "unit":     feat["unit"],
+        "source":   source,
+        "ranking":  ranking,
+    }
+
+
+def _encode_ranking(feat: dict, ranking: list[dict], source: str) -> CachedRanking:
+    full = _ranking_payload(feat, ranking, source)
+    bodies = tuple(
+        responses.encode(_slice_ranking(full, n))
+        for n in range(1, max(1, len(ranking)) + 1)
+    )
+    return CachedRanking(full, bodies)
+
+
+def warm_ranking(feat_id: str) -> None:
+    """Make sure feat_id's ranking is cached (coalesces with in-flight requests)."""
+    feat = feats_catalog.get_feat(feat_id)
+    cache.get_or_set(f"ranking:{feat_id}", lambda: _build_ranking(feat))
+
+
+def warm_rankings(feat_ids: list[str]) -> None:
+    """
+    Cache every listed ranking that isn't cached yet in one batch, so live
+    feats share a single planned upstream crawl instead of one crawl each.
+    The batch leads each feat's single-flight, so requests arriving during
+    prewarm wait for it instead of crawling again; feats already in flight,
+    here or in another worker, are left to whoever is computing them.
+    """
+    keys = {f"ranking:{f}": f for f in feat_ids}
+    with cache.claimed(keys) as claim:
+        feats = [feats_catalog.get_feat(keys[key]) for key in claim.keys]
+        fetched = nba_client.fetch_rankings(feats, top_n=MAX_TOP_N)
+        for feat in feats:
+            claim.land(f"ranking:{feat['id']}", _encode_ranking(feat, *fetched[feat["id"]]))
+
+
+def refresh_ranking(feat_id: str) -> None:
+    """
+    Re-fetch feat_id's ranking and overwrite the cache entry before it lapses.
+    Skipped if another worker is refreshing it. A refresh that fell back to
+    mock doesn't replace real data: the cached ranking is kept for another
+    TTL instead (re-encoded, so Age restarts with the new entry), and the
+    next refresh tries upstream again.
+    """
+    key = f"ranking:{feat_id}"
+    with cache.leased(key) as held:
+        if not held:
+            return
+        feat = feats_catalog.get_feat(feat_id)
+        fresh = _build_ranking(feat)
+        current = cache.get(key)
+        if fresh.full["source"] == "mock" and current is not None and current.full["source"] != "mock":
+            print(f"[refresh] {feat_id}: upstream unavailable, keeping the {current.full['source']} ranking")
+            fresh = _encode_ranking(feat, current.full["ranking"], current.full["source"])
+        cache.set(key, fresh)
+
+
+def _slice_ranking(full: dict, top_n: int) -> dict:
+    """Cut a full-depth ranking down to top_n and derive the Rodman flags from the slice."""
+    ranking = full["ranking"][:top_n]
+    return {
+        **full,
         "ranking":           ranking,
         "rodman_in_ranking": any(p["is_rodman"] for p in ranking),
         "rodman_is_first":   bool(ranking and ranking[0]["is_rodman"]),
     }
 
-    cache.set(cache_key, response)
-    return response
-
 
 @app.get("/api/health", summary="Health check")
 def health():
     return {"status": "ok", "message": "The Worm is alive 🐛"}
 
 @app.get("/api/cache/stats", include_in_schema=False)
-def cache_stats_route():
-    return cache.stats()
+def cache_stats_route(deep: bool = False):
+    # deep=true adds the SQLite row/byte counts, which scan the whole table
+    return cache.stats(deep)
+
+@app.get("/api/upstream/stats", include_in_schema=False)
+def upstream_stats_route():
+    return nba_client.upstream_stats()
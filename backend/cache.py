@@ -1,44 +1,1012 @@
 """
-cache.py — Simple in-memory TTL cache.
+cache.py — In-memory LRU + TTL cache.
 Avoids hammering stats.nba.com on repeated requests.
+
+The default store is bounded twice over: by entry count (MAX_ENTRIES) and by an
+approximate byte budget (MAX_BYTES). When either is exceeded the least
+recently used entries are evicted. Expired entries are reaped proactively
+from an expiry heap on every write, so dead keys never pile up on a
+long-running worker.
+
+Both limits can be set from the environment (CACHE_MAX_ENTRIES,
+CACHE_MAX_BYTES) or at runtime with configure().
+
+An optional second tier persists entries to a local SQLite file
+(CACHE_DISK_PATH, or configure(disk_path=...)). get() falls through to it on
+a memory miss and promotes the hit; set() queues a write-behind to it. Rows
+carry their absolute expiry, so a restarted worker answers from disk with
+the remaining TTL intact.
+
+The primary store is pluggable (CACHE_BACKEND, or configure(backend=...)):
+  "memory" → MemoryCache, private to the process (default)
+  "sqlite" → SQLiteCache, one WAL-mode file shared by every worker on the host
+
+On disk, values are stored as tagged JSON (see _dumps/_loads), never pickles:
+plain JSON types, bytes, tuples and NamedTuple types declared with
+register(). A row that doesn't decode is treated as a miss, so a tampered or
+stale file can't run code in a worker. SQLite files are created owner-only
+(0600) in an owner-only directory; the default lives under backend/data/.
+
+get_or_set() is the read path for expensive values: concurrent misses on
+the same key are coalesced so only the first caller computes, and everyone
+else waits for that result (single-flight). Backends that support leases
+(SQLiteCache) extend this across worker processes. get_or_set_async() is the
+same read path for async callers: compute is awaited, waiting for someone
+else's flight costs a coroutine rather than a thread, and sync and async
+callers of one key share a single flight; resolve_async() also reports
+whether the value was a hit, computed, or coalesced onto another caller's
+flight. claimed() lets a batch (prewarm) lead the flights of many keys at
+once, so requests for them wait on the batch. With a SQLite store or disk
+tier the async path's reads, writes and lease calls run in worker threads
+(get_async/set_async), so the event loop never waits on file I/O.
+
+stats() is O(1) in the number of keys: hit/miss/set/expiration/eviction
+counters and per-prefix gauges are updated as operations happen (CacheMetrics).
+SQLite stores can only count their rows by scanning the table, so those
+figures are left out unless stats(deep=True) asks for them.
 """
 
+import asyncio
+import atexit
+import base64
+import builtins
+import contextlib
+import heapq
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
 import time
-from typing import Any, Optional
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Iterable, Iterator, NamedTuple, Optional, Protocol
 
-_store: dict[str, dict] = {}
 DEFAULT_TTL = 600  # 10 minutes
+MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", "1024"))
+MAX_BYTES = int(os.environ.get("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))  # 64 MiB
+DISK_PATH = os.environ.get("CACHE_DISK_PATH", "")  # empty → disk tier disabled
+BACKEND = os.environ.get("CACHE_BACKEND", "memory")  # "memory" | "sqlite"
+_HERE = os.path.dirname(os.path.abspath(__file__))
+SQLITE_PATH = os.environ.get(
+    "CACHE_SQLITE_PATH", os.path.join(_HERE, "data", "cache", "rodman-cache.sqlite3")
+)
+LEASE_TIMEOUT = 60  # seconds a cross-process compute lease is honoured
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _approx_size(value: Any) -> int:
+    """Rough deep size of a cached value in bytes (containers are walked)."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_approx_size(k) + _approx_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, builtins.set, frozenset)):
+        size += sum(_approx_size(v) for v in value)
+    return size
+
+
+# NamedTuple types that may be stored on disk, by name (see register)
+_TYPES: dict[str, type] = {}
+
+# Reserved key marking a tagged (non-JSON) value inside the stored JSON
+_TAG = "__cache__"
+
+
+def register(cls: type) -> type:
+    """Allow a NamedTuple type to be stored by the SQLite backend and disk tier."""
+    _TYPES[cls.__name__] = cls
+    return cls
+
+
+def _tagged(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return {_TAG: "bytes", "v": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, tuple):
+        name = type(value).__name__
+        if type(value) is not tuple:
+            if _TYPES.get(name) is not type(value):
+                raise TypeError(f"cache can't store unregistered type {name}")
+            return {_TAG: name, "v": [_tagged(v) for v in value]}
+        return {_TAG: "tuple", "v": [_tagged(v) for v in value]}
+    if isinstance(value, list):
+        return [_tagged(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _tagged(v) for k, v in value.items()}
+    return value
+
+
+def _untagged(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_untagged(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    tag = value.get(_TAG)
+    if tag is None:
+        return {k: _untagged(v) for k, v in value.items()}
+    if tag == "bytes":
+        return base64.b64decode(value["v"])
+    items = [_untagged(v) for v in value["v"]]
+    if tag == "tuple":
+        return tuple(items)
+    return _TYPES[tag](*items)  # KeyError for unknown types → row ignored
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(_tagged(value), separators=(",", ":")).encode("utf-8")
+
+
+def _loads(blob: bytes) -> Any:
+    return _untagged(json.loads(blob))
+
+
+class CacheBackend(Protocol):
+    """What the module API needs from a primary store."""
+
+    def get(self, key: str) -> Optional[Any]: ...
+    def set(self, key: str, value: Any, ttl: int = DEFAULT_TTL) -> None: ...
+    def clear(self) -> None: ...
+    def resize(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None) -> None: ...
+    def purge_expired(self) -> int: ...
+    def stats(self, deep: bool = False) -> dict: ...
+
+
+class _Entry(NamedTuple):
+    value: Any
+    expires_at: float
+    size: int
+
+
+def _prefix(key: str) -> str:
+    """Group key for stats: the first two ':' segments, e.g. 'ranking:season_rpg'."""
+    return ":".join(key.split(":", 2)[:2])
+
+
+class CacheMetrics:
+    """
+    Counters and gauges maintained on every operation, so reading them is O(1)
+    in the number of cached keys (one dict copy per key prefix).
+
+    Counters: hits, misses, disk_hits, sets, expirations, evictions.
+    Gauges (MemoryCache only): keys, bytes.
+    compute_seconds is a histogram of get_or_set compute() latency — what a
+    miss really costs upstream, which is what TTLs should be tuned against.
+    """
+
+    COUNTERS = ("hits", "misses", "disk_hits", "sets", "expirations", "evictions")
+    BUCKETS = (0.01, 0.1, 0.5, 1, 5, 15, 60)  # seconds; one overflow bucket past the last
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._prefixes: dict[str, dict] = {}
+            self._totals = self._blank()
+
+    def incr(self, event: str, key: Optional[str], n: int = 1) -> None:
+        """Bump a counter; key=None for bulk operations that only update totals."""
+        with self._lock:
+            self._totals[event] += n
+            if key is not None:
+                self._for(key)[event] += n
+
+    def add_entry(self, key: str, size: int, sign: int = 1) -> None:
+        """Adjust the keys/bytes gauges for one entry being stored (+1) or dropped (-1)."""
+        with self._lock:
+            for bucket in (self._totals, self._for(key)):
+                bucket["keys"] += sign
+                bucket["bytes"] += sign * size
+
+    def clear_entries(self) -> None:
+        with self._lock:
+            for bucket in (self._totals, *self._prefixes.values()):
+                bucket["keys"] = bucket["bytes"] = 0
+
+    def observe_compute(self, key: str, seconds: float) -> None:
+        index = next((i for i, b in enumerate(self.BUCKETS) if seconds <= b), len(self.BUCKETS))
+        with self._lock:
+            for bucket in (self._totals, self._for(key)):
+                bucket["compute_count"] += 1
+                bucket["compute_seconds_sum"] += seconds
+            self._histogram[index] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            totals = dict(self._totals)
+            lookups = totals["hits"] + totals["misses"]
+            totals["hit_rate"] = round(totals["hits"] / lookups, 4) if lookups else None
+            labels = [f"le_{b}" for b in self.BUCKETS] + ["inf"]
+            totals["compute_seconds"] = dict(zip(labels, self._histogram))
+            totals["prefixes"] = {p: dict(c) for p, c in self._prefixes.items()}
+            return totals
+
+    # -- internals (caller holds the lock) ----------------------------------
+
+    def _blank(self) -> dict:
+        self._histogram = [0] * (len(self.BUCKETS) + 1)
+        return self._counter_block()
+
+    def _counter_block(self) -> dict:
+        block = dict.fromkeys(self.COUNTERS, 0)
+        block.update(keys=0, bytes=0, compute_count=0, compute_seconds_sum=0.0)
+        return block
+
+    def _for(self, key: str) -> dict:
+        prefix = _prefix(key)
+        block = self._prefixes.get(prefix)
+        if block is None:
+            block = self._prefixes[prefix] = self._counter_block()
+        return block
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+class MemoryCache:
+    """
+    Thread-safe LRU cache with per-entry TTL.
+
+    Recency lives in an OrderedDict (oldest first); expiry lives in a min-heap
+    of (expires_at, key). Heap items are invalidated lazily — an overwritten
+    key leaves a stale item behind that is skipped when popped — and the heap
+    is rebuilt once stale items outnumber live entries.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = MAX_ENTRIES,
+        max_bytes: int = MAX_BYTES,
+        metrics: Optional[CacheMetrics] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.metrics = metrics or CacheMetrics()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._heap: list[tuple[float, str]] = []
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() > entry.expires_at:
+                self._remove(key)
+                self.metrics.incr("expirations", key)
+                return None
+            self._entries.move_to_end(key)
+            return entry.value
+
+    def set(self, key: str, value: Any, ttl: int = DEFAULT_TTL) -> None:
+        now = time.time()
+        entry = _Entry(value, now + ttl, _approx_size(key) + _approx_size(value))
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            self.metrics.add_entry(key, entry.size)
+            heapq.heappush(self._heap, (entry.expires_at, key))
+            self._reap(now)
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._heap.clear()
+            self._bytes = 0
+            self.metrics.clear_entries()
+
+    def resize(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        """Change either budget; evicts immediately if the store is now over it."""
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._evict()
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry now. Returns how many were removed."""
+        with self._lock:
+            return self._reap(time.time())
+
+    def stats(self, deep: bool = False) -> dict:
+        # Every figure here is maintained incrementally; deep adds nothing
+        now = time.time()
+        with self._lock:
+            expired = self._count_expired(now)
+            return {
+                "total_keys":   len(self._entries),
+                "live_keys":    len(self._entries) - expired,
+                "expired_keys": expired,
+                "bytes":        self._bytes,
+                "max_entries":  self.max_entries,
+                "max_bytes":    self.max_bytes,
+            }
+
+    # -- internals (caller holds the lock) ----------------------------------
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        self.metrics.add_entry(key, entry.size, sign=-1)
+
+    def _count_expired(self, now: float) -> int:
+        """
+        Count entries past their deadline without a full scan: walk only the
+        heap nodes whose deadline has passed (children of a live node are
+        later still, so the walk stops there). Writes keep that set small.
+        """
+        count, stack = 0, [0]
+        while stack:
+            i = stack.pop()
+            if i >= len(self._heap) or self._heap[i][0] > now:
+                continue
+            expires_at, key = self._heap[i]
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at == expires_at:
+                count += 1
+            stack.extend((2 * i + 1, 2 * i + 2))
+        return count
+
+    def _reap(self, now: float) -> int:
+        """Pop heap items whose deadline has passed; drop the matching entries."""
+        removed = 0
+        while self._heap and self._heap[0][0] < now:
+            expires_at, key = heapq.heappop(self._heap)
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at == expires_at:
+                self._remove(key)
+                self.metrics.incr("expirations", key)
+                removed += 1
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [(e.expires_at, k) for k, e in self._entries.items()]
+            heapq.heapify(self._heap)
+        return removed
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until both budgets are respected."""
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            key, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.metrics.add_entry(key, entry.size, sign=-1)
+            self.metrics.incr("evictions", key)
+
+
+class SQLiteCache:
+    """
+    Cache backend stored in a SQLite file in WAL mode.
+
+    Every worker process that opens the same path shares one store, so a
+    ranking computed by any worker is a hit for all of them. Writes are single
+    INSERT OR REPLACE statements (atomic), and expiry follows MemoryCache
+    exactly: a row is dead once now > expires_at and is deleted on read or on
+    purge. max_entries is honoured by dropping the soonest-to-expire rows;
+    the byte budget does not apply on disk.
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS cache ("
+        " key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS cache_expiry ON cache (expires_at)",
+        "CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, expires_at REAL NOT NULL)",
+    )
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = MAX_ENTRIES,
+        metrics: Optional[CacheMetrics] = None,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.metrics = metrics or CacheMetrics()
+        self._local = threading.local()
+        self._create_private(path)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in self._SCHEMA:
+                conn.execute(statement)
+
+    def get(self, key: str) -> Optional[Any]:
+        hit = self.get_entry(key)
+        return None if hit is None else hit[0]
+
+    def get_entry(self, key: str) -> Optional[tuple[Any, float]]:
+        """Return (value, expires_at) for a live row, or None."""
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if time.time() > row[1]:
+            with conn:
+                conn.execute("DELETE FROM cache WHERE key = ? AND expires_at = ?", (key, row[1]))
+            self.metrics.incr("expirations", key)
+            return None
+        try:
+            return _loads(row[0]), row[1]
+        except Exception:
+            return None
+
+    def set(self, key: str, value: Any, ttl: int = DEFAULT_TTL) -> None:
+        conn = self._conn()
+        with conn:
+            self._write(conn, key, value, time.time() + ttl)
+            self._evict(conn)
+
+    def clear(self) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM cache")
+
+    def resize(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        if max_entries is not None:
+            self.max_entries = max_entries
+            conn = self._conn()
+            with conn:
+                self._evict(conn)
+
+    def purge_expired(self) -> int:
+        conn = self._conn()
+        with conn:
+            removed = conn.execute(
+                "DELETE FROM cache WHERE expires_at < ?", (time.time(),)
+            ).rowcount
+        self.metrics.incr("expirations", None, removed)
+        return removed
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def stats(self, deep: bool = False) -> dict:
+        """Row/byte figures need a full table scan, so only when deep."""
+        if not deep:
+            return {"max_entries": self.max_entries, "path": self.path}
+        total, expired, size = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(expires_at <= ?), 0), "
+            "COALESCE(SUM(LENGTH(value)), 0) FROM cache",
+            (time.time(),),
+        ).fetchone()
+        return {
+            "total_keys":   total,
+            "live_keys":    total - expired,
+            "expired_keys": expired,
+            "bytes":        size,
+            "max_entries":  self.max_entries,
+            "path":         self.path,
+        }
+
+    # -- cross-process leases (see get_or_set) -------------------------------
+
+    def acquire_lease(self, key: str, ttl: float) -> bool:
+        """Try to become the one process computing key. Stale leases are stolen."""
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM leases WHERE key = ? AND expires_at < ?", (key, now))
+            return conn.execute(
+                "INSERT OR IGNORE INTO leases (key, expires_at) VALUES (?, ?)",
+                (key, now + ttl),
+            ).rowcount == 1
+
+    def release_lease(self, key: str) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM leases WHERE key = ?", (key,))
+
+    # -- internals ----------------------------------------------------------
 
+    @staticmethod
+    def _create_private(path: str) -> None:
+        """Create the file (and its directory) readable by this user only."""
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o700)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        os.close(fd)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, key: str, value: Any, expires_at: float) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, _dumps(value), expires_at),
+        )
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        evicted = conn.execute(
+            "DELETE FROM cache WHERE key IN ("
+            " SELECT key FROM cache ORDER BY expires_at"
+            " LIMIT MAX(0, (SELECT COUNT(*) FROM cache) - ?))",
+            (self.max_entries,),
+        ).rowcount
+        if evicted:
+            self.metrics.incr("evictions", None, evicted)
+
+
+class DiskCache(SQLiteCache):
+    """
+    Persistent write-behind tier that sits under the primary backend.
+
+    Reads are synchronous (one connection per thread). Writes are queued and
+    applied in batches by a daemon writer thread so set() never waits on disk;
+    flush() blocks until the queue is drained.
+    """
+
+    _SWEEP_EVERY = 60  # seconds between deletes of expired rows
+
+    def __init__(self, path: str, max_entries: int = MAX_ENTRIES):
+        super().__init__(path, max_entries)
+        self._queue: queue.Queue = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._drain, name="cache-disk-writer", daemon=True
+        )
+        self._writer.start()
+
+    def set(self, key: str, value: Any, ttl: int = DEFAULT_TTL) -> None:
+        self.put(key, value, time.time() + ttl)
+
+    def put(self, key: str, value: Any, expires_at: float) -> None:
+        self._queue.put(("put", key, value, expires_at))
+
+    def clear(self) -> None:
+        self._queue.put(("clear", None, None, None))
+        self.flush()
+
+    def flush(self) -> None:
+        self._queue.join()
+
+    def _drain(self) -> None:
+        conn = self._connect()
+        last_sweep = time.time()
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with conn:
+                    for op, key, value, expires_at in batch:
+                        if op == "clear":
+                            conn.execute("DELETE FROM cache")
+                        else:
+                            self._write(conn, key, value, expires_at)
+                    self._evict(conn)
+                    now = time.time()
+                    if now - last_sweep > self._SWEEP_EVERY:
+                        conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+                        last_sweep = now
+            except Exception as exc:
+                print(f"[cache] disk write failed: {exc}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+class _Flight:
+    """
+    One in-progress computation that other callers can wait on: threads
+    block on `done`, coroutines await a future registered in `waiters`.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def result(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+_metrics = CacheMetrics()
+
+BACKENDS: dict[str, Callable[[], CacheBackend]] = {
+    "memory": lambda: MemoryCache(metrics=_metrics),
+    "sqlite": lambda: SQLiteCache(SQLITE_PATH, metrics=_metrics),
+}
+
+_store: CacheBackend = BACKENDS[BACKEND]()
+_disk: Optional[DiskCache] = DiskCache(DISK_PATH) if DISK_PATH else None
+_inflight: dict[str, _Flight] = {}
+_inflight_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------------
+# Module API
+# ---------------------------------------------------------------------------
 
 def get(key: str) -> Optional[Any]:
-    """Return cached value if it exists and hasn't expired."""
-    entry = _store.get(key)
-    if entry is None:
-        return None
-    if time.time() > entry["expires_at"]:
-        del _store[key]
-        return None
-    return entry["value"]
+    """Return cached value if it exists and hasn't expired (memory, then disk)."""
+    value = _store.get(key)
+    if value is None and _disk is not None:
+        hit = _disk.get_entry(key)
+        if hit is not None:
+            value, expires_at = hit
+            _store.set(key, value, expires_at - time.time())
+            _metrics.incr("disk_hits", key)
+    _metrics.incr("hits" if value is not None else "misses", key)
+    return value
 
 
 def set(key: str, value: Any, ttl: int = DEFAULT_TTL) -> None:
-    """Store a value with an expiry timestamp."""
-    _store[key] = {
-        "value": value,
-        "expires_at": time.time() + ttl,
-    }
+    """Store a value with an expiry timestamp, evicting LRU entries if over budget."""
+    _store.set(key, value, ttl)
+    _metrics.incr("sets", key)
+    if _disk is not None:
+        _disk.put(key, value, time.time() + ttl)
+
+
+def _on_disk() -> bool:
+    """True when a get/set may touch a file, and so shouldn't run on an event loop."""
+    return _disk is not None or not isinstance(_store, MemoryCache)
+
+
+async def get_async(key: str) -> Optional[Any]:
+    """get() for coroutines; file-backed lookups run in a worker thread."""
+    if _on_disk():
+        return await asyncio.to_thread(get, key)
+    return get(key)
+
+
+async def set_async(key: str, value: Any, ttl: int = DEFAULT_TTL) -> None:
+    """set() for coroutines; file-backed writes run in a worker thread."""
+    if _on_disk():
+        await asyncio.to_thread(set, key, value, ttl)
+    else:
+        set(key, value, ttl)
+
+
+def get_or_set(key: str, compute: Callable[[], Any], ttl: int = DEFAULT_TTL) -> Any:
+    """
+    Return the cached value for key, computing and storing it on a miss.
+
+    Only one caller per key runs compute() at a time; concurrent callers for
+    the same key block until it finishes and share its result (or exception).
+    """
+    value = get(key)
+    if value is not None:
+        return value
+
+    with _inflight_lock:
+        flight = _inflight.get(key)
+        leader = flight is None
+        if leader:
+            # A flight may have landed between the miss above and taking the lock
+            value = _store.get(key)
+            if value is not None:
+                return value
+            flight = _inflight[key] = _Flight()
+
+    if not leader:
+        flight.done.wait()
+        return flight.result()
+
+    try:
+        flight.value = _compute_shared(key, compute, ttl)
+        return flight.value
+    except BaseException as exc:
+        flight.error = exc
+        raise
+    finally:
+        _land(key, flight)
+
+
+async def get_or_set_async(
+    key: str, compute: Callable[[], Awaitable[Any]], ttl: int = DEFAULT_TTL
+) -> Any:
+    """
+    get_or_set for the event loop: compute() returns an awaitable, and a
+    caller that finds the key already in flight (from a thread or another
+    coroutine) awaits its result instead of blocking a thread on it.
+    """
+    value, _ = await resolve_async(key, compute, ttl)
+    return value
+
+
+async def resolve_async(
+    key: str, compute: Callable[[], Awaitable[Any]], ttl: int = DEFAULT_TTL
+) -> tuple[Any, str]:
+    """
+    get_or_set_async that also says how the value was found: "hit" (already
+    cached), "miss" (this caller computed it) or "coalesced" (someone else's
+    computation, in this process or another worker, produced it meanwhile).
+    """
+    value = await get_async(key)
+    if value is not None:
+        return value, "hit"
+
+    with _inflight_lock:
+        flight = _inflight.get(key)
+        leader = flight is None
+        # A lease-backed leader re-reads the store once it holds the lease
+        # (off the loop), so only an in-memory store is re-checked here
+        if leader and isinstance(_store, MemoryCache):
+            value = _store.get(key)
+            if value is not None:
+                return value, "coalesced"
+        if leader:
+            flight = _inflight[key] = _Flight()
+        else:
+            # Registered under the lock, so _land() can't miss it
+            loop = asyncio.get_running_loop()
+            waiter = loop.create_future()
+            flight.waiters.append((loop, waiter))
+
+    if not leader:
+        await waiter
+        return flight.result(), "coalesced"
+
+    computed = False
+
+    def counted() -> Awaitable[Any]:
+        nonlocal computed
+        computed = True
+        return compute()
+
+    try:
+        flight.value = await _compute_shared_async(key, counted, ttl)
+        return flight.value, "miss" if computed else "coalesced"
+    except BaseException as exc:
+        flight.error = exc
+        raise
+    finally:
+        _land(key, flight)
+
+
+@contextlib.contextmanager
+def leased(key: str, ttl: float = LEASE_TIMEOUT) -> Iterator[bool]:
+    """
+    Try, without waiting, to take key's cross-process lease for the block and
+    yield whether it was taken. For writers that bypass get_or_set (prewarm,
+    refresh), so only one worker on the host recomputes key. Backends without
+    leases are private to the process, so there it is always taken.
+    """
+    if not hasattr(_store, "acquire_lease"):
+        yield True
+        return
+    store = _store
+    held = store.acquire_lease(key, ttl)
+    try:
+        yield held
+    finally:
+        if held:
+            store.release_lease(key)
+
+
+class Claim:
+    """The flights claimed(keys) leads; land() stores each key's value and wakes its waiters."""
+
+    def __init__(self, flights: dict[str, _Flight], store: CacheBackend):
+        self._flights = flights
+        self._store = store
+        self.keys = list(flights)
+
+    def land(self, key: str, value: Any, ttl: int = DEFAULT_TTL) -> None:
+        flight = self._flights.pop(key)
+        try:
+            set(key, value, ttl)
+            flight.value = value
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            self._done(key, flight)
+
+    def _done(self, key: str, flight: _Flight) -> None:
+        _land(key, flight)
+        if hasattr(self._store, "release_lease"):
+            self._store.release_lease(key)
+
+
+@contextlib.contextmanager
+def claimed(keys: Iterable[str]) -> Iterator[Claim]:
+    """
+    get_or_set's single-flight for a batch that computes several keys at
+    once (prewarm). Leads the flight, and takes the cross-process lease, of
+    every key that isn't cached or already being computed; those keys are
+    Claim.keys. Callers that miss one meanwhile wait for Claim.land() rather
+    than computing it themselves. Keys still unlanded when the block exits
+    fail their waiters with the block's exception (or a RuntimeError).
+    """
+    store = _store
+    flights: dict[str, _Flight] = {}
+    for key in dict.fromkeys(keys):
+        if get(key) is not None:
+            continue
+        if hasattr(store, "acquire_lease") and not store.acquire_lease(key, LEASE_TIMEOUT):
+            continue  # another worker is computing it
+        with _inflight_lock:
+            taken = key not in _inflight and store.get(key) is None
+            if taken:
+                flights[key] = _inflight[key] = _Flight()
+        if not taken and hasattr(store, "release_lease"):
+            store.release_lease(key)
+
+    claim = Claim(flights, store)
+    error: Optional[BaseException] = None
+    try:
+        yield claim
+    except BaseException as exc:
+        error = exc
+        raise
+    finally:
+        for key, flight in list(flights.items()):
+            flight.error = error or RuntimeError(f"{key} was claimed but never landed")
+            del flights[key]
+            claim._done(key, flight)
+
+
+def _land(key: str, flight: _Flight) -> None:
+    """Retire a finished flight and wake everyone waiting on it, threads and coroutines."""
+    with _inflight_lock:
+        del _inflight[key]
+        waiters = list(flight.waiters)
+    flight.done.set()
+    for loop, future in waiters:
+        try:
+            loop.call_soon_threadsafe(_wake, future)
+        except RuntimeError:
+            pass  # that caller's loop has already closed
+
+
+def _compute_shared(key: str, compute: Callable[[], Any], ttl: int) -> Any:
+    """
+    Compute and store key. If the backend is shared between processes, first
+    take its lease so only one worker on the host computes; the others poll
+    for the value until the holder stores it or its lease lapses.
+    """
+    if not hasattr(_store, "acquire_lease"):
+        value = _timed_compute(key, compute)
+        set(key, value, ttl)
+        return value
+
+    deadline = time.time() + LEASE_TIMEOUT
+    while not _store.acquire_lease(key, LEASE_TIMEOUT):
+        value = _store.get(key)
+        if value is not None:
+            return value
+        if time.time() > deadline:
+            break
+        time.sleep(0.05)
+    try:
+        # The previous holder may have stored the value just before releasing
+        value = _store.get(key)
+        if value is None:
+            value = _timed_compute(key, compute)
+            set(key, value, ttl)
+        return value
+    finally:
+        _store.release_lease(key)
+
+
+async def _compute_shared_async(key: str, compute: Callable[[], Awaitable[Any]], ttl: int) -> Any:
+    """
+    _compute_shared for coroutines: every store and lease call runs in a
+    worker thread, and polling for another worker's lease uses asyncio.sleep.
+    """
+    store = _store
+    if not hasattr(store, "acquire_lease"):
+        value = await _timed_compute_async(key, compute)
+        await set_async(key, value, ttl)
+        return value
+
+    deadline = time.time() + LEASE_TIMEOUT
+    while not await asyncio.to_thread(store.acquire_lease, key, LEASE_TIMEOUT):
+        value = await asyncio.to_thread(store.get, key)
+        if value is not None:
+            return value
+        if time.time() > deadline:
+            break
+        await asyncio.sleep(0.05)
+    try:
+        value = await asyncio.to_thread(store.get, key)
+        if value is None:
+            value = await _timed_compute_async(key, compute)
+            await set_async(key, value, ttl)
+        return value
+    finally:
+        await asyncio.to_thread(store.release_lease, key)
+
+
+def _timed_compute(key: str, compute: Callable[[], Any]) -> Any:
+    start = time.perf_counter()
+    try:
+        return compute()
+    finally:
+        _metrics.observe_compute(key, time.perf_counter() - start)
+
+
+async def _timed_compute_async(key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+    start = time.perf_counter()
+    try:
+        return await compute()
+    finally:
+        _metrics.observe_compute(key, time.perf_counter() - start)
 
 
 def clear() -> None:
-    """Wipe the entire cache. Used in tests and diagnostics."""
+    """Wipe the entire cache (both tiers) and its counters. Used in tests and diagnostics."""
     _store.clear()
+    _metrics.reset()
+    if _disk is not None:
+        _disk.clear()
+
+
+def flush() -> None:
+    """Block until queued disk writes have landed. No-op without a disk tier."""
+    if _disk is not None:
+        _disk.flush()
+
+
+def purge_expired() -> int:
+    """Proactively drop expired entries. Returns the number removed."""
+    return _store.purge_expired()
+
+
+def configure(
+    max_entries: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    disk_path: Optional[str] = None,
+    backend: Optional[str] = None,
+) -> None:
+    """
+    Change the size budgets at runtime; evicts immediately if now over budget.
+    disk_path switches the persistent tier to a new file ("" disables it).
+    backend swaps the primary store for a fresh one of that kind (see BACKENDS).
+    """
+    global _store, _disk
+    if backend is not None:
+        _store = BACKENDS[backend]()
+    _store.resize(max_entries=max_entries, max_bytes=max_bytes)
+    if disk_path is not None:
+        flush()
+        _disk = DiskCache(disk_path) if disk_path else None
+
+
+def stats(deep: bool = False) -> dict:
+    """
+    Return cache diagnostics: the backend's key/byte figures plus the running
+    counters (hits, misses, sets, expirations, evictions, hit_rate), the
+    compute-latency histogram and a per-key-prefix breakdown. deep adds the
+    figures that cost a table scan: a SQLite backend's key/byte counts and
+    the disk tier's row count.
+    """
+    result = _metrics.snapshot()
+    result.update(_store.stats(deep))
+    result["backend"] = type(_store).__name__
+    result["disk_enabled"] = _disk is not None
+    if _disk is not None and deep:
+        result["disk_keys"] = _disk.count()
+    return result
 
 
-def stats() -> dict:
-    """Return cache diagnostics."""
-    now = time.time()
-    return {
-        "total_keys": len(_store),
-        "live_keys": sum(1 for e in _store.values() if e["expires_at"] > now),
-        "expired_keys": sum(1 for e in _store.values() if e["expires_at"] <= now),
-    }
+atexit.register(flush)
@@ -0,0 +1,284 @@
+"""
+fake_stats.py — Fault-injecting local stand-in for stats.nba.com.
+
+Answers leagueleaders calls from recorded payloads (or deterministic synthetic
+ones) with configurable latency, error, 429 and hang rates, so the live path's
+throughput, timeouts and mock fallback can be measured offline and in tests.
+
+Three ways to plug it in, all sharing one FakeStats instance's faults/stats:
+  install(fake)          context manager: routes nba_client's nba_api calls
+                         and stats_client's httpx calls through the fake
+  fake.transport()       httpx async transport for stats_client.use_transport
+  fake.asgi_app()        real HTTP server (point NBA_STATS_BASE_URL at it):
+                           python fake_stats.py --port 8001 --latency 0.05:0.4 \\
+                               --error-rate 0.1 --throttle-rate 0.05 --hang-rate 0.02
+
+Hangs honour the caller's timeout: in-process fakes wait out the timeout and
+raise the same error a real hang would; the HTTP server simply never answers
+within it. Leaving install() releases blocking hangs early and waits for every
+blocking call to finish, so no abandoned pool thread reports into nba_client's
+breaker or limiter after the block.
+
+Recordings are plain JSON files named leagueleaders_<season>_<STAT>_<PerMode>.json;
+record() captures them from the real service.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import threading
+import time
+from typing import Callable, Iterable, Iterator, Optional, Union
+from urllib.parse import parse_qs
+
+import httpx
+
+import nba_client
+import stats_client
+
+Latency = Union[float, tuple[float, float], Callable[[random.Random], float]]
+
+# How long a hang lasts when the caller gives no timeout
+HANG_SECONDS = 3600.0
+
+_PLAYERS = [
+    "Moses Malone", "Charles Oakley", "Hakeem Olajuwon", "Patrick Ewing",
+    "Dikembe Mutombo", "Shaquille O'Neal", "Karl Malone", "Charles Barkley",
+    "David Robinson", "Kevin Willis", "Jayson Williams", "Ben Wallace",
+    "Kevin Garnett", "Tim Duncan", "Dwight Howard", "Andre Drummond",
+    "DeAndre Jordan", "Kevin Love", "Rudy Gobert", "Nikola Jokic",
+]
+
+
+def synthetic_payload(season: str, stat: str) -> dict:
+    """A plausible, deterministic leagueleaders payload; Rodman leads his own seasons."""
+    rng = random.Random(f"{season}:{stat}")
+    names = rng.sample(_PLAYERS, 15)
+    if 1986 <= int(season[:4]) <= 1999:
+        names.insert(0, "Dennis Rodman")
+    top = {"REB": 18.7, "OREB": 523}.get(stat, 30.0)
+    values = sorted((top * rng.uniform(0.55, 0.97) for _ in names[1:]), reverse=True)
+    values.insert(0, top if names[0] == "Dennis Rodman" else top * 0.98)
+    rows = [
+        [1000 + i, i + 1, name, "TST", round(value, 1) if stat != "OREB" else int(value)]
+        for i, (name, value) in enumerate(zip(names, values))
+    ]
+    headers = ["PLAYER_ID", "RANK", "PLAYER", "TEAM", stat]
+    return {"resource": "leagueleaders",
+            "resultSet": {"name": "LeagueLeaders", "headers": headers, "rowSet": rows}}
+
+
+def _recording_name(season: str, stat: str, per_mode: str) -> str:
+    return f"leagueleaders_{season}_{stat}_{per_mode}.json"
+
+
+def record(directory: str, keys: Iterable[tuple[str, str, str]]) -> int:
+    """Fetch (season, stat, per_mode) payloads from the real service into directory."""
+    os.makedirs(directory, exist_ok=True)
+    saved = 0
+    for season, stat, per_mode in keys:
+        try:
+            payload = nba_client._request_leaders(season, stat, per_mode)
+        except Exception as exc:
+            print(f"[fake_stats] Record {season} {stat} {per_mode} failed: {exc}")
+            continue
+        with open(os.path.join(directory, _recording_name(season, stat, per_mode)), "w") as f:
+            json.dump(payload, f)
+        saved += 1
+    return saved
+
+
+class FakeStats:
+    """
+    One fake upstream. Each call draws its fate once: hang, 429, 500 (at the
+    given rates, in that order of precedence) or success, then waits its
+    latency. `latency` is seconds, a (low, high) uniform range, or a callable
+    taking the fake's Random. Counters in stats() cover every entry point.
+    """
+
+    def __init__(
+        self,
+        latency: Latency = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        hang_rate: float = 0.0,
+        recordings: Optional[str] = None,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.hang_rate = hang_rate
+        self.recordings = recordings
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._released = threading.Event()
+        self._in_flight = 0
+        self._counts = {"calls": 0, "ok": 0, "errors": 0, "throttled": 0, "hangs": 0}
+
+    # -- fate and payloads --------------------------------------------------
+
+    def _draw(self) -> tuple[str, float]:
+        """Pick this call's outcome and latency."""
+        with self._lock:
+            roll = self._rng.random()
+            if callable(self.latency):
+                delay = self.latency(self._rng)
+            elif isinstance(self.latency, tuple):
+                delay = self._rng.uniform(*self.latency)
+            else:
+                delay = self.latency
+            if roll < self.hang_rate:
+                outcome = "hangs"
+            elif roll < self.hang_rate + self.throttle_rate:
+                outcome = "throttled"
+            elif roll < self.hang_rate + self.throttle_rate + self.error_rate:
+                outcome = "errors"
+            else:
+                outcome = "ok"
+            self._counts["calls"] += 1
+            self._counts[outcome] += 1
+        return outcome, max(0.0, delay)
+
+    def payload(self, season: str, stat: str, per_mode: str) -> dict:
+        if self.recordings:
+            path = os.path.join(self.recordings, _recording_name(season, stat, per_mode))
+            if os.path.isfile(path):
+                with open(path, encoding="utf-8") as f:
+                    return json.load(f)
+        return synthetic_payload(season, stat)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._counts)
+
+    # -- in-process, blocking (stands in for nba_client._request_leaders) ---
+
+    def request_leaders(self, season: str, stat: str, per_mode: str) -> dict:
+        with self._lock:
+            self._in_flight += 1
+        try:
+            outcome, delay = self._draw()
+            if outcome == "hangs":
+                self._released.wait(stats_client.TIMEOUT)
+                raise TimeoutError(f"fake_stats: no answer within {stats_client.TIMEOUT}s")
+            time.sleep(delay)
+            if outcome == "throttled":
+                raise nba_client.Throttled(f"429 from fake_stats ({season} {stat})")
+            if outcome == "errors":
+                raise ConnectionError(f"fake_stats: 500 for {season} {stat}")
+            return self.payload(season, stat, per_mode)
+        finally:
+            with self._idle:
+                self._in_flight -= 1
+                self._idle.notify_all()
+
+    def release(self) -> None:
+        """End every blocking hang now (each still raises its timeout error)."""
+        self._released.set()
+
+    def settle(self, timeout: float = 10.0) -> bool:
+        """Wait until no blocking call is in progress. False if some still are."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._in_flight == 0, timeout)
+
+    # -- in-process, async (httpx transport for stats_client) ---------------
+
+    def transport(self) -> httpx.AsyncBaseTransport:
+        fake = self
+
+        class _Transport(httpx.AsyncBaseTransport):
+            async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+                outcome, delay = fake._draw()
+                if outcome == "hangs":
+                    timeout = (request.extensions.get("timeout") or {}).get("read")
+                    await asyncio.sleep(HANG_SECONDS if timeout is None else timeout)
+                    raise httpx.ReadTimeout("fake_stats: hang", request=request)
+                await asyncio.sleep(delay)
+                return fake._response(outcome, dict(request.url.params))
+
+        return _Transport()
+
+    def _response(self, outcome: str, params: dict) -> httpx.Response:
+        if outcome == "throttled":
+            return httpx.Response(429, json={"message": "Too Many Requests"})
+        if outcome == "errors":
+            return httpx.Response(500, json={"message": "Internal Server Error"})
+        return httpx.Response(200, json=self.payload(
+            params.get("Season", ""), params.get("StatCategory", ""), params.get("PerMode", "")
+        ))
+
+    # -- real HTTP server ---------------------------------------------------
+
+    def asgi_app(self) -> Callable:
+        """Bare ASGI app answering GET /stats/leagueleaders (or /leagueleaders)."""
+        fake = self
+
+        async def app(scope, receive, send):
+            if scope["type"] == "lifespan":
+                while (await receive())["type"] != "lifespan.shutdown":
+                    await send({"type": "lifespan.startup.complete"})
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+            if not scope["path"].rstrip("/").endswith("/leagueleaders"):
+                status, body = 404, b'{"message":"Not Found"}'
+            else:
+                outcome, delay = fake._draw()
+                await asyncio.sleep(HANG_SECONDS if outcome == "hangs" else delay)
+                query = parse_qs(scope["query_string"].decode())
+                resp = fake._response(outcome, {k: v[0] for k, v in query.items()})
+                status, body = resp.status_code, resp.content
+            await send({"type": "http.response.start", "status": status,
+                        "headers": [(b"content-type", b"application/json")]})
+            await send({"type": "http.response.body", "body": body})
+
+        return app
+
+
+@contextlib.contextmanager
+def install(fake: FakeStats) -> Iterator[FakeStats]:
+    """Route both live paths through `fake` for the duration of the block."""
+    real_request = nba_client._request_leaders
+    nba_client._request_leaders = fake.request_leaders
+    stats_client.use_transport(fake.transport())
+    try:
+        yield fake
+    finally:
+        fake.release()
+        fake.settle()
+        nba_client._request_leaders = real_request
+        stats_client.use_transport(None)
+
+
+def _parse_latency(text: str) -> Latency:
+    low, _, high = text.partition(":")
+    return (float(low), float(high)) if high else float(low)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve a fault-injecting fake stats.nba.com.")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=_parse_latency, default=0.0,
+                        help="seconds, or LOW:HIGH for a uniform range")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--recordings", help="directory of recorded payloads to replay")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    fake = FakeStats(args.latency, args.error_rate, args.throttle_rate, args.hang_rate,
+                     args.recordings, args.seed)
+    print(f"[fake_stats] Serving on http://127.0.0.1:{args.port}/stats — "
+          f"set NBA_STATS_BASE_URL to that to use it")
+    uvicorn.run(fake.asgi_app(), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
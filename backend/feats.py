@@ -4,6 +4,15 @@ feats.py — Catalog of Dennis Rodman historic feats.
 Rule for v2: every feat must have Rodman ranked #1.
 All stats are post-1980 (modern NBA era) unless noted.
 Sources: Basketball-Reference, NBA official records.
+
+"live" feats declare their upstream query as "live_query":
+  stat      leagueleaders StatCategory, also the column ranked on
+  per_mode  leagueleaders PerMode ("PerGame", "Totals", ...)
+  seasons   seasons crawled, e.g. "1991-92"
+  depth     leader rows read from each season's table
+  value     name of the transform applied to the stat (nba_client.VALUE_TRANSFORMS)
+nba_client plans all live queries together, so seasons shared between feats
+are fetched once.
 """
 
 FEATS: dict[str, dict] = {
@@ -32,6 +41,19 @@ FEATS: dict[str, dict] = {
         "unit": "rebounds per game",
         "source_strategy": "live",
         "mock_file": "season_rpg.json",
+        # Sample key seasons covering Rodman's peak and competitors
+        "live_query": {
+            "stat": "REB",
+            "per_mode": "PerGame",
+            "seasons": [
+                "1991-92", "1992-93", "1993-94", "1994-95",
+                "1995-96", "1996-97", "1997-98",
+                "1981-82", "1982-83", "1986-87", "1989-90",
+                "2003-04", "2009-10",
+            ],
+            "depth": 5,
+            "value": "round1",
+        },
     },
     "offensive_rebounds_season": {
         "id": "offensive_rebounds_season",
@@ -45,6 +67,17 @@ FEATS: dict[str, dict] = {
         "unit": "offensive rebounds",
         "source_strategy": "live",
         "mock_file": "offensive_rebounds_season.json",
+        "live_query": {
+            "stat": "OREB",
+            "per_mode": "Totals",
+            "seasons": [
+                "1991-92", "1992-93", "1993-94", "1994-95",
+                "1995-96", "1981-82", "1982-83", "1986-87",
+                "1989-90", "2007-08",
+            ],
+            "depth": 3,
+            "value": "int",
+        },
     },
     "consecutive_titles": {
         "id": "consecutive_titles",
@@ -0,0 +1,115 @@
+"""
+ingest.py — Offline crawl of league-leader tables into player_store.
+
+Fetches one leagueleaders table per (season, stat, per-mode) for every season
+from --since to the current one, stores each season as it lands, then
+compacts each stat into its serving table. Run it from backend/:
+
+    python ingest.py                      # every stat the catalog uses, 1980 on
+    python ingest.py --stat REB:PerGame --since 1990 --rate 1
+
+Resumable: seasons already stored are skipped, except the season in progress,
+which is always re-fetched (--force re-fetches everything). Calls go through
+nba_client's upstream guards, so they are paced by its rate limiter, and the
+crawl stops calling upstream once its circuit breaker opens; the seasons left
+count as failed, and a re-run picks up what was missed. Payloads are written
+straight to player_store, not held in nba_client's in-memory leader store.
+"""
+
+import argparse
+import sys
+import time
+
+import feats as feats_catalog
+import nba_client
+import player_store
+import stats_client
+
+DEFAULT_SINCE = 1980
+
+
+def catalog_stats() -> list[tuple[str, str]]:
+    """Every (stat, per_mode) a catalog feat queries, live or store."""
+    pairs = {}
+    for feat in feats_catalog.FEATS.values():
+        for spec in (feat.get("live_query"), feat.get("store_query")):
+            if spec:
+                pairs[(spec["stat"], spec["per_mode"])] = None
+    return list(pairs)
+
+
+def seasons_since(first_year: int) -> list[str]:
+    last_year = int(nba_client.current_season()[:4])
+    return [f"{y}-{str(y + 1)[2:]}" for y in range(first_year, last_year + 1)]
+
+
+def table_rows(payload: dict, stat: str) -> list[tuple[str, str, float]]:
+    """Every (player, team, value) row of a leagueleaders payload, in leader order."""
+    headers, row_set = stats_client.result_set(payload)
+    player, team, value = headers.index("PLAYER"), headers.index("TEAM"), headers.index(stat)
+    return [(str(raw[player]), str(raw[team]), float(raw[value])) for raw in row_set]
+
+
+def ingest(
+    pairs: list[tuple[str, str]], seasons: list[str], force: bool = False
+) -> dict[str, int]:
+    """Crawl and store every missing (season, stat, per_mode); returns counts."""
+    current = nba_client.current_season()
+    counts = {"fetched": 0, "skipped": 0, "failed": 0}
+    stopped = False
+
+    for stat, per_mode in pairs:
+        for season in seasons:
+            if not force and season != current and player_store.has_season(stat, per_mode, season):
+                counts["skipped"] += 1
+                continue
+            if stopped or not nba_client.upstream_ready():
+                if not stopped:
+                    print("[ingest] Upstream circuit open — leaving the remaining seasons for a re-run")
+                    stopped = True
+                counts["failed"] += 1
+                continue
+            try:
+                payload = nba_client.fetch_leaders(season, stat, per_mode)
+                player_store.save_season(stat, per_mode, season, table_rows(payload, stat))
+                counts["fetched"] += 1
+            except Exception as exc:
+                counts["failed"] += 1
+                print(f"[ingest] {stat} {per_mode} {season} failed: {exc}")
+        rows = player_store.compact(stat, per_mode)
+        print(f"[ingest] {stat} {per_mode}: {rows} rows over "
+              f"{len(player_store.stored_seasons(stat, per_mode))} seasons")
+    return counts
+
+
+def _parse_stat(text: str) -> tuple[str, str]:
+    stat, _, per_mode = text.partition(":")
+    return stat, per_mode or "Totals"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Crawl league leaders into the local player store.")
+    parser.add_argument("--stat", action="append", type=_parse_stat, metavar="STAT[:PerMode]",
+                        help="table to crawl (repeatable); default: every stat the catalog uses")
+    parser.add_argument("--since", type=int, default=DEFAULT_SINCE,
+                        help=f"first season's start year (default {DEFAULT_SINCE})")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="upstream calls per second (default NBA_RATE_LIMIT)")
+    parser.add_argument("--force", action="store_true", help="re-fetch seasons already stored")
+    args = parser.parse_args(argv)
+
+    if args.rate is not None:
+        nba_client.set_rate_limit(args.rate, burst=1)
+
+    pairs = args.stat or catalog_stats()
+    seasons = seasons_since(args.since)
+    print(f"[ingest] {len(pairs)} tables x {len(seasons)} seasons into {player_store.STORE_DIR}")
+    start = time.time()
+    counts = ingest(pairs, seasons, force=args.force)
+    print(f"[ingest] Done in {round(time.time() - start, 1)}s — "
+          f"{counts['fetched']} fetched, {counts['skipped']} skipped, {counts['failed']} failed")
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,9 +2,18 @@
 nba_client.py — All NBA data fetching lives here.
 
 Strategy per feat:
-  "live"  → attempt nba_api query with timeout; fall back to mock on any error
+  "live"  → attempt nba_api query within a deadline; fall back to mock on any
+            error, or at once while the upstream circuit breaker is open
+  "store" → rank from the locally ingested player_store (see ingest.py), no
+            network; fall back to mock if the table is missing
   "mock"  → skip live attempt, load mock directly
 
+fetch_ranking() is the blocking entry point (nba_api, thread pool per crawl);
+fetch_ranking_async() is its awaitable twin built on stats_client (httpx).
+fetch_rankings() answers several feats at once, sharing one planned crawl.
+stream_ranking() yields a feat's ranking progressively: mock first, then the
+running live top-N as each season lands, then the finished result.
+
 Normalised ranking item shape:
   {
     "rank":      int,
@@ -15,13 +24,49 @@ Normalised ranking item shape:
   }
 """
 
+import asyncio
+import contextlib
+import functools
+import heapq
+import itertools
 import json
+import math
 import os
+import threading
 import time
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import date
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional
+
+import feats as feats_catalog
+import httpx
+
+import stats_client
 
 RODMAN_NAMES = {"dennis rodman", "rodman"}
 
+# Max LeagueLeaders calls in flight at once for one live ranking
+SEASON_FANOUT = int(os.environ.get("NBA_SEASON_FANOUT", "6"))
+
+# Completed seasons are stored forever; only the season in progress expires
+CURRENT_SEASON_TTL = int(os.environ.get("NBA_CURRENT_SEASON_TTL", "600"))
+
+# Wall-clock budget for one live ranking; slower seasons are left out
+RANKING_DEADLINE = float(os.environ.get("NBA_RANKING_DEADLINE", "20"))
+
+# Share of a feat's seasons that must answer for a (partial) live ranking
+PARTIAL_MIN = float(os.environ.get("NBA_PARTIAL_MIN", "0.5"))
+
+# Consecutive upstream failures that open the breaker, and how long it stays open
+BREAKER_THRESHOLD = int(os.environ.get("NBA_BREAKER_THRESHOLD", "5"))
+BREAKER_COOLDOWN = float(os.environ.get("NBA_BREAKER_COOLDOWN", "60"))
+
+# Upstream calls per second (per process, sync and async paths together),
+# the burst allowed on top, and the floor that throttle back-off stops at
+RATE_LIMIT = float(os.environ.get("NBA_RATE_LIMIT", "4"))
+RATE_BURST = int(os.environ.get("NBA_RATE_BURST", "4"))
+RATE_FLOOR = float(os.environ.get("NBA_RATE_FLOOR", "0.5"))
+
 _HERE = os.path.dirname(os.path.abspath(__file__))
 _MOCKS_SUB = os.path.join(_HERE, "mocks")
 MOCKS_DIR = _MOCKS_SUB if os.path.isdir(_MOCKS_SUB) else _HERE
@@ -61,141 +106,834 @@ def _normalise(player: dict) -> dict:
     }
 
 
+def _fetch_seasons(
+    seasons: list[Any], fetch_one: Callable[[Any], list], budget: Optional[float] = None
+) -> list:
+    """
+    Run fetch_one(season) for every season (or planned leader call) on a
+    bounded thread pool and concatenate the rows in `seasons` order — not
+    completion order — so the merged ranking is identical to a sequential
+    crawl. A season that raises contributes no rows, as before.
+
+    With a budget, whatever hasn't finished after `budget` seconds is left
+    out too. Those calls are not waited for; if they complete later their
+    payloads still land in the leader store for the next request.
+    """
+    def safe_fetch(season: Any) -> list:
+        try:
+            return fetch_one(season)
+        except Exception:
+            return []
+
+    workers = max(1, min(SEASON_FANOUT, len(seasons)))
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="nba-season")
+    futures = [pool.submit(safe_fetch, season) for season in seasons]
+    done, late = wait(futures, timeout=budget)
+    pool.shutdown(wait=False, cancel_futures=True)
+    if late:
+        print(f"[nba_client] Deadline: {len(late)}/{len(futures)} calls dropped after {budget}s")
+    return [row for future in futures if future in done for row in future.result()]
+
+
 # ---------------------------------------------------------------------------
-# Live fetchers — one per feat that uses source_strategy = "live"
+# Per-season leader store
+# A finished season's leader table never changes, so once fetched it is kept
+# for the life of the process; the in-progress season gets a short TTL.
+# Keyed by (season, stat category, per-mode); values are raw payloads.
 # ---------------------------------------------------------------------------
 
-def _fetch_season_rpg_live(top_n: int = 10) -> list[dict]:
+_leaders: dict[tuple[str, str, str], tuple[dict, float]] = {}
+_leaders_lock = threading.Lock()
+
+
+def current_season(today: Optional[date] = None) -> str:
+    """The season in progress (or last started) — NBA seasons tip off in October."""
+    today = today or date.today()
+    start = today.year if today.month >= 10 else today.year - 1
+    return f"{start}-{str(start + 1)[2:]}"
+
+
+def _season_is_final(season: str) -> bool:
+    return int(season[:4]) < int(current_season()[:4])
+
+
+def _stored_leaders(key: tuple[str, str, str]) -> Optional[dict]:
+    with _leaders_lock:
+        hit = _leaders.get(key)
+    if hit is None or time.time() > hit[1]:
+        return None
+    return hit[0]
+
+
+def _store_leaders(key: tuple[str, str, str], payload: dict) -> None:
+    expires_at = math.inf if _season_is_final(key[0]) else time.time() + CURRENT_SEASON_TTL
+    with _leaders_lock:
+        _leaders[key] = (payload, expires_at)
+
+
+# ---------------------------------------------------------------------------
+# Upstream guards
+# Every leagueleaders call, sync or async, goes through _guarded /
+# _guarded_async: the circuit breaker decides whether to try at all, the rate
+# limiter decides when, and the outcome is fed back to both.
+# ---------------------------------------------------------------------------
+
+class CircuitBreaker:
     """
-    Fetch top single-season RPG averages (post-1980) using PlayerSeasonStats.
-    We iterate multiple seasons and keep the overall leaders.
-    NOTE: This is an expensive call — cache is essential.
+    Consecutive-failure breaker for upstream calls.
+
+    After `threshold` failures in a row it opens: allow() is False for
+    `cooldown` seconds, so live attempts are skipped and rankings go straight
+    to mock. Once the cool-down has passed it is half-open: allow() lets a
+    single probe call through and refuses the rest until that probe reports
+    back; its success closes the breaker, its failure re-opens it at once. A
+    probe that never reports (cancelled, abandoned) is replaced after another
+    cool-down. ready() asks the same question without claiming the probe.
     """
-    from nba_api.stats.endpoints import leagueleaders
 
-    all_rows = []
-    # Sample key seasons covering Rodman's peak and competitors
-    seasons = [
-        "1991-92", "1992-93", "1993-94", "1994-95",
-        "1995-96", "1996-97", "1997-98",
-        "1981-82", "1982-83", "1986-87", "1989-90",
-        "2003-04", "2009-10",
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def ready(self) -> bool:
+        """Is a live attempt worth starting? (closed, or cool-down over)"""
+        with self._lock:
+            return self._opened_at is None or time.monotonic() - self._opened_at >= self.cooldown
+
+    def allow(self) -> bool:
+        """May one upstream call go out now? Claims the probe while half-open."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self._opened_at < self.cooldown:
+                return False
+            if self._probe_at is not None and now - self._probe_at < self.cooldown:
+                return False
+            self._probe_at = now
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                print("[nba_client] Circuit closed — upstream answering again")
+            self._failures = 0
+            self._opened_at = None
+            self._probe_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.threshold:
+                if self._opened_at is None:
+                    print(f"[nba_client] Circuit open after {self._failures} failures "
+                          f"— live skipped for {self.cooldown}s")
+                self._opened_at = time.monotonic()
+                self._probe_at = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_at = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            if self._opened_at is None:
+                state, retry_in = "closed", 0.0
+            else:
+                retry_in = max(0.0, self.cooldown - (time.monotonic() - self._opened_at))
+                state = "open" if retry_in > 0 else "half_open"
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "retry_in": round(retry_in, 1),
+            }
+
+
+class RateLimiter:
+    """
+    Adaptive token bucket shared by every upstream call in the process.
+
+    Tokens refill at `rate` per second up to `burst`. A caller takes a token
+    even when the bucket is empty and sleeps off the debt, so waiters are
+    served in arrival order and never spin. The rate adapts AIMD-style: a 429
+    or timeout halves it (down to `floor`) and empties the bucket; each
+    success adds back a tenth of `max_rate`.
+    """
+
+    def __init__(self, rate: float = RATE_LIMIT, burst: int = RATE_BURST, floor: float = RATE_FLOOR):
+        self.max_rate = max(rate, 1e-3)
+        self.floor = min(max(floor, 1e-3), self.max_rate)
+        self.burst = max(1, burst)
+        self.rate = self.max_rate
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._waiting = 0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take one token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def _queued(self, delta: int) -> None:
+        with self._lock:
+            self._waiting += delta
+
+    def acquire(self) -> None:
+        delay = self._reserve()
+        if delay > 0:
+            self._queued(1)
+            try:
+                time.sleep(delay)
+            finally:
+                self._queued(-1)
+
+    async def acquire_async(self) -> None:
+        delay = self._reserve()
+        if delay > 0:
+            self._queued(1)
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self._queued(-1)
+
+    def record_throttle(self) -> None:
+        with self._lock:
+            self.rate = max(self.floor, self.rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+        print(f"[nba_client] Upstream throttling — rate now {self.rate:.2f}/s")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+    def set_rate(self, rate: float, burst: Optional[int] = None) -> None:
+        """Change the ceiling (and burst) in place; the current rate restarts at it."""
+        with self._lock:
+            self.max_rate = max(rate, 1e-3)
+            self.floor = min(self.floor, self.max_rate)
+            self.rate = self.max_rate
+            if burst is not None:
+                self.burst = max(1, burst)
+                self._tokens = min(self._tokens, float(self.burst))
+
+    def reset(self) -> None:
+        with self._lock:
+            self.rate = self.max_rate
+            self._tokens = float(self.burst)
+            self._updated = time.monotonic()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rate":        round(self.rate, 3),
+                "max_rate":    self.max_rate,
+                "burst":       self.burst,
+                "tokens":      round(max(self._tokens, 0.0), 2),
+                "queue_depth": self._waiting,
+            }
+
+
+class Throttled(RuntimeError):
+    """The upstream answered 429 Too Many Requests."""
+
+
+_breaker = CircuitBreaker()
+_limiter = RateLimiter()
+
+
+def set_rate_limit(rate: float, burst: Optional[int] = None) -> None:
+    """Re-pace every upstream call in the process (e.g. a gentler offline crawl)."""
+    _limiter.set_rate(rate, burst)
+
+
+def upstream_ready() -> bool:
+    """False while the circuit breaker is open and upstream calls would be refused."""
+    return _breaker.ready()
+
+
+def _is_throttle(exc: BaseException) -> bool:
+    """429s and timeouts — the upstream telling us to slow down."""
+    if isinstance(exc, (Throttled, TimeoutError, httpx.TimeoutException)):
+        return True
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 429
+
+
+def _record(exc: Optional[BaseException]) -> None:
+    """Feed one upstream call's outcome to the breaker and the limiter."""
+    if exc is None:
+        _breaker.record_success()
+        _limiter.record_success()
+        return
+    _breaker.record_failure()
+    if _is_throttle(exc):
+        _limiter.record_throttle()
+
+
+def _guarded(request: Callable[[], dict]) -> dict:
+    """Make one upstream call through the breaker and the rate limiter."""
+    if not _breaker.allow():
+        raise RuntimeError("Upstream circuit open")
+    _limiter.acquire()
+    try:
+        payload = request()
+    except Exception as exc:
+        _record(exc)
+        raise
+    _record(None)
+    return payload
+
+
+async def _guarded_async(request: Callable[[], Awaitable[dict]]) -> dict:
+    """Async twin of _guarded; waits for a token without blocking the loop."""
+    if not _breaker.allow():
+        raise RuntimeError("Upstream circuit open")
+    await _limiter.acquire_async()
+    try:
+        payload = await request()
+    except Exception as exc:
+        _record(exc)
+        raise
+    _record(None)
+    return payload
+
+
+# ---------------------------------------------------------------------------
+# Upstream calls, store first
+# ---------------------------------------------------------------------------
+
+def _request_leaders(season: str, stat: str, per_mode: str) -> dict:
+    """
+    One blocking leagueleaders call through nba_api's HTTP layer.
+
+    Deliberately bypasses nba_api.stats.endpoints: importing that package pulls
+    in pandas (hundreds of ms and tens of MB per worker), and the endpoint
+    class would build DataFrames we never read. We only need the raw payload.
+    """
+    from nba_api.stats.library.http import NBAStatsHTTP
+    from requests import Timeout
+
+    http = NBAStatsHTTP()
+    # Same upstream root as stats_client, so NBA_STATS_BASE_URL redirects both
+    http.base_url = f"{stats_client.BASE_URL}/{{endpoint}}"
+    try:
+        response = http.send_api_request(
+            endpoint="leagueleaders",
+            parameters={
+                "ActiveFlag":   "",
+                "LeagueID":     "00",
+                "PerMode":      per_mode,
+                "Scope":        "S",
+                "Season":       season,
+                "SeasonType":   "Regular Season",
+                "StatCategory": stat,
+            },
+            timeout=stats_client.TIMEOUT,
+        )
+    except Timeout as exc:
+        raise TimeoutError(str(exc)) from exc
+    # nba_api hands back error responses instead of raising
+    status = response._status_code or 200
+    if status == 429:
+        raise Throttled(f"429 from leagueleaders ({season} {stat})")
+    if status >= 400:
+        raise RuntimeError(f"HTTP {status} from leagueleaders ({season} {stat})")
+    return response.get_dict()
+
+
+def _leaders_payload(season: str, stat: str, per_mode: str) -> dict:
+    """One season's leagueleaders payload via nba_api, from the store when possible."""
+    key = (season, stat, per_mode)
+    payload = _stored_leaders(key)
+    if payload is None:
+        payload = _guarded(lambda: _request_leaders(season, stat, per_mode))
+        _store_leaders(key, payload)
+    return payload
+
+
+def fetch_leaders(season: str, stat: str, per_mode: str) -> dict:
+    """
+    One season's leagueleaders payload straight from upstream, through the
+    breaker and rate limiter but not the in-memory leader store — for bulk
+    crawls (ingest.py) that persist each table themselves.
+    """
+    return _guarded(lambda: _request_leaders(season, stat, per_mode))
+
+
+async def _leaders_payload_async(season: str, stat: str, per_mode: str) -> dict:
+    """Async twin of _leaders_payload, fetching through stats_client."""
+    key = (season, stat, per_mode)
+    payload = _stored_leaders(key)
+    if payload is None:
+        payload = await _guarded_async(lambda: stats_client.league_leaders(season, stat, per_mode))
+        _store_leaders(key, payload)
+    return payload
+
+
+def leader_store_stats() -> dict:
+    """How many season tables are held, split into final vs current-season."""
+    with _leaders_lock:
+        final = sum(1 for _, expires_at in _leaders.values() if expires_at == math.inf)
+        return {"entries": len(_leaders), "final": final, "current": len(_leaders) - final}
+
+
+def clear_leader_store() -> None:
+    with _leaders_lock:
+        _leaders.clear()
+
+
+def upstream_stats() -> dict:
+    """Breaker state, limiter rate/queue and leader-store occupancy, for the ops route."""
+    return {
+        "breaker":      _breaker.stats(),
+        "limiter":      _limiter.stats(),
+        "leader_store": leader_store_stats(),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Leader rows and streaming top-k
+# ---------------------------------------------------------------------------
+
+
+def _leader_row(name: str, team: str, value: int | float, season: str) -> dict:
+    return {
+        "player":    name,
+        "team":      team,
+        "value":     value,
+        "is_rodman": _is_rodman(name),
+        "season":    season,
+    }
+
+
+def _payload_rows(
+    payload: dict, season: str, stat: str, head: int, cast: Callable[[Any], int | float]
+) -> list[dict]:
+    """
+    Read the first `head` leader rows of a raw leagueleaders payload.
+
+    Works on the headers/rowSet arrays directly: three column indexes are
+    resolved once per season and only `head` rows are touched — no DataFrame,
+    no per-row Series boxing.
+    """
+    headers, row_set = stats_client.result_set(payload)
+    player, team, value = headers.index("PLAYER"), headers.index("TEAM"), headers.index(stat)
+    return [
+        _leader_row(str(raw[player]), str(raw[team]), cast(raw[value]), season)
+        for raw in row_set[:head]
     ]
 
-    for season in seasons:
+
+@functools.total_ordering
+class _Later:
+    """Arrival-order wrapper that compares later arrivals as smaller (i.e. worse)."""
+
+    __slots__ = ("order",)
+
+    def __init__(self, order: Any):
+        self.order = order
+
+    def __lt__(self, other: "_Later") -> bool:
+        return self.order > other.order
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Later) and self.order == other.order
+
+
+class TopK:
+    """
+    Streaming top-k over ranking rows, keeping each player's best row only.
+
+    Rows can be pushed as they arrive, in any order. Ranking is by value
+    descending, ties going to the row with the smaller `order` (its arrival
+    position unless the caller passes one) — the same result as a stable sort
+    of every row followed by first-seen dedupe, which is what the live fetchers
+    used to do. Memory is O(k) and each push is O(log k): a min-heap holds the
+    current k players with the worst on top; superseded heap items are skipped
+    lazily and the heap is rebuilt when they pile up.
+    """
+
+    def __init__(self, k: int):
+        self.k = max(0, k)
+        self._best: dict[str, tuple[Any, _Later, dict]] = {}
+        self._heap: list[tuple[Any, _Later, str]] = []
+        self._arrivals = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._best)
+
+    def push(self, row: dict, order: Any = None) -> bool:
+        """Offer one row. Returns True if it changed the current top-k."""
+        if self.k == 0:
+            return False
+        key = (row["value"], _Later(next(self._arrivals) if order is None else order))
+        player = row["player"]
+
+        held = self._best.get(player)
+        if held is not None:
+            if key <= held[:2]:
+                return False
+        elif len(self._best) >= self.k and key <= self._worst()[:2]:
+            return False
+
+        self._best[player] = (*key, row)
+        heapq.heappush(self._heap, (*key, player))
+        if len(self._best) > self.k:
+            del self._best[self._worst()[2]]
+        if len(self._heap) > 2 * self.k + 16:
+            self._heap = [(v, o, p) for p, (v, o, _) in self._best.items()]
+            heapq.heapify(self._heap)
+        return True
+
+    def extend(self, rows: list[dict]) -> None:
+        for row in rows:
+            self.push(row)
+
+    def result(self) -> list[dict]:
+        """Current leaders, best first, with rank fields added."""
+        ordered = sorted(self._best.values(), key=lambda held: (held[0], held[1]), reverse=True)
+        return _add_ranks([dict(row) for _, _, row in ordered])
+
+    def _worst(self) -> tuple[Any, _Later, str]:
+        """Heap top after discarding items for rows that were superseded or evicted."""
+        while True:
+            value, order, player = self._heap[0]
+            held = self._best.get(player)
+            if held is not None and held[0] == value and held[1] == order:
+                return self._heap[0]
+            heapq.heappop(self._heap)
+
+
+# ---------------------------------------------------------------------------
+# Live query planner
+# Live feats declare a "live_query" in feats.py. Every query is a set of
+# (season, stat, per_mode) leagueleaders calls; the planner merges them across
+# feats so each distinct call runs once, then fans the payloads out to each
+# feat's TopK.
+# ---------------------------------------------------------------------------
+
+LeaderKey = tuple[str, str, str]  # (season, stat category, per-mode)
+
+# Transforms a live_query can name for its "value" field
+VALUE_TRANSFORMS: dict[str, Callable[[Any], int | float]] = {
+    "int":    int,
+    "round1": lambda v: round(float(v), 1),
+}
+
+LIVE_QUERIES: dict[str, dict] = {
+    feat_id: feat["live_query"]
+    for feat_id, feat in feats_catalog.FEATS.items()
+    if feat["source_strategy"] == "live" and "live_query" in feat
+}
+
+
+def _query_keys(query: dict) -> list[LeaderKey]:
+    return [(season, query["stat"], query["per_mode"]) for season in query["seasons"]]
+
+
+def plan_queries(queries: Iterable[dict]) -> list[LeaderKey]:
+    """
+    The distinct upstream calls needed to answer every query, in first-seen
+    order. Depth and value transform are not part of the key: a leagueleaders
+    payload carries the whole table, so one call serves any depth.
+    """
+    return list(dict.fromkeys(key for query in queries for key in _query_keys(query)))
+
+
+def _rank_query(feat_id: str, query: dict, payloads: dict[LeaderKey, dict], top_n: int) -> list[dict]:
+    """
+    Rank one feat from already-fetched payloads: the first `depth` rows of each
+    of its seasons, in season order, through TopK. A season whose call failed,
+    missed the deadline or whose table can't be read contributes no rows.
+    Raises if fewer than PARTIAL_MIN of the seasons answered, or none had rows.
+    """
+    keys = _query_keys(query)
+    answered = sum(1 for key in keys if key in payloads)
+    if answered < PARTIAL_MIN * len(keys):
+        raise RuntimeError(f"Only {answered}/{len(keys)} seasons answered for {feat_id}")
+    if answered < len(keys):
+        print(f"[nba_client] Partial live '{feat_id}': {answered}/{len(keys)} seasons")
+
+    cast = VALUE_TRANSFORMS[query["value"]]
+    top = TopK(top_n)
+    seen = False
+    for key in keys:
+        payload = payloads.get(key)
+        if payload is None:
+            continue
         try:
-            resp = leagueleaders.LeagueLeaders(
-                league_id="00",
-                season=season,
-                season_type_all_star="Regular Season",
-                per_mode48="PerGame",
-                scope="S",
-                stat_category_abbreviation="REB",
-            )
-            df = resp.get_data_frames()[0]
-            for _, row in df.head(5).iterrows():
-                name = str(row.get("PLAYER", "Unknown"))
-                reb = float(row.get("REB", 0))
-                all_rows.append({
-                    "player":    name,
-                    "team":      str(row.get("TEAM", "")),
-                    "value":     round(reb, 1),
-                    "is_rodman": _is_rodman(name),
-                    "season":    season,
-                })
+            rows = _payload_rows(payload, key[0], query["stat"], query["depth"], cast)
         except Exception:
             continue
+        seen = seen or bool(rows)
+        top.extend(rows)
+    if not seen:
+        raise RuntimeError(f"No live data retrieved for {feat_id}")
+    return top.result()
 
-    if not all_rows:
-        raise RuntimeError("No live data retrieved for season_rpg")
-
-    # Sort by value descending, deduplicate keeping best season per player
-    all_rows.sort(key=lambda x: x["value"], reverse=True)
-    seen: set[str] = set()
-    unique: list[dict] = []
-    for row in all_rows:
-        if row["player"] not in seen:
-            seen.add(row["player"])
-            unique.append(row)
-        if len(unique) >= top_n:
-            break
 
-    return _add_ranks(unique)
+def _fetch_payloads(keys: list[LeaderKey]) -> dict[LeaderKey, dict]:
+    """
+    Run each planned call once on the season pool, within RANKING_DEADLINE;
+    calls that failed or ran late are absent.
+    """
+    fetched = _fetch_seasons(keys, lambda key: [(key, _leaders_payload(*key))], RANKING_DEADLINE)
+    return dict(fetched)
 
 
-def _fetch_offensive_rebounds_season_live(top_n: int = 10) -> list[dict]:
+def fetch_live_rankings(feat_ids: Iterable[str], top_n: int = 10) -> dict[str, list[dict]]:
     """
-    Fetch top single-season offensive rebound totals (post-1980).
+    Live rankings for several feats from one merged crawl. Feats without a
+    live query, or for which no data came back, are left out of the result.
     """
-    from nba_api.stats.endpoints import leagueleaders
+    queries = {f: LIVE_QUERIES[f] for f in feat_ids if f in LIVE_QUERIES}
+    keys = plan_queries(queries.values())
+    print(f"[nba_client] Planned {len(keys)} upstream calls for {len(queries)} feats")
+    return _rank_queries(queries, _fetch_payloads(keys), top_n)
 
-    all_rows = []
-    seasons = [
-        "1991-92", "1992-93", "1993-94", "1994-95",
-        "1995-96", "1981-82", "1982-83", "1986-87",
-        "1989-90", "2007-08",
-    ]
 
-    for season in seasons:
+def _rank_queries(queries: dict[str, dict], payloads: dict[LeaderKey, dict], top_n: int) -> dict[str, list[dict]]:
+    """Rank every planned feat from one set of payloads; feats that fail are left out."""
+    rankings: dict[str, list[dict]] = {}
+    for feat_id, query in queries.items():
         try:
-            resp = leagueleaders.LeagueLeaders(
-                league_id="00",
-                season=season,
-                season_type_all_star="Regular Season",
-                per_mode48="Totals",
-                scope="S",
-                stat_category_abbreviation="OREB",
+            rankings[feat_id] = _rank_query(feat_id, query, payloads, top_n)
+        except RuntimeError as exc:
+            print(f"[nba_client] Live FAIL '{feat_id}': {exc}")
+    return rankings
+
+
+def _live_fetcher(feat_id: str) -> Callable[..., list[dict]]:
+    """Single-feat fetcher for LIVE_FETCHERS: plan just this feat's query."""
+    def fetch(top_n: int = 10) -> list[dict]:
+        query = LIVE_QUERIES[feat_id]
+        return _rank_query(feat_id, query, _fetch_payloads(plan_queries([query])), top_n)
+
+    fetch.__name__ = f"fetch_{feat_id}_live"
+    return fetch
+
+
+# ---------------------------------------------------------------------------
+# Async planner — same plan via stats_client (httpx), no threads
+# Waiting on upstream costs a coroutine, not a thread. Parsing and ranking the
+# payloads is CPU work, so it runs in a worker thread (asyncio.to_thread) to
+# keep the event loop free for other requests.
+# ---------------------------------------------------------------------------
+
+async def _fetch_seasons_async(
+    seasons: list[Any], fetch_one: Callable[[Any], Awaitable[list]], budget: Optional[float] = None
+) -> list:
+    """
+    Async twin of _fetch_seasons: at most SEASON_FANOUT requests in flight,
+    and whatever is still pending after `budget` seconds is cancelled.
+    """
+    slots = asyncio.Semaphore(max(1, SEASON_FANOUT))
+
+    async def safe_fetch(season: Any) -> list:
+        async with slots:
+            try:
+                return await fetch_one(season)
+            except Exception:
+                return []
+
+    tasks = [asyncio.ensure_future(safe_fetch(s)) for s in seasons]
+    if not tasks:
+        return []
+    done, late = await asyncio.wait(tasks, timeout=budget)
+    for task in late:
+        task.cancel()
+    if late:
+        print(f"[nba_client] Deadline: {len(late)}/{len(tasks)} calls dropped after {budget}s")
+    return [row for task in tasks if task in done for row in task.result()]
+
+
+async def _fetch_payloads_async(keys: list[LeaderKey]) -> dict[LeaderKey, dict]:
+    async def fetch_one(key: LeaderKey) -> list:
+        return [(key, await _leaders_payload_async(*key))]
+
+    return dict(await _fetch_seasons_async(keys, fetch_one, RANKING_DEADLINE))
+
+
+async def fetch_live_rankings_async(feat_ids: Iterable[str], top_n: int = 10) -> dict[str, list[dict]]:
+    """Async twin of fetch_live_rankings."""
+    queries = {f: LIVE_QUERIES[f] for f in feat_ids if f in LIVE_QUERIES}
+    payloads = await _fetch_payloads_async(plan_queries(queries.values()))
+    return await asyncio.to_thread(_rank_queries, queries, payloads, top_n)
+
+
+async def _iter_payloads_async(keys: list[LeaderKey]) -> AsyncIterator[tuple[LeaderKey, dict]]:
+    """
+    Like _fetch_payloads_async, but yields each (key, payload) as soon as it
+    lands. Failed calls are skipped; calls still out at the deadline, or when
+    the consumer stops early, are cancelled.
+    """
+    slots = asyncio.Semaphore(max(1, SEASON_FANOUT))
+
+    async def fetch_one(key: LeaderKey) -> tuple[LeaderKey, dict]:
+        async with slots:
+            return key, await _leaders_payload_async(*key)
+
+    pending = {asyncio.ensure_future(fetch_one(key)) for key in keys}
+    deadline = time.monotonic() + RANKING_DEADLINE
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, timeout=max(0.0, deadline - time.monotonic()),
+                return_when=asyncio.FIRST_COMPLETED,
             )
-            df = resp.get_data_frames()[0]
-            for _, row in df.head(3).iterrows():
-                name = str(row.get("PLAYER", "Unknown"))
-                oreb = int(row.get("OREB", 0))
-                all_rows.append({
-                    "player":    name,
-                    "team":      str(row.get("TEAM", "")),
-                    "value":     oreb,
-                    "is_rodman": _is_rodman(name),
-                    "season":    season,
-                })
-        except Exception:
-            continue
+            if not done:
+                print(f"[nba_client] Deadline: {len(pending)}/{len(keys)} calls dropped "
+                      f"after {RANKING_DEADLINE}s")
+                break
+            for task in done:
+                if task.exception() is None:
+                    yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
 
-    if not all_rows:
-        raise RuntimeError("No live data retrieved for offensive_rebounds_season")
 
-    all_rows.sort(key=lambda x: x["value"], reverse=True)
-    seen: set[str] = set()
-    unique: list[dict] = []
-    for row in all_rows:
-        if row["player"] not in seen:
-            seen.add(row["player"])
-            unique.append(row)
-        if len(unique) >= top_n:
-            break
+def _live_fetcher_async(feat_id: str) -> Callable[..., Awaitable[list[dict]]]:
+    async def fetch(top_n: int = 10) -> list[dict]:
+        query = LIVE_QUERIES[feat_id]
+        payloads = await _fetch_payloads_async(plan_queries([query]))
+        return await asyncio.to_thread(_rank_query, feat_id, query, payloads, top_n)
 
-    return _add_ranks(unique)
+    fetch.__name__ = f"fetch_{feat_id}_live_async"
+    return fetch
+
+
+# ---------------------------------------------------------------------------
+# Store strategy
+# Feats with source_strategy "store" declare a "store_query" (stat, per_mode,
+# value transform, optional seasons) and are ranked from player_store's
+# ingested tables with its vectorised top-k. player_store pulls in numpy, so
+# it is only imported once a store feat is actually served.
+# ---------------------------------------------------------------------------
+
+def _store_ranking(feat_id: str, query: dict, top_n: int) -> list[dict]:
+    import player_store
+
+    cast = VALUE_TRANSFORMS[query["value"]]
+    rows = player_store.top_k(query["stat"], query["per_mode"], top_n, query.get("seasons"))
+    if not rows:
+        raise RuntimeError(f"No stored data for {feat_id}")
+    return _add_ranks([
+        _leader_row(player, team, cast(value), season) for player, team, season, value in rows
+    ])
+
+
+def _from_store(feat: dict, top_n: int) -> Optional[list[dict]]:
+    """Normalised store ranking for a "store" feat, or None to fall back to mock."""
+    if feat["source_strategy"] != "store" or "store_query" not in feat:
+        return None
+    try:
+        ranking = _store_ranking(feat["id"], feat["store_query"], top_n)
+    except Exception as exc:
+        print(f"[nba_client] Store FAIL '{feat['id']}': {exc} — using mock")
+        return None
+    return [_normalise(p) for p in ranking]
+
+
+# ---------------------------------------------------------------------------
+# Mock index
+# Each mock file is read, normalised and ranked once and kept as a tuple of
+# finished entries, so serving a mock is a slice — no disk read, no JSON
+# parse, no per-entry dict building. Entries are shared between callers and
+# must be treated as read-only. A file whose mtime changes is re-read on its
+# next use, so edited mocks show up without a restart.
+# ---------------------------------------------------------------------------
+
+_mocks: dict[str, tuple[int, tuple[dict, ...]]] = {}
+_mocks_lock = threading.Lock()
+
+
+def _mock_entries(mock_file: str) -> tuple[dict, ...]:
+    path = os.path.join(MOCKS_DIR, mock_file)
+    mtime = os.stat(path).st_mtime_ns
+    with _mocks_lock:
+        hit = _mocks.get(path)
+    if hit is not None and hit[0] == mtime:
+        return hit[1]
+
+    raw = _load_mock(mock_file)
+    entries = tuple(_add_ranks([_normalise(p) for p in raw.get("ranking", [])]))
+    with _mocks_lock:
+        _mocks[path] = (mtime, entries)
+    return entries
+
+
+def preload_mocks(mock_files: Optional[Iterable[str]] = None) -> int:
+    """Index every catalog mock up front (app startup). Returns how many were loaded."""
+    if mock_files is None:
+        mock_files = {feat["mock_file"] for feat in feats_catalog.FEATS.values()}
+    loaded = 0
+    for mock_file in mock_files:
+        try:
+            _mock_entries(mock_file)
+            loaded += 1
+        except (OSError, ValueError) as exc:
+            print(f"[nba_client] Mock '{mock_file}' not indexed: {exc}")
+    return loaded
+
+
+def clear_mock_index() -> None:
+    with _mocks_lock:
+        _mocks.clear()
+
+
+def _mock_ranking(mock_file: str, top_n: int) -> list[dict]:
+    return list(_mock_entries(mock_file)[:top_n])
+
+
+def mock_ranking(feat: dict, top_n: int = 10) -> list[dict]:
+    """feat's mock ranking, straight from the in-memory index — never waits on upstream."""
+    return _mock_ranking(feat["mock_file"], top_n)
 
 
 # ---------------------------------------------------------------------------
 # Dispatcher
 # ---------------------------------------------------------------------------
 
-LIVE_FETCHERS: dict[str, Any] = {
-    "season_rpg":                  _fetch_season_rpg_live,
-    "offensive_rebounds_season":   _fetch_offensive_rebounds_season_live,
+LIVE_FETCHERS: dict[str, Any] = {feat_id: _live_fetcher(feat_id) for feat_id in LIVE_QUERIES}
+
+LIVE_FETCHERS_ASYNC: dict[str, Any] = {
+    feat_id: _live_fetcher_async(feat_id) for feat_id in LIVE_QUERIES
 }
 
 
+def _live_allowed(feat_id: str) -> bool:
+    """False (and say so) while the breaker is open — the feat goes straight to mock."""
+    if _breaker.ready():
+        return True
+    print(f"[nba_client] Circuit open — '{feat_id}' served from mock")
+    return False
+
+
 def fetch_ranking(feat: dict, top_n: int = 10) -> tuple[list[dict], str]:
     """
     Fetch ranking for a feat. Returns (ranking, source).
-    source is "live" or "mock". Never raises — always falls back to mock.
+    source is "live", "store" or "mock". Never raises — always falls back to mock.
     """
     feat_id  = feat["id"]
     strategy = feat["source_strategy"]
     mock_file = feat["mock_file"]
 
-    if strategy == "live" and feat_id in LIVE_FETCHERS:
+    stored = _from_store(feat, top_n)
+    if stored is not None:
+        return stored, "store"
+
+    if strategy == "live" and feat_id in LIVE_FETCHERS and _live_allowed(feat_id):
         try:
             start   = time.time()
             ranking = LIVE_FETCHERS[feat_id](top_n=top_n)
@@ -206,7 +944,127 @@ def fetch_ranking(feat: dict, top_n: int = 10) -> tuple[list[dict], str]:
             print(f"[nba_client] Live FAIL '{feat_id}': {exc} — using mock")
 
     # Load mock fallback
-    raw = _load_mock(mock_file)
-    ranking = [_normalise(p) for p in raw.get("ranking", [])[:top_n]]
-    _add_ranks(ranking)
-    return ranking, "mock"
+    return _mock_ranking(mock_file, top_n), "mock"
+
+
+def fetch_rankings(feats: list[dict], top_n: int = 10) -> dict[str, tuple[list[dict], str]]:
+    """
+    fetch_ranking for several feats, keyed by feat id. Live feats share one
+    planned crawl, so a season/stat table they have in common is fetched once;
+    anything that gets no live data falls back to its mock. Store feats are
+    ranked locally. Never raises.
+    """
+    live_ids = [f["id"] for f in feats if f["source_strategy"] == "live"]
+    live_ids = [f for f in live_ids if _live_allowed(f)]
+    try:
+        live = fetch_live_rankings(live_ids, top_n=top_n)
+    except Exception as exc:
+        print(f"[nba_client] Live FAIL {live_ids}: {exc} — using mocks")
+        live = {}
+
+    results: dict[str, tuple[list[dict], str]] = {}
+    for feat in feats:
+        stored = _from_store(feat, top_n)
+        if feat["id"] in live:
+            results[feat["id"]] = [_normalise(p) for p in live[feat["id"]]], "live"
+        elif stored is not None:
+            results[feat["id"]] = stored, "store"
+        else:
+            results[feat["id"]] = _mock_ranking(feat["mock_file"], top_n), "mock"
+    return results
+
+
+async def fetch_ranking_async(feat: dict, top_n: int = 10) -> tuple[list[dict], str]:
+    """
+    Async counterpart of fetch_ranking, for routes that await instead of
+    occupying a threadpool worker. Same contract: returns (ranking, source)
+    and never raises.
+    """
+    feat_id  = feat["id"]
+    strategy = feat["source_strategy"]
+    mock_file = feat["mock_file"]
+
+    # A store read may load a table from disk and runs numpy top-k: off the loop
+    if strategy == "store":
+        stored = await asyncio.to_thread(_from_store, feat, top_n)
+        if stored is not None:
+            return stored, "store"
+
+    if strategy == "live" and feat_id in LIVE_FETCHERS_ASYNC and _live_allowed(feat_id):
+        try:
+            start   = time.time()
+            ranking = await LIVE_FETCHERS_ASYNC[feat_id](top_n=top_n)
+            elapsed = round(time.time() - start, 2)
+            print(f"[nba_client] Live OK  '{feat_id}' in {elapsed}s (async)")
+            # top_n rows at most, so cheap enough to normalise on the loop
+            return [_normalise(p) for p in ranking], "live"
+        except Exception as exc:
+            print(f"[nba_client] Live FAIL '{feat_id}': {exc} — using mock")
+
+    # Served from the in-memory index; only a stale or unseen file touches disk
+    return _mock_ranking(mock_file, top_n), "mock"
+
+
+# ---------------------------------------------------------------------------
+# Streaming
+# ---------------------------------------------------------------------------
+
+def _step(ranking: list[dict], source: str, done: int = 0, total: int = 0, final: bool = False) -> dict:
+    return {"ranking": ranking, "source": source, "seasons_done": done,
+            "seasons_total": total, "final": final}
+
+
+async def stream_ranking(feat: dict, top_n: int = 10) -> AsyncIterator[dict]:
+    """
+    fetch_ranking_async, progressively. Yields steps shaped
+      {"ranking", "source", "seasons_done", "seasons_total", "final"}
+    For a live feat: the mock ranking at once, then a "partial" step each
+    time an arriving season changes the running top_n, then a final "live"
+    step — or a final "mock" one if the crawl fails. Store and mock feats,
+    and live ones while the breaker is open, yield just the final step.
+    Never raises.
+    """
+    feat_id = feat["id"]
+    mock_file = feat["mock_file"]
+
+    if feat["source_strategy"] == "store":
+        stored = await asyncio.to_thread(_from_store, feat, top_n)
+        if stored is not None:
+            yield _step(stored, "store", final=True)
+            return
+
+    if feat["source_strategy"] != "live" or feat_id not in LIVE_QUERIES or not _live_allowed(feat_id):
+        yield _step(_mock_ranking(mock_file, top_n), "mock", final=True)
+        return
+
+    query = LIVE_QUERIES[feat_id]
+    keys = _query_keys(query)
+    cast = VALUE_TRANSFORMS[query["value"]]
+    yield _step(_mock_ranking(mock_file, top_n), "mock", total=len(keys))
+
+    start = time.time()
+    payloads: dict[LeaderKey, dict] = {}
+    top = TopK(top_n)
+    try:
+        async with contextlib.aclosing(_iter_payloads_async(plan_queries([query]))) as arrivals:
+            async for key, payload in arrivals:
+                payloads[key] = payload
+                try:
+                    rows = _payload_rows(payload, key[0], query["stat"], query["depth"], cast)
+                except Exception:
+                    continue
+                # Season order as the tiebreak, so the running top_n converges
+                # on exactly what _rank_query gives for the same payloads
+                season = keys.index(key)
+                changed = [top.push(row, order=(season, i)) for i, row in enumerate(rows)]
+                if any(changed):
+                    yield _step([_normalise(p) for p in top.result()], "partial",
+                                len(payloads), len(keys))
+        ranking = await asyncio.to_thread(_rank_query, feat_id, query, payloads, top_n)
+    except Exception as exc:
+        print(f"[nba_client] Live FAIL '{feat_id}': {exc} — using mock")
+        yield _step(_mock_ranking(mock_file, top_n), "mock", len(payloads), len(keys), final=True)
+        return
+
+    print(f"[nba_client] Live OK  '{feat_id}' in {round(time.time() - start, 2)}s (stream)")
+    yield _step([_normalise(p) for p in ranking], "live", len(payloads), len(keys), final=True)
@@ -0,0 +1,178 @@
+"""
+player_store.py — Local columnar store of league-leader player-seasons.
+
+Filled offline by ingest.py, read at serve time by the "store" source
+strategy in nba_client — no network involved once the data is on disk.
+
+Layout under STORE_DIR, one table per (stat category, per-mode):
+  parts/<STAT>_<PerMode>/<season>.npz   one season as ingested (resume unit)
+  <STAT>_<PerMode>.npz                  all seasons, compacted by compact()
+
+Every file holds plain column arrays (no pickles): player, team, value and,
+in compacted tables, season. Rows keep the upstream leader order within each
+season and seasons are in ascending order.
+
+Config (environment):
+  NBA_STORE_DIR   where tables live   (default backend/data/store)
+"""
+
+import os
+import threading
+from typing import Iterable, NamedTuple, Optional
+
+import numpy as np
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.environ.get("NBA_STORE_DIR", os.path.join(_HERE, "data", "store"))
+
+
+class Table(NamedTuple):
+    season: np.ndarray  # <U7, e.g. "1991-92"
+    player: np.ndarray  # <U
+    team:   np.ndarray  # <U
+    value:  np.ndarray  # float64
+
+
+# ---------------------------------------------------------------------------
+# Paths and atomic writes
+# ---------------------------------------------------------------------------
+
+def _name(stat: str, per_mode: str) -> str:
+    return f"{stat}_{per_mode}"
+
+
+def table_path(stat: str, per_mode: str) -> str:
+    return os.path.join(STORE_DIR, f"{_name(stat, per_mode)}.npz")
+
+
+def part_path(stat: str, per_mode: str, season: str) -> str:
+    return os.path.join(STORE_DIR, "parts", _name(stat, per_mode), f"{season}.npz")
+
+
+def _write_npz(path: str, **columns: np.ndarray) -> None:
+    """Write via a temp file and rename, so a crash never leaves half a table."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, **columns)
+    os.replace(tmp, path)
+
+
+# ---------------------------------------------------------------------------
+# Writing (ingest side)
+# ---------------------------------------------------------------------------
+
+def has_season(stat: str, per_mode: str, season: str) -> bool:
+    return os.path.isfile(part_path(stat, per_mode, season))
+
+
+def save_season(stat: str, per_mode: str, season: str, rows: list[tuple[str, str, float]]) -> None:
+    """Store one season's (player, team, value) rows, in leader order."""
+    player, team, value = zip(*rows) if rows else ((), (), ())
+    _write_npz(
+        part_path(stat, per_mode, season),
+        player=np.array(player, dtype=str),
+        team=np.array(team, dtype=str),
+        value=np.array(value, dtype=np.float64),
+    )
+
+
+def stored_seasons(stat: str, per_mode: str) -> list[str]:
+    parts = os.path.dirname(part_path(stat, per_mode, "x"))
+    if not os.path.isdir(parts):
+        return []
+    return sorted(f[:-4] for f in os.listdir(parts) if f.endswith(".npz"))
+
+
+def compact(stat: str, per_mode: str) -> int:
+    """Merge every stored season into the single serving table. Returns its row count."""
+    seasons, players, teams, values = [], [], [], []
+    for season in stored_seasons(stat, per_mode):
+        with np.load(part_path(stat, per_mode, season)) as part:
+            seasons.append(np.full(len(part["value"]), season, dtype="<U7"))
+            players.append(part["player"])
+            teams.append(part["team"])
+            values.append(part["value"])
+
+    def joined(columns: list[np.ndarray], dtype) -> np.ndarray:
+        return np.concatenate(columns) if columns else np.array([], dtype=dtype)
+
+    table = Table(joined(seasons, "<U7"), joined(players, str), joined(teams, str),
+                  joined(values, np.float64))
+    _write_npz(table_path(stat, per_mode), **table._asdict())
+    return len(table.value)
+
+
+# ---------------------------------------------------------------------------
+# Reading (serve side)
+# Tables are loaded into memory once and reloaded if compact() rewrites them.
+# ---------------------------------------------------------------------------
+
+_tables: dict[str, tuple[int, Table]] = {}
+_tables_lock = threading.Lock()
+
+
+def load_table(stat: str, per_mode: str) -> Table:
+    """The compacted table for (stat, per_mode). Raises FileNotFoundError if never ingested."""
+    path = table_path(stat, per_mode)
+    mtime = os.stat(path).st_mtime_ns
+    with _tables_lock:
+        hit = _tables.get(path)
+    if hit is not None and hit[0] == mtime:
+        return hit[1]
+
+    with np.load(path) as data:
+        table = Table(*(data[column] for column in Table._fields))
+    with _tables_lock:
+        _tables[path] = (mtime, table)
+    return table
+
+
+def clear_loaded() -> None:
+    with _tables_lock:
+        _tables.clear()
+
+
+def top_k(
+    stat: str, per_mode: str, k: int, seasons: Optional[Iterable[str]] = None
+) -> list[tuple[str, str, str, float]]:
+    """
+    The k best (player, team, season, value) rows, one per player, value
+    descending with ties to the earlier row — the same order the live TopK
+    gives, over every stored season (or just `seasons`).
+
+    Vectorised: argpartition narrows to the best few candidate rows, a stable
+    sort orders them and np.unique keeps each player's first (best) row. If
+    repeat players leave fewer than k distinct, the candidate pool doubles.
+    """
+    table = load_table(stat, per_mode)
+    rows = np.arange(len(table.value))
+    if seasons is not None:
+        rows = rows[np.isin(table.season, list(seasons))]
+    if k <= 0 or not len(rows):
+        return []
+
+    values = table.value[rows]
+    pool = min(len(rows), 4 * k)
+    while True:
+        if pool < len(rows):
+            candidates = np.argpartition(-values, pool - 1)[:pool]
+        else:
+            candidates = np.arange(len(rows))
+        # Row position breaks ties, so the order doesn't depend on argpartition
+        ordered = candidates[np.lexsort((candidates, -values[candidates]))]
+        _, first = np.unique(table.player[rows[ordered]], return_index=True)
+        best = ordered[np.sort(first)]
+        # A pool that cut through a tie may have dropped an earlier row with
+        # the cut-off value, so only trust it if the k-th pick beats the cut.
+        cut = values[candidates].min()
+        enough = len(best) >= k and values[best[k - 1]] > cut
+        if enough or pool >= len(rows):
+            break
+        pool = min(len(rows), pool * 2)
+
+    picked = rows[best[:k]]
+    return [
+        (str(table.player[i]), str(table.team[i]), str(table.season[i]), float(table.value[i]))
+        for i in picked
+    ]
@@ -0,0 +1,249 @@
+"""
+responses.py — Pre-encoded, pre-compressed JSON response bodies.
+
+A cache hit should cost a lookup and a socket write, not a validation pass
+plus json.dumps on every request. encode() produces the final body bytes once
+(with a content hash and the time it was built), the result is cached, and
+to_response() wraps the stored bytes in a raw Response that FastAPI sends
+as-is — with a strong ETag from the hash, a 304 when the client already has
+it, and freshness headers tied to the cache entry's TTL. sse() frames the same
+encoding as a Server-Sent Event for streamed responses.
+
+JSON is written by orjson (compact UTF-8, the same bytes stdlib json would
+give). Bodies of COMPRESS_MIN bytes or more are sent gzip- or brotli-encoded
+(brotli needs the optional `brotli` package) when Accept-Encoding allows. Each compressed variant is stored in
+`cache` under its body's hash, so a cached ranking is compressed once per
+encoding, not once per request, and every worker sharing the cache reuses it.
+Async routes use to_response_async(), which compresses in a worker thread and
+waits on the cache without blocking the event loop.
+
+Config (environment):
+  API_COMPRESS_MIN_BYTES   smallest body worth compressing   (default 1024)
+"""
+
+import asyncio
+import gzip
+import hashlib
+import os
+import re
+import time
+from typing import Any, Iterable, NamedTuple, Optional
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+import orjson
+
+import cache
+
+# Shared with static_assets, so API bodies and assets offer the same encodings
+try:
+    import brotli
+except ImportError:  # optional — gzip alone is fine
+    brotli = None
+
+MEDIA_TYPE = "application/json"
+SSE_MEDIA_TYPE = "text/event-stream"
+COMPRESS_MIN = int(os.environ.get("API_COMPRESS_MIN_BYTES", "1024"))
+
+# Encodings in server preference order, for equal client q-values
+_PREFERENCE = ("br", "gzip", "identity")
+
+
+class EncodedBody(NamedTuple):
+    body: bytes
+    digest: str              # sha256 of body, hex
+    created_at: float = 0.0  # when encoded; 0 for bodies stored before it existed
+
+    @property
+    def etag(self) -> str:
+        return self.etag_for("identity")
+
+    def etag_for(self, encoding: str) -> str:
+        return strong_etag(self.digest, encoding)
+
+
+cache.register(EncodedBody)
+
+
+def strong_etag(digest: str, encoding: str) -> str:
+    """The ETag for a body with sha256 `digest`, sent in `encoding`."""
+    # Strong validators must differ per representation
+    suffix = "" if encoding == "identity" else f"-{encoding}"
+    return f'"{digest[:32]}{suffix}"'
+
+
+def _dumps(payload: Any) -> bytes:
+    return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+
+
+def encode(payload: Any) -> EncodedBody:
+    """Serialise payload as compact UTF-8 JSON, and hash it."""
+    body = _dumps(payload)
+    return EncodedBody(body, hashlib.sha256(body).hexdigest(), time.time())
+
+
+def sse(event: str, payload: Any) -> bytes:
+    """One Server-Sent Event carrying payload as single-line JSON."""
+    return b"event: " + event.encode("utf-8") + b"\ndata: " + _dumps(payload) + b"\n\n"
+
+
+class FastJSONResponse(JSONResponse):
+    """The app's default response class: routes returning plain dicts use _dumps too."""
+
+    def render(self, content: Any) -> bytes:
+        return _dumps(content)
+
+
+# ---------------------------------------------------------------------------
+# Content negotiation and compression
+# ---------------------------------------------------------------------------
+
+def negotiate(accept_encoding: Optional[str], available: Iterable[str]) -> str:
+    """
+    Pick the best encoding in `available` for an Accept-Encoding header
+    (q-values honoured, ties broken by br > gzip > identity). identity is
+    the fallback unless the client explicitly refuses it.
+    """
+    if not accept_encoding:
+        return "identity"
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        match = re.search(r"q\s*=\s*([0-9.]+)", params)
+        if match:
+            try:
+                q = float(match.group(1))
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+
+    def weight(encoding: str) -> float:
+        if encoding in weights:
+            return weights[encoding]
+        if "*" in weights:
+            return weights["*"]
+        return 1.0 if encoding == "identity" else 0.0
+
+    ranked = [e for e in _PREFERENCE if e in available and weight(e) > 0]
+    if not ranked:
+        return "identity"
+    return max(ranked, key=lambda e: (weight(e), -_PREFERENCE.index(e)))
+
+
+def _encodings(encoded: EncodedBody) -> tuple[str, ...]:
+    if len(encoded.body) < COMPRESS_MIN:
+        return ("identity",)
+    return ("br", "gzip", "identity") if brotli is not None else ("gzip", "identity")
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    # Mid-range levels: bodies are compressed on a cache miss, while a request waits
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def variant(encoded: EncodedBody, encoding: str, reuse: bool = True) -> bytes:
+    """
+    The body in `encoding`. With reuse, compressed variants are cached by
+    content hash (key "encoded:<encoding>:<digest>"), so each is built once.
+    """
+    if encoding == "identity":
+        return encoded.body
+    if not reuse:
+        return _compress(encoded.body, encoding)
+    return cache.get_or_set(
+        f"encoded:{encoding}:{encoded.digest}", lambda: _compress(encoded.body, encoding)
+    )
+
+
+async def variant_async(encoded: EncodedBody, encoding: str, reuse: bool = True) -> bytes:
+    """variant() for the event loop: compression runs in a worker thread."""
+    if encoding == "identity":
+        return encoded.body
+    if not reuse:
+        return await asyncio.to_thread(_compress, encoded.body, encoding)
+    return await cache.get_or_set_async(
+        f"encoded:{encoding}:{encoded.digest}",
+        lambda: asyncio.to_thread(_compress, encoded.body, encoding),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Conditional GET and freshness
+# ---------------------------------------------------------------------------
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check: "*", or any listed tag (weak or strong) equal to etag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def freshness(encoded: EncodedBody, ttl: float) -> dict[str, str]:
+    """
+    Cache-Control/Age for a body cached for `ttl` seconds from created_at.
+
+    max-age is the entry's full lifetime and Age how much of it has gone, so a
+    downstream cache keeps it for exactly the remaining max-age - Age seconds —
+    the same moment our own entry lapses or is refreshed.
+    """
+    if not encoded.created_at:
+        return {"Cache-Control": "no-cache"}
+    age = min(int(ttl), max(0, int(time.time() - encoded.created_at)))
+    return {"Cache-Control": f"public, max-age={int(ttl)}", "Age": str(age)}
+
+
+def to_response(
+    encoded: EncodedBody,
+    if_none_match: Optional[str] = None,
+    ttl: Optional[float] = None,
+    accept_encoding: Optional[str] = None,
+    reuse: bool = True,
+) -> Response:
+    """
+    Send stored bytes straight out — no per-request serialisation — or a 304.
+    Pass reuse=False for one-off bodies, so their variants don't fill the cache.
+    """
+    encoding, headers = _representation(encoded, ttl, accept_encoding)
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return _full_response(variant(encoded, encoding, reuse), encoding, headers)
+
+
+async def to_response_async(
+    encoded: EncodedBody,
+    if_none_match: Optional[str] = None,
+    ttl: Optional[float] = None,
+    accept_encoding: Optional[str] = None,
+    reuse: bool = True,
+) -> Response:
+    """to_response() for async routes; see variant_async()."""
+    encoding, headers = _representation(encoded, ttl, accept_encoding)
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return _full_response(await variant_async(encoded, encoding, reuse), encoding, headers)
+
+
+def _representation(
+    encoded: EncodedBody, ttl: Optional[float], accept_encoding: Optional[str]
+) -> tuple[str, dict[str, str]]:
+    """The negotiated encoding and the headers shared by its 200 and 304."""
+    available = _encodings(encoded)
+    encoding = negotiate(accept_encoding, available)
+    headers = {"ETag": encoded.etag_for(encoding)}
+    if len(available) > 1:
+        headers["Vary"] = "Accept-Encoding"
+    if ttl is not None:
+        headers.update(freshness(encoded, ttl))
+    return encoding, headers
+
+
+def _full_response(body: bytes, encoding: str, headers: dict[str, str]) -> Response:
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=MEDIA_TYPE, headers=headers)
@@ -0,0 +1,95 @@
+"""
+scheduler.py — Background prewarm and refresh of feat rankings.
+
+Started from the FastAPI lifespan in app.py so that request-path latency is
+always a cache hit:
+  1. at startup every feat is warmed — in one batch through warm_many(feat_ids)
+     when given (so live feats can share upstream calls), otherwise one
+     warm(feat_id) per feat, concurrently and bounded;
+  2. live feats are then re-fetched shortly before their cache entry lapses,
+     with random jitter so workers and feats don't refresh in lockstep.
+
+The scheduler knows nothing about rankings — it calls back into app.py with
+warm(feat_id) / warm_many(feat_ids) / refresh(feat_id). Those are blocking,
+so they run in threads.
+
+Config (environment):
+  SCHEDULER_ENABLED      "0" disables prewarm and refresh entirely
+  SCHEDULER_CONCURRENCY  max feats fetched at once                (default 2)
+  SCHEDULER_LEAD         seconds before expiry to refresh         (default 60)
+  SCHEDULER_JITTER       max extra random seconds taken off that  (default 30)
+"""
+
+import asyncio
+import os
+import random
+from typing import Callable, Iterable, Optional
+
+ENABLED = os.environ.get("SCHEDULER_ENABLED", "1") != "0"
+CONCURRENCY = int(os.environ.get("SCHEDULER_CONCURRENCY", "2"))
+LEAD = float(os.environ.get("SCHEDULER_LEAD", "60"))
+JITTER = float(os.environ.get("SCHEDULER_JITTER", "30"))
+
+
+class RefreshScheduler:
+    def __init__(
+        self,
+        warm: Callable[[str], None],
+        refresh: Callable[[str], None],
+        feat_ids: Iterable[str],
+        live_feat_ids: Iterable[str],
+        ttl: float,
+        concurrency: int = CONCURRENCY,
+        lead: float = LEAD,
+        jitter: float = JITTER,
+        warm_many: Optional[Callable[[list[str]], None]] = None,
+    ):
+        self.warm = warm
+        self.warm_many = warm_many
+        self.refresh = refresh
+        self.feat_ids = list(feat_ids)
+        self.live_feat_ids = list(live_feat_ids)
+        self.ttl = ttl
+        self.lead = lead
+        self.jitter = jitter
+        self._slots = asyncio.Semaphore(max(1, concurrency))
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Kick off prewarm and the refresh loops in the background; returns at once."""
+        self._tasks.append(asyncio.create_task(self._prewarm(), name="prewarm"))
+        for feat_id in self.live_feat_ids:
+            self._tasks.append(
+                asyncio.create_task(self._refresh_loop(feat_id), name=f"refresh:{feat_id}")
+            )
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def next_delay(self) -> float:
+        """Seconds from a completed fetch until the next refresh should start."""
+        return max(0.0, self.ttl - self.lead - random.uniform(0, self.jitter))
+
+    # -- internals ----------------------------------------------------------
+
+    async def _run(self, fn: Callable, feat_id: str | list[str]) -> None:
+        async with self._slots:
+            try:
+                await asyncio.to_thread(fn, feat_id)
+            except Exception as exc:
+                print(f"[scheduler] {fn.__name__} '{feat_id}' failed: {exc}")
+
+    async def _prewarm(self) -> None:
+        if self.warm_many is not None:
+            await self._run(self.warm_many, self.feat_ids)
+        else:
+            await asyncio.gather(*(self._run(self.warm, f) for f in self.feat_ids))
+        print(f"[scheduler] Prewarmed {len(self.feat_ids)} feats")
+
+    async def _refresh_loop(self, feat_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.next_delay())
+            await self._run(self.refresh, feat_id)
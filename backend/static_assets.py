@@ -0,0 +1,138 @@
+"""
+static_assets.py — In-memory, precompressed, fingerprinted frontend assets.
+
+At startup every file in frontend/ is read once. CSS/JS get a content-hash
+fingerprint and a long-lived URL (/assets/style.3f2a9c1b04de.css), and the
+HTML pages are rewritten to reference those URLs. Each asset keeps its
+identity bytes plus gzip (and brotli, when the optional `brotli` package is
+installed) variants, computed once. Serving is then a dict lookup:
+Accept-Encoding picks the variant, If-None-Match answers 304.
+
+Cache policy:
+  fingerprinted URLs        public, max-age=1 year, immutable
+  HTML and legacy /app.js   no-cache (revalidate by ETag; cheap 304s)
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from typing import NamedTuple, Optional
+
+from fastapi import Response
+
+import responses
+from responses import brotli
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# Fingerprint these; everything else is addressed by its plain name
+FINGERPRINTED = (".css", ".js")
+
+
+class Asset(NamedTuple):
+    media_type: str
+    digest: str                     # sha256 hex of the identity body
+    variants: dict[str, bytes]      # encoding -> body; always has "identity"
+    cache_control: str
+
+    def etag(self, encoding: str) -> str:
+        return responses.strong_etag(self.digest, encoding)
+
+
+def _compress(body: bytes) -> dict[str, bytes]:
+    """identity plus every encoding that actually makes the body smaller."""
+    variants = {"identity": body}
+    candidates = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        candidates["br"] = brotli.compress(body, quality=11)
+    for encoding, compressed in candidates.items():
+        if len(compressed) < len(body):
+            variants[encoding] = compressed
+    return variants
+
+
+# Same Accept-Encoding rules as API responses
+negotiate = responses.negotiate
+
+
+class AssetStore:
+    """All of one directory's assets, loaded and compressed up front."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._assets: dict[str, Asset] = {}   # URL path -> asset
+        self.urls: dict[str, str] = {}        # plain name -> fingerprinted URL
+        self.load()
+
+    def load(self) -> None:
+        assets: dict[str, Asset] = {}
+        urls: dict[str, str] = {}
+        if not os.path.isdir(self.root):
+            print(f"[static] No frontend dir at {self.root}")
+            self._assets, self.urls = assets, urls
+            return
+
+        names = sorted(
+            n for n in os.listdir(self.root) if os.path.isfile(os.path.join(self.root, n))
+        )
+        # Fingerprinted assets first, so HTML can be rewritten to point at them
+        for name in [n for n in names if n.endswith(FINGERPRINTED)]:
+            body = self._read(name)
+            digest = hashlib.sha256(body).hexdigest()
+            stem, ext = os.path.splitext(name)
+            url = f"/assets/{stem}.{digest[:12]}{ext}"
+            urls[name] = url
+            assets[url] = self._asset(name, body, IMMUTABLE)
+            # The plain name keeps working, but must be revalidated
+            assets[f"/{name}"] = assets[url]._replace(cache_control=REVALIDATE)
+
+        for name in [n for n in names if not n.endswith(FINGERPRINTED)]:
+            body = self._read(name)
+            if name.endswith(".html"):
+                body = self._rewrite(body.decode("utf-8"), urls).encode("utf-8")
+            assets[f"/{name}"] = self._asset(name, body, REVALIDATE)
+
+        self._assets, self.urls = assets, urls
+        print(f"[static] Loaded {len(names)} assets "
+              f"({'br+gzip' if brotli is not None else 'gzip'} precompressed)")
+
+    def _read(self, name: str) -> bytes:
+        with open(os.path.join(self.root, name), "rb") as f:
+            return f.read()
+
+    @staticmethod
+    def _asset(name: str, body: bytes, cache_control: str) -> Asset:
+        media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        if media_type.startswith("text/") or media_type.endswith("javascript"):
+            media_type += "; charset=utf-8"
+        return Asset(media_type, hashlib.sha256(body).hexdigest(), _compress(body), cache_control)
+
+    @staticmethod
+    def _rewrite(html: str, urls: dict[str, str]) -> str:
+        """Point href="/style.css" / src="/app.js" at their fingerprinted URLs."""
+        for name, url in urls.items():
+            html = re.sub(rf'(href|src)="/{re.escape(name)}"', rf'\1="{url}"', html)
+        return html
+
+    def get(self, path: str) -> Optional[Asset]:
+        return self._assets.get(path)
+
+    def respond(self, path: str, accept_encoding: Optional[str], if_none_match: Optional[str]) -> Optional[Response]:
+        """The response for `path`, or None if there is no such asset."""
+        asset = self._assets.get(path)
+        if asset is None:
+            return None
+        encoding = negotiate(accept_encoding, asset.variants)
+        headers = {
+            "ETag": asset.etag(encoding),
+            "Cache-Control": asset.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if responses.etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=asset.variants[encoding], media_type=asset.media_type, headers=headers)
@@ -0,0 +1,113 @@
+"""
+stats_client.py — Async, connection-pooled client for stats.nba.com.
+
+nba_api opens a fresh requests session per endpoint call and blocks the
+calling thread. This module keeps one shared keep-alive httpx.AsyncClient
+per process and fetches league-leader result sets directly, so the async
+API path can await upstream I/O without tying up a threadpool worker.
+
+Config (environment):
+  NBA_STATS_BASE_URL         upstream root      (default https://stats.nba.com/stats)
+  NBA_STATS_TIMEOUT          per-call seconds   (default 10)
+  NBA_STATS_MAX_CONNECTIONS  pool size          (default 10)
+"""
+
+import os
+from typing import Any, Optional
+
+import httpx
+
+BASE_URL = os.environ.get("NBA_STATS_BASE_URL", "https://stats.nba.com/stats")
+TIMEOUT = float(os.environ.get("NBA_STATS_TIMEOUT", "10"))
+MAX_CONNECTIONS = int(os.environ.get("NBA_STATS_MAX_CONNECTIONS", "10"))
+
+# stats.nba.com rejects requests that don't look like they come from nba.com
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+    ),
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+    "Origin": "https://www.nba.com",
+    "Referer": "https://www.nba.com/",
+}
+
+_client: Optional[httpx.AsyncClient] = None
+_transport: Optional[httpx.AsyncBaseTransport] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            base_url=BASE_URL,
+            headers=HEADERS,
+            timeout=httpx.Timeout(TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_CONNECTIONS,
+            ),
+            transport=_transport,
+        )
+    return _client
+
+
+async def aclose() -> None:
+    """Close the shared client (app shutdown). A later call re-creates it."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def use_transport(transport: Optional[httpx.AsyncBaseTransport]) -> None:
+    """
+    Route all calls through a custom transport (tests, local fakes); None
+    restores the real network. The next get_client() builds a fresh client.
+    """
+    global _client, _transport
+    _transport = transport
+    _client = None
+
+
+async def league_leaders(
+    season: str,
+    stat_category: str,
+    per_mode: str,
+    season_type: str = "Regular Season",
+    timeout: Optional[float] = None,
+) -> dict[str, Any]:
+    """GET /leagueleaders for one season and return the raw JSON payload."""
+    params = {
+        "ActiveFlag":   "",
+        "LeagueID":     "00",
+        "PerMode":      per_mode,
+        "Scope":        "S",
+        "Season":       season,
+        "SeasonType":   season_type,
+        "StatCategory": stat_category,
+    }
+    resp = await get_client().get(
+        "/leagueleaders",
+        params=params,
+        timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+def result_set(payload: dict[str, Any], index: int = 0) -> tuple[list[str], list[list]]:
+    """
+    Return (headers, rowSet) from a stats payload. leagueleaders answers with
+    a single "resultSet" object; most other endpoints use a "resultSets" list.
+    """
+    sets = payload.get("resultSets", payload.get("resultSet"))
+    if isinstance(sets, dict):
+        sets = [sets]
+    if not sets:
+        raise ValueError("Payload has no result sets")
+    return sets[index]["headers"], sets[index]["rowSet"]
@@ -0,0 +1,83 @@
+"""
+bench_leaders_parse.py — LeagueLeaders parse cost and import-time comparison.
+
+Compares, per season, the old path (DataFrame + head(n).iterrows()) with
+nba_client._payload_rows() reading the raw headers/rowSet arrays, and the
+cold import cost of nba_api's endpoint classes (which pull in pandas) with
+the bare HTTP layer the live fetchers now use.
+
+Run from the project root:
+    python benchmarks/bench_leaders_parse.py
+"""
+
+import os
+import random
+import subprocess
+import sys
+import timeit
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(_ROOT, "backend"))
+
+import nba_client  # noqa: E402
+
+HEADERS = [
+    "PLAYER_ID", "RANK", "PLAYER", "TEAM", "GP", "MIN", "FGM", "FGA", "FG_PCT",
+    "FG3M", "FG3A", "FG3_PCT", "FTM", "FTA", "FT_PCT", "OREB", "DREB", "REB",
+    "AST", "STL", "BLK", "TOV", "PF", "PTS", "EFF", "AST_TOV", "STL_TOV",
+]
+ROWS = 280  # roughly one season's qualified players
+
+
+def _payload() -> dict:
+    rng = random.Random(1992)
+    row_set = [
+        [i, i + 1, f"Player {i}", "TST"] + [round(rng.uniform(0, 40), 1) for _ in HEADERS[4:]]
+        for i in range(ROWS)
+    ]
+    return {"resultSet": {"name": "LeagueLeaders", "headers": HEADERS, "rowSet": row_set}}
+
+
+def _dataframe_parse(payload: dict, head: int) -> list[dict]:
+    import pandas as pd
+
+    result = payload["resultSet"]
+    df = pd.DataFrame(result["rowSet"], columns=result["headers"])
+    return [
+        {"player": str(row.get("PLAYER")), "team": str(row.get("TEAM")),
+         "value": round(float(row.get("REB", 0)), 1)}
+        for _, row in df.head(head).iterrows()
+    ]
+
+
+def _raw_parse(payload: dict, head: int) -> list[dict]:
+    return nba_client._payload_rows(payload, "1991-92", "REB", head, lambda v: round(float(v), 1))
+
+
+def _import_seconds(statement: str, repeat: int = 5) -> float:
+    code = f"import time; t = time.perf_counter(); {statement}; print(time.perf_counter() - t)"
+    runs = [
+        float(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True).stdout)
+        for _ in range(repeat)
+    ]
+    return min(runs)
+
+
+def main() -> None:
+    payload = _payload()
+    print(f"Per-season parse, {ROWS} rows x {len(HEADERS)} columns (best of 5)")
+    for head in (5, 25):
+        for label, fn in (("DataFrame+iterrows", _dataframe_parse), ("raw rowSet", _raw_parse)):
+            n = 200
+            best = min(timeit.repeat(lambda: fn(payload, head), number=n, repeat=5)) / n
+            print(f"  head={head:<3} {label:<20} {best * 1e6:9.1f} µs")
+
+    print("\nCold import (best of 5, fresh interpreter)")
+    endpoints = _import_seconds("from nba_api.stats.endpoints import leagueleaders")
+    http_only = _import_seconds("from nba_api.stats.library.http import NBAStatsHTTP")
+    print(f"  nba_api.stats.endpoints.leagueleaders  {endpoints * 1e3:8.1f} ms  (pulls in pandas)")
+    print(f"  nba_api.stats.library.http             {http_only * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
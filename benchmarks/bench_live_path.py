@@ -0,0 +1,80 @@
+"""
+bench_live_path.py — Live-path latency and fallback tails against fake_stats.
+
+Runs cold fetch_ranking calls (empty leader store, closed breaker) for a live
+feat under several upstream fault profiles and reports the latency
+distribution and how often the answer was live vs mock. Nothing touches the
+network; the rate limiter is lifted so the profile alone sets the pace.
+
+Run from the project root:
+    python benchmarks/bench_live_path.py [--runs 20] [--deadline 2]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(_ROOT, "backend"))
+
+import fake_stats  # noqa: E402
+import feats as feats_catalog  # noqa: E402
+import nba_client  # noqa: E402
+import stats_client  # noqa: E402
+
+PROFILES = {
+    "healthy":   dict(latency=(0.02, 0.08)),
+    "slow":      dict(latency=(0.2, 0.6)),
+    "flaky":     dict(latency=(0.02, 0.08), error_rate=0.3),
+    "throttled": dict(latency=(0.02, 0.08), throttle_rate=0.3),
+    "hanging":   dict(latency=(0.02, 0.08), hang_rate=0.2),
+    "down":      dict(error_rate=1.0),
+}
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run_profile(name: str, runs: int, feat: dict) -> None:
+    fake = fake_stats.FakeStats(seed=1991, **PROFILES[name])
+    latencies, live = [], 0
+    with fake_stats.install(fake):
+        for _ in range(runs):
+            nba_client.clear_leader_store()
+            nba_client._breaker.reset()
+            start = time.perf_counter()
+            _, source = nba_client.fetch_ranking(feat, top_n=25)
+            latencies.append(time.perf_counter() - start)
+            live += source == "live"
+    print(f"{name:<10} p50 {statistics.median(latencies) * 1000:7.0f} ms   "
+          f"p95 {_percentile(latencies, 95) * 1000:7.0f} ms   "
+          f"max {max(latencies) * 1000:7.0f} ms   live {live}/{runs}   "
+          f"upstream calls {fake.stats()['calls']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--deadline", type=float, default=2.0)
+    parser.add_argument("--timeout", type=float, default=1.0, help="per-call upstream timeout")
+    parser.add_argument("--feat", default="season_rpg")
+    args = parser.parse_args()
+
+    nba_client.RANKING_DEADLINE = args.deadline
+    stats_client.TIMEOUT = args.timeout
+    nba_client._limiter = nba_client.RateLimiter(rate=1e6, burst=1000)
+    feat = feats_catalog.get_feat(args.feat)
+
+    print(f"{args.feat}: {len(nba_client.LIVE_QUERIES[args.feat]['seasons'])} seasons, "
+          f"fan-out {nba_client.SEASON_FANOUT}, deadline {args.deadline}s, "
+          f"timeout {args.timeout}s, {args.runs} cold runs per profile\n")
+    for name in PROFILES:
+        run_profile(name, args.runs, feat)
+
+
+if __name__ == "__main__":
+    main()
@@ -394,17 +394,45 @@ async function initRankingPage() {
   if (!featId) { showError(errorEl, list, "No feat specified in URL."); return; }
   overlay.classList.add("visible");
 
-  try {
-    const data = await apiFetch(`/api/feats/${featId}/ranking`);
+  let shown = false;
+  const render = (data) => {
     overlay.classList.remove("visible");
     renderRankingHeader(data, header, featId);
-    renderRankingList(data, list);
-    renderDidYouKnow(featId);
-    initH2HDrawer();
-  } catch (err) {
+    // Animate the first paint only; later updates swap rows in place
+    renderRankingList(data, list, !shown);
+    if (!shown) {
+      renderDidYouKnow(featId);
+      initH2HDrawer();
+      shown = true;
+    }
+  };
+  const fail = () => {
     overlay.classList.remove("visible");
-    errorEl.style.display = "block";
-  }
+    if (!shown) errorEl.style.display = "block";
+  };
+  const fetchOnce = () => apiFetch(`/api/feats/${featId}/ranking`).then(render).catch(fail);
+
+  if (!window.EventSource) { fetchOnce(); return; }
+
+  // A cached ranking comes over plain HTTP (ETag, compression, browser cache);
+  // 204 means it isn't cached yet, so stream the crawl instead
+  try {
+    const res = await fetch(`${API_BASE}/api/feats/${featId}/ranking?if_cached=true`);
+    if (res.status === 200) { render(await res.json()); return; }
+  } catch (err) { /* fall through to the stream */ }
+
+  // The mock ranking arrives at once; live seasons refine it as they land
+  const stream = new EventSource(`${API_BASE}/api/feats/${featId}/ranking/stream`);
+  stream.addEventListener("update", (e) => render(JSON.parse(e.data)));
+  stream.addEventListener("final", (e) => {
+    stream.close();
+    render(JSON.parse(e.data));
+  });
+  stream.onerror = () => {
+    // Closed before "final": show what we have, or fall back to one plain request
+    stream.close();
+    if (!shown) fetchOnce();
+  };
 }
 
 const ICON_MAP = {
@@ -414,8 +442,11 @@ const ICON_MAP = {
 
 function renderRankingHeader(data, container, featId) {
   const icon        = ICON_MAP[featId] || "🏆";
-  const sourceClass = data.source === "live" ? "live" : "mock";
-  const sourceLabel = data.source === "live" ? "Live data" : "Demo data";
+  const realData    = ["live", "store", "partial"].includes(data.source);
+  const sourceClass = realData ? "live" : "mock";
+  const sourceLabel = data.source === "live"    ? "Live data"
+                    : data.source === "partial" ? `Live ${data.seasons_done}/${data.seasons_total} seasons`
+                    : realData ? "NBA data" : "Demo data";
   container.innerHTML = `
     <span class="feat-icon-lg">${icon}</span>
     <h1>${data.title}</h1>
@@ -447,7 +478,7 @@ function fallbackCopy(text, cb) {
   document.body.removeChild(i); cb();
 }
 
-function renderRankingList(data, container) {
+function renderRankingList(data, container, animate = true) {
   container.innerHTML = "";
   if (!data.ranking?.length) {
     container.innerHTML = `<p style="color:var(--text-muted);text-align:center;padding:2rem;">No ranking data.</p>`;
@@ -491,6 +522,11 @@ function renderRankingList(data, container) {
 
     container.appendChild(item);
 
+    if (!animate) {
+      item.classList.add("visible");
+      animateCounter(item.querySelector(".value-number"), player.value, 1);  // same formatting, no count-up
+      return;
+    }
     setTimeout(() => {
       item.classList.add("visible");
       setTimeout(() => {
@@ -4,12 +4,18 @@ test_api.py — Integration tests for FastAPI endpoints.
 Uses FastAPI's TestClient (wraps httpx) — no real server needed.
 """
 
+import asyncio
+import json
+import threading
+import time
+
 import pytest
 from fastapi.testclient import TestClient
 
 # app.py imports cache, feats, nba_client — all resolved via tests/__init__.py
 from app import app
 import cache
+import nba_client
 
 
 @pytest.fixture(autouse=True)
@@ -42,6 +48,87 @@ class TestHealth:
         assert "message" in data
 
 
+# ---------------------------------------------------------------------------
+# Static frontend
+# ---------------------------------------------------------------------------
+
+class TestStaticAssets:
+    @pytest.mark.parametrize("path", ["/", "/ranking", "/timeline", "/career", "/style.css", "/app.js"])
+    def test_pages_served(self, client, path):
+        assert client.get(path).status_code == 200
+
+    def test_index_points_at_fingerprinted_assets(self, client):
+        from app import ASSETS
+        html = client.get("/").text
+        assert ASSETS.urls["style.css"] in html
+        assert ASSETS.urls["app.js"] in html
+
+    def test_fingerprinted_asset_is_immutable_and_compressed(self, client):
+        from app import ASSETS
+        res = client.get(ASSETS.urls["app.js"], headers={"Accept-Encoding": "gzip"})
+        assert res.status_code == 200
+        assert res.headers["content-encoding"] == "gzip"
+        assert "immutable" in res.headers["cache-control"]
+        assert "initRankingPage" in res.text  # httpx decodes gzip transparently
+
+    def test_conditional_get_returns_304(self, client):
+        etag = client.get("/style.css").headers["etag"]
+        res = client.get("/style.css", headers={"If-None-Match": etag})
+        assert res.status_code == 304
+
+    def test_unknown_asset_404(self, client):
+        assert client.get("/assets/nope.123.js").status_code == 404
+
+
+# ---------------------------------------------------------------------------
+# Conditional GET and freshness on API responses
+# ---------------------------------------------------------------------------
+
+class TestConditionalGet:
+    @pytest.mark.parametrize("path", ["/api/feats", "/api/feats/season_rpg", "/api/feats/rebounding_titles/ranking"])
+    def test_etag_then_304(self, client, path):
+        first = client.get(path)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        res = client.get(path, headers={"If-None-Match": etag})
+        assert res.status_code == 304
+        assert res.content == b""
+        assert res.headers["etag"] == etag
+
+    def test_top_n_variants_have_distinct_etags(self, client):
+        a = client.get("/api/feats/rebounding_titles/ranking?top_n=3").headers["etag"]
+        b = client.get("/api/feats/rebounding_titles/ranking?top_n=5").headers["etag"]
+        assert a != b
+        assert client.get("/api/feats/rebounding_titles/ranking?top_n=5",
+                          headers={"If-None-Match": a}).status_code == 200
+
+    def test_large_bodies_compressed(self, client):
+        res = client.get("/api/feats", headers={"Accept-Encoding": "gzip"})
+        assert res.headers["content-encoding"] == "gzip"
+        assert res.headers["etag"].endswith('-gzip"')
+        assert res.json()["total"] >= 5  # httpx decodes gzip transparently
+
+    def test_batch_rankings_compressed(self, client):
+        res = client.get("/api/rankings", headers={"Accept-Encoding": "gzip"})
+        assert res.headers["content-encoding"] == "gzip"
+        assert len(res.json()["rankings"]) >= 5
+
+    def test_identity_when_not_accepted(self, client):
+        res = client.get("/api/feats", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in res.headers
+
+    def test_max_age_is_cache_ttl(self, client):
+        res = client.get("/api/feats")
+        assert res.headers["cache-control"] == f"public, max-age={cache.DEFAULT_TTL}"
+        assert res.headers["age"] == "0"
+
+    def test_age_tracks_cache_entry(self, client):
+        client.get("/api/feats")
+        encoded = cache.get("feats:all")
+        cache.set("feats:all", encoded._replace(created_at=encoded.created_at - 90))
+        assert client.get("/api/feats").headers["age"] == "90"
+
+
 # ---------------------------------------------------------------------------
 # GET /api/feats
 # ---------------------------------------------------------------------------
@@ -100,6 +187,10 @@ class TestGetFeatMeta:
         assert "source_strategy" not in data
         assert "mock_file" not in data
 
+    def test_live_query_not_exposed(self, client):
+        data = client.get("/api/feats/season_rpg").json()
+        assert "live_query" not in data
+
 
 # ---------------------------------------------------------------------------
 # GET /api/feats/{feat_id}/ranking
@@ -174,6 +265,229 @@ class TestGetRanking:
             )
 
 
+# ---------------------------------------------------------------------------
+# GET /api/cache/stats
+# ---------------------------------------------------------------------------
+
+class TestCacheStatsRoute:
+    def test_reports_hits_and_misses(self, client):
+        client.get("/api/feats/chaos_index/ranking")
+        client.get("/api/feats/chaos_index/ranking")
+        data = client.get("/api/cache/stats").json()
+        assert data["hits"] >= 1
+        assert data["misses"] >= 1
+        assert "ranking:chaos_index" in data["prefixes"]
+
+    def test_deep_stats(self, client):
+        assert "total_keys" in client.get("/api/cache/stats?deep=true").json()
+
+    def test_upstream_stats_route(self, client):
+        data = client.get("/api/upstream/stats").json()
+        assert data["breaker"]["state"] in {"closed", "open", "half_open"}
+        assert "entries" in data["leader_store"]
+
+
+# ---------------------------------------------------------------------------
+# GET /api/feats/{id}/ranking/stream
+# ---------------------------------------------------------------------------
+
+def _events(client, path):
+    events, name = [], None
+    with client.stream("GET", path) as res:
+        assert res.headers["content-type"].startswith("text/event-stream")
+        for line in res.iter_lines():
+            if line.startswith("event: "):
+                name = line[len("event: "):]
+            elif line.startswith("data: "):
+                events.append((name, json.loads(line[len("data: "):])))
+    return events
+
+
+class TestStreamRanking:
+    def test_live_feat_streams_updates_then_final(self, client, monkeypatch):
+        async def stream(feat, top_n=10):
+            ranking = [{"rank": 1, "player": "Dennis Rodman", "team": "DET", "value": 18.7, "is_rodman": True}]
+            mock = nba_client.mock_ranking(feat, top_n)
+            yield {"ranking": mock, "source": "mock", "seasons_done": 0, "seasons_total": 2, "final": False}
+            yield {"ranking": ranking, "source": "partial", "seasons_done": 1, "seasons_total": 2, "final": False}
+            yield {"ranking": ranking, "source": "live", "seasons_done": 2, "seasons_total": 2, "final": True}
+
+        monkeypatch.setattr("nba_client.stream_ranking", stream)
+        events = _events(client, "/api/feats/season_rpg/ranking/stream")
+        assert [(name, data["source"]) for name, data in events] == [
+            ("update", "mock"), ("update", "partial"), ("final", "live"),
+        ]
+        assert events[1][1]["seasons_done"] == 1
+        assert events[-1][1]["rodman_is_first"] is True
+
+    def test_final_is_cached_for_plain_route(self, client, monkeypatch):
+        final = _events(client, "/api/feats/chaos_index/ranking/stream?top_n=5")[-1][1]
+        monkeypatch.setattr("nba_client.fetch_ranking_async", lambda *a, **k: pytest.fail("refetched"))
+        assert client.get("/api/feats/chaos_index/ranking?top_n=5").json() == final
+
+    def test_cached_ranking_is_single_final_event(self, client, monkeypatch):
+        plain = client.get("/api/feats/chaos_index/ranking?top_n=3").json()
+        monkeypatch.setattr("nba_client.stream_ranking", lambda *a, **k: pytest.fail("restreamed"))
+        assert _events(client, "/api/feats/chaos_index/ranking/stream?top_n=3") == [("final", plain)]
+
+    def test_unchanged_top_n_is_not_resent(self, client, monkeypatch):
+        top = {"rank": 1, "player": "Dennis Rodman", "team": "DET", "value": 18.7, "is_rodman": True}
+        below = {"rank": 2, "player": "Moses Malone", "team": "HOU", "value": 17.6, "is_rodman": False}
+
+        async def stream(feat, top_n=10):
+            yield {"ranking": [top], "source": "partial", "seasons_done": 1, "seasons_total": 2, "final": False}
+            yield {"ranking": [top, below], "source": "partial", "seasons_done": 2, "seasons_total": 2, "final": False}
+            yield {"ranking": [top, below], "source": "live", "seasons_done": 2, "seasons_total": 2, "final": True}
+
+        monkeypatch.setattr("nba_client.stream_ranking", stream)
+        events = _events(client, "/api/feats/season_rpg/ranking/stream?top_n=1")
+        assert [(name, data["source"]) for name, data in events] == [
+            ("update", "mock"), ("update", "partial"), ("final", "live"),
+        ]
+
+    def test_unknown_feat_404(self, client):
+        assert client.get("/api/feats/unknown/ranking/stream").status_code == 404
+
+    def test_concurrent_streams_share_one_crawl_and_its_updates(self, monkeypatch):
+        import app as app_module
+        import feats as feats_catalog
+        crawls = 0
+        ranking = [{"rank": 1, "player": "Dennis Rodman", "team": "DET", "value": 18.7, "is_rodman": True}]
+
+        async def stream(feat, top_n=10):
+            nonlocal crawls
+            crawls += 1
+            yield {"ranking": nba_client.mock_ranking(feat, top_n), "source": "mock",
+                   "seasons_done": 0, "seasons_total": 2, "final": False}
+            await asyncio.sleep(0.1)
+            yield {"ranking": ranking, "source": "partial", "seasons_done": 1, "seasons_total": 2, "final": False}
+            await asyncio.sleep(0.3)
+            yield {"ranking": ranking, "source": "live", "seasons_done": 2, "seasons_total": 2, "final": True}
+
+        monkeypatch.setattr("nba_client.stream_ranking", stream)
+        feat = feats_catalog.get_feat("season_rpg")
+
+        async def collect(delay):
+            await asyncio.sleep(delay)
+            start, events = time.perf_counter(), []
+            async for chunk in app_module._ranking_events(feat, 10):
+                data = json.loads(chunk.split(b"\ndata: ")[1])
+                events.append((chunk.split(b"\n")[0].decode(), data["source"], time.perf_counter() - start))
+            return events
+
+        async def run():
+            # Four at once, then one arriving mid-crawl, after the partial step
+            return await asyncio.gather(*(collect(0) for _ in range(4)), collect(0.2))
+
+        streams = asyncio.run(run())
+        assert crawls == 1
+        for events in streams:
+            assert [(name, source) for name, source, _ in events] == [
+                ("event: update", "mock"), ("event: update", "partial"), ("event: final", "live"),
+            ]
+            assert events[0][2] < 0.05  # mock first, not after the crawl
+        # The late stream catches up on the partial ranking at once
+        assert streams[-1][1][2] < 0.05
+        assert app_module._progress == {}
+
+    def test_stream_joins_plain_route_crawl(self, client, monkeypatch):
+        async def slow_fetch(feat, top_n=10):
+            await asyncio.sleep(0.3)
+            return [], "mock"
+
+        monkeypatch.setattr("nba_client.fetch_ranking_async", slow_fetch)
+        monkeypatch.setattr("nba_client.stream_ranking", lambda *a, **k: pytest.fail("second crawl"))
+        plain = threading.Thread(target=client.get, args=("/api/feats/season_rpg/ranking",))
+        plain.start()
+        time.sleep(0.1)
+        events = _events(client, "/api/feats/season_rpg/ranking/stream")
+        plain.join()
+        # Mock straight away while it waits on the plain request's crawl
+        assert [(name, data["source"]) for name, data in events] == [("update", "mock"), ("final", "mock")]
+
+    def test_if_cached_is_204_until_cached(self, client, monkeypatch):
+        monkeypatch.setattr("nba_client.fetch_ranking_async", lambda *a, **k: pytest.fail("crawled"))
+        cold = client.get("/api/feats/chaos_index/ranking?if_cached=true")
+        assert cold.status_code == 204
+        assert cache.get("ranking:chaos_index") is None
+        _events(client, "/api/feats/chaos_index/ranking/stream")
+        warm = client.get("/api/feats/chaos_index/ranking?if_cached=true")
+        assert warm.status_code == 200
+        assert client.get("/api/feats/chaos_index/ranking?if_cached=true",
+                          headers={"If-None-Match": warm.headers["etag"]}).status_code == 304
+
+
+# ---------------------------------------------------------------------------
+# GET /api/rankings
+# ---------------------------------------------------------------------------
+
+class TestGetRankings:
+    def test_all_feats_in_catalog_order(self, client):
+        import feats as feats_catalog
+        data = client.get("/api/rankings?feats=all").json()
+        assert [r["feat_id"] for r in data["rankings"]] == list(feats_catalog.FEATS)
+
+    def test_listed_feats_in_request_order(self, client):
+        data = client.get("/api/rankings?feats=chaos_index,rebounding_titles,chaos_index").json()
+        assert [r["feat_id"] for r in data["rankings"]] == ["chaos_index", "rebounding_titles"]
+
+    def test_matches_single_ranking_route(self, client):
+        single = client.get("/api/feats/chaos_index/ranking?top_n=3").json()
+        batched = client.get("/api/rankings?feats=chaos_index&top_n=3").json()["rankings"][0]
+        assert {k: v for k, v in batched.items() if k not in ("cache", "elapsed_ms")} == single
+
+    def test_reports_source_cache_and_timing(self, client):
+        first = client.get("/api/rankings?feats=chaos_index").json()
+        second = client.get("/api/rankings?feats=chaos_index").json()
+        assert first["rankings"][0]["cache"] == "miss"
+        assert second["rankings"][0]["cache"] == "hit"
+        assert second["rankings"][0]["source"] in ("live", "store", "mock")
+        assert second["rankings"][0]["elapsed_ms"] >= 0
+        assert second["elapsed_ms"] >= 0
+
+    def test_shares_cache_with_single_route(self, client, monkeypatch):
+        client.get("/api/feats/chaos_index/ranking")
+        monkeypatch.setattr("nba_client.fetch_ranking_async", lambda *a, **k: pytest.fail("refetched"))
+        data = client.get("/api/rankings?feats=chaos_index").json()
+        assert data["rankings"][0]["cache"] == "hit"
+
+    def test_fetches_concurrently(self, client, monkeypatch):
+        async def slow_fetch(feat, top_n=10):
+            await asyncio.sleep(0.3)
+            return [], "mock"
+
+        monkeypatch.setattr("nba_client.fetch_ranking_async", slow_fetch)
+        start = time.perf_counter()
+        res = client.get("/api/rankings?feats=all")
+        assert res.status_code == 200
+        assert time.perf_counter() - start < 1.0  # five feats, not 5 x 0.3s
+
+    def test_joining_inflight_crawl_is_coalesced_not_hit(self, client, monkeypatch):
+        async def slow_fetch(feat, top_n=10):
+            await asyncio.sleep(0.3)
+            return [], "mock"
+
+        monkeypatch.setattr("nba_client.fetch_ranking_async", slow_fetch)
+        plain = threading.Thread(target=client.get, args=("/api/feats/season_rpg/ranking",))
+        plain.start()
+        time.sleep(0.1)
+        data = client.get("/api/rankings?feats=season_rpg").json()
+        plain.join()
+        assert data["rankings"][0]["cache"] == "coalesced"
+
+    def test_top_n_clamped(self, client):
+        data = client.get("/api/rankings?feats=chaos_index&top_n=999").json()
+        assert data["top_n"] == 25
+
+    def test_unknown_feat_404(self, client):
+        res = client.get("/api/rankings?feats=chaos_index,nope")
+        assert res.status_code == 404
+        assert "nope" in res.json()["detail"]
+
+    def test_empty_list_404(self, client):
+        assert client.get("/api/rankings?feats=,").status_code == 404
+
+
 # ---------------------------------------------------------------------------
 # Caching behaviour
 # ---------------------------------------------------------------------------
@@ -181,17 +495,241 @@ class TestGetRanking:
 class TestCachingBehaviour:
     def test_second_request_uses_cache(self, client, monkeypatch):
         call_count = {"n": 0}
-        original_fetch = __import__("nba_client").fetch_ranking
+        original_fetch = __import__("nba_client").fetch_ranking_async
 
-        def counting_fetch(feat, top_n=10):
+        async def counting_fetch(feat, top_n=10):
             call_count["n"] += 1
-            return original_fetch(feat, top_n)
+            return await original_fetch(feat, top_n)
 
-        monkeypatch.setattr("nba_client.fetch_ranking", counting_fetch)
+        monkeypatch.setattr("nba_client.fetch_ranking_async", counting_fetch)
 
         client.get("/api/feats/chaos_index/ranking")
         client.get("/api/feats/chaos_index/ranking")
 
         assert call_count["n"] == 1, (
-            "fetch_ranking should only be called once; second request should hit cache"
+            "fetch_ranking_async should only be called once; second request should hit cache"
         )
+
+    def test_concurrent_misses_fetch_once(self, client, monkeypatch):
+        call_count = {"n": 0}
+        original_fetch = __import__("nba_client").fetch_ranking_async
+
+        async def slow_fetch(feat, top_n=10):
+            call_count["n"] += 1
+            await asyncio.sleep(0.2)
+            return await original_fetch(feat, top_n)
+
+        monkeypatch.setattr("nba_client.fetch_ranking_async", slow_fetch)
+
+        statuses = []
+        threads = [
+            threading.Thread(
+                target=lambda: statuses.append(
+                    client.get("/api/feats/chaos_index/ranking").status_code
+                )
+            )
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+
+        assert statuses == [200] * 5
+        assert call_count["n"] == 1
+
+    def test_every_top_n_shares_one_fetch(self, client, monkeypatch):
+        depths = []
+        original_fetch = __import__("nba_client").fetch_ranking_async
+
+        async def recording_fetch(feat, top_n=10):
+            depths.append(top_n)
+            return await original_fetch(feat, top_n)
+
+        monkeypatch.setattr("nba_client.fetch_ranking_async", recording_fetch)
+
+        for top_n in (5, 10, 25, 3):
+            client.get(f"/api/feats/chaos_index/ranking?top_n={top_n}")
+
+        assert depths == [25]
+
+    def test_smaller_top_n_is_prefix_of_larger(self, client):
+        full  = client.get("/api/feats/chaos_index/ranking?top_n=25").json()["ranking"]
+        short = client.get("/api/feats/chaos_index/ranking?top_n=3").json()["ranking"]
+        assert short == full[:3]
+
+    def test_flags_derived_from_slice(self, client, monkeypatch):
+        async def rodman_last(feat, top_n=10):
+            ranking = [
+                {"rank": 1, "player": "A", "team": None, "value": 3, "is_rodman": False},
+                {"rank": 2, "player": "Dennis Rodman", "team": None, "value": 2, "is_rodman": True},
+            ]
+            return ranking, "mock"
+
+        monkeypatch.setattr("nba_client.fetch_ranking_async", rodman_last)
+
+        top1 = client.get("/api/feats/chaos_index/ranking?top_n=1").json()
+        top2 = client.get("/api/feats/chaos_index/ranking?top_n=2").json()
+        assert top1["rodman_in_ranking"] is False
+        assert top2["rodman_in_ranking"] is True
+        assert top2["rodman_is_first"] is False
+
+    def test_slow_ranking_leaves_threadpool_free(self, monkeypatch):
+        """A cold ranking awaiting upstream must not hold a threadpool worker."""
+        import anyio.to_thread
+        import httpx
+
+        async def slow_fetch(feat, top_n=10):
+            await asyncio.sleep(0.5)
+            return [], "mock"
+
+        monkeypatch.setattr("nba_client.fetch_ranking_async", slow_fetch)
+
+        async def scenario():
+            # One worker thread: a sync ranking route would starve /api/health
+            anyio.to_thread.current_default_thread_limiter().total_tokens = 1
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+                rankings = [
+                    asyncio.ensure_future(ac.get(f"/api/feats/{feat_id}/ranking"))
+                    for feat_id in ("season_rpg", "chaos_index", "rebounding_titles")
+                ]
+                await asyncio.sleep(0.05)
+                start = time.perf_counter()
+                health = await ac.get("/api/health")
+                elapsed = time.perf_counter() - start
+                return health.status_code, elapsed, [r.status_code for r in await asyncio.gather(*rankings)]
+
+        health, elapsed, rankings = asyncio.run(scenario())
+        assert health == 200
+        assert elapsed < 0.3
+        assert rankings == [200] * 3
+
+    def test_cache_hit_serves_stored_bytes(self, client):
+        first  = client.get("/api/feats/chaos_index/ranking?top_n=5")
+        second = client.get("/api/feats/chaos_index/ranking?top_n=5")
+        assert first.content == second.content
+        assert second.headers["content-type"] == "application/json"
+
+    def test_feat_list_is_cached_encoded(self, client):
+        client.get("/api/feats")
+        encoded = cache.get("feats:all")
+        assert isinstance(encoded.body, bytes)
+        assert client.get("/api/feats").content == encoded.body
+
+
+# ---------------------------------------------------------------------------
+# Prewarm / refresh hooks used by the scheduler
+# ---------------------------------------------------------------------------
+
+class TestWarmAndRefresh:
+    def test_warm_fills_cache(self):
+        import app as app_module
+        app_module.warm_ranking("chaos_index")
+        assert cache.get("ranking:chaos_index") is not None
+
+    def test_warm_then_request_is_a_hit(self, client, monkeypatch):
+        import app as app_module
+        app_module.warm_ranking("chaos_index")
+        monkeypatch.setattr(
+            "nba_client.fetch_ranking_async",
+            lambda feat, top_n=10: pytest.fail("request should hit the warmed cache"),
+        )
+        assert client.get("/api/feats/chaos_index/ranking").status_code == 200
+
+    def test_warm_many_fetches_in_one_batch(self, monkeypatch):
+        import app as app_module
+        app_module.warm_ranking("chaos_index")
+        batches = []
+
+        def fake_fetch_rankings(feats, top_n=10):
+            batches.append([f["id"] for f in feats])
+            return {f["id"]: ([], "mock") for f in feats}
+
+        monkeypatch.setattr("nba_client.fetch_rankings", fake_fetch_rankings)
+        app_module.warm_rankings(["chaos_index", "season_rpg", "offensive_rebounds_season"])
+        assert batches == [["season_rpg", "offensive_rebounds_season"]]
+        assert cache.get("ranking:season_rpg") is not None
+
+    def test_request_during_prewarm_waits_for_the_batch(self, client, monkeypatch):
+        import app as app_module
+        import feats as feats_catalog
+        batches = []
+
+        def slow_fetch_rankings(feats, top_n=10):
+            batches.append([f["id"] for f in feats])
+            time.sleep(0.3)
+            return {f["id"]: ([], "mock") for f in feats}
+
+        monkeypatch.setattr("nba_client.fetch_rankings", slow_fetch_rankings)
+        monkeypatch.setattr("nba_client.fetch_ranking_async", lambda *a, **k: pytest.fail("second crawl"))
+        warm = threading.Thread(target=app_module.warm_rankings, args=(list(feats_catalog.FEATS),))
+        warm.start()
+        time.sleep(0.1)
+        res = client.get("/api/feats/season_rpg/ranking")
+        warm.join()
+        assert res.status_code == 200
+        assert batches == [list(feats_catalog.FEATS)]
+
+    def test_refresh_overwrites_entry(self):
+        import app as app_module
+        app_module.warm_ranking("chaos_index")
+        before = cache.get("ranking:chaos_index")
+        app_module.refresh_ranking("chaos_index")
+        assert cache.get("ranking:chaos_index") is not before
+
+    def test_refresh_keeps_live_ranking_over_mock(self, monkeypatch):
+        import app as app_module
+        import feats as feats_catalog
+        feat = feats_catalog.get_feat("season_rpg")
+        live = [{"rank": 1, "player": "Dennis Rodman", "team": "DET", "value": 18.7, "is_rodman": True}]
+        cache.set("ranking:season_rpg", app_module._encode_ranking(feat, live, "live"))
+        monkeypatch.setattr("nba_client.fetch_ranking", lambda feat, top_n=10: ([], "mock"))
+        app_module.refresh_ranking("season_rpg")
+        assert cache.get("ranking:season_rpg").full["source"] == "live"
+
+    def test_kept_ranking_restarts_its_age(self, client, monkeypatch):
+        import app as app_module
+        import feats as feats_catalog
+        feat = feats_catalog.get_feat("season_rpg")
+        live = [{"rank": 1, "player": "Dennis Rodman", "team": "DET", "value": 18.7, "is_rodman": True}]
+        old = app_module._encode_ranking(feat, live, "live")
+        aged = old._replace(bodies=tuple(b._replace(created_at=time.time() - 550) for b in old.bodies))
+        cache.set("ranking:season_rpg", aged, ttl=50)
+        assert client.get("/api/feats/season_rpg/ranking").headers["age"] == "550"
+        monkeypatch.setattr("nba_client.fetch_ranking", lambda feat, top_n=10: ([], "mock"))
+        app_module.refresh_ranking("season_rpg")
+        res = client.get("/api/feats/season_rpg/ranking")
+        assert res.json()["source"] == "live"
+        assert res.headers["cache-control"] == f"public, max-age={cache.DEFAULT_TTL}"
+        assert int(res.headers["age"]) <= 1
+
+    @pytest.fixture
+    def sqlite_backend(self, tmp_path):
+        cache.SQLITE_PATH, original = str(tmp_path / "shared.sqlite3"), cache.SQLITE_PATH
+        cache.configure(backend="sqlite")
+        yield
+        cache.configure(backend="memory")
+        cache.SQLITE_PATH = original
+
+    def test_refresh_skipped_while_another_worker_holds_lease(self, sqlite_backend, monkeypatch):
+        import app as app_module
+        monkeypatch.setattr("nba_client.fetch_ranking", lambda *a, **k: pytest.fail("refetched"))
+        assert cache._store.acquire_lease("ranking:chaos_index", 60)
+        app_module.refresh_ranking("chaos_index")
+        assert cache.get("ranking:chaos_index") is None
+
+    def test_warm_many_leaves_leased_feats_to_their_holder(self, sqlite_backend, monkeypatch):
+        import app as app_module
+        batches = []
+
+        def fake_fetch_rankings(feats, top_n=10):
+            batches.append([f["id"] for f in feats])
+            return {f["id"]: ([], "mock") for f in feats}
+
+        monkeypatch.setattr("nba_client.fetch_rankings", fake_fetch_rankings)
+        assert cache._store.acquire_lease("ranking:season_rpg", 60)
+        app_module.warm_rankings(["chaos_index", "season_rpg"])
+        assert batches == [["chaos_index"]]
+        # Leases taken for the batch are released afterwards
+        assert cache._store.acquire_lease("ranking:chaos_index", 60)
@@ -1,9 +1,16 @@
 """
 test_cache.py — Unit tests for cache.py
 
-Covers: set, get, TTL expiry, clear, stats, overwrite behaviour.
+Covers: set, get, TTL expiry, clear, stats, overwrite behaviour,
+        LRU eviction, byte budget, proactive expiry, single-flight get_or_set
+        (sync and async),
+        persistent disk tier, pluggable backends (memory / shared SQLite),
+        JSON (not pickle) storage and private file permissions,
+        incremental metrics.
 """
 
+import asyncio
+import threading
 import time
 import pytest
 import cache
@@ -15,6 +22,7 @@ def reset_cache():
     cache.clear()
     yield
     cache.clear()
+    cache.configure(max_entries=cache.MAX_ENTRIES, max_bytes=cache.MAX_BYTES)
 
 
 class TestCacheSet:
@@ -109,3 +117,497 @@ class TestCacheStats:
         assert "total_keys"   in s
         assert "live_keys"    in s
         assert "expired_keys" in s
+
+
+class TestCacheEviction:
+    def test_entry_limit_evicts_oldest(self):
+        cache.configure(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert cache.get("c") == 3
+
+    def test_get_refreshes_recency(self):
+        cache.configure(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")                        # "b" is now least recently used
+        cache.set("c", 3)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+
+    def test_byte_budget_evicts(self):
+        cache.set("big1", "x" * 10_000)
+        cache.set("big2", "y" * 10_000)
+        cache.configure(max_bytes=15_000)
+        assert cache.stats()["total_keys"] == 1
+        assert cache.get("big2") is not None
+        assert cache.stats()["bytes"] <= 15_000
+
+    def test_overwrite_does_not_double_count_bytes(self):
+        cache.set("k", "x" * 1_000)
+        first = cache.stats()["bytes"]
+        cache.set("k", "x" * 1_000)
+        assert cache.stats()["bytes"] == first
+
+
+class TestCacheProactiveExpiry:
+    def test_set_reaps_other_expired_keys(self):
+        cache.set("stale", "old", ttl=0)
+        time.sleep(0.05)
+        cache.set("fresh", "new")
+        assert cache.stats()["total_keys"] == 1
+
+    def test_purge_expired_returns_count(self):
+        cache.set("z", 3, ttl=60)
+        cache.set("x", 1, ttl=0.1)
+        cache.set("y", 2, ttl=0.1)
+        time.sleep(0.15)
+        assert cache.purge_expired() == 2
+        assert cache.get("z") == 3
+
+
+class TestCacheGetOrSet:
+    def test_miss_computes_and_stores(self):
+        assert cache.get_or_set("k", lambda: "computed") == "computed"
+        assert cache.get("k") == "computed"
+
+    def test_hit_skips_compute(self):
+        cache.set("k", "cached")
+        assert cache.get_or_set("k", lambda: pytest.fail("should not compute")) == "cached"
+
+    def test_concurrent_misses_compute_once(self):
+        calls = {"n": 0}
+        release = threading.Event()
+
+        def slow_compute():
+            calls["n"] += 1
+            release.wait(timeout=2)
+            return "shared"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_set("herd", slow_compute)))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        time.sleep(0.1)
+        release.set()
+        for t in threads:
+            t.join(timeout=2)
+
+        assert calls["n"] == 1
+        assert results == ["shared"] * 8
+
+    def test_error_propagates_and_is_not_cached(self):
+        def boom():
+            raise RuntimeError("upstream down")
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_set("k", boom)
+        assert cache.get_or_set("k", lambda: "recovered") == "recovered"
+
+
+class TestCacheClaimed:
+    def test_waiters_get_the_batch_value(self):
+        results = []
+        with cache.claimed(["a", "b"]) as claim:
+            assert claim.keys == ["a", "b"]
+            waiter = threading.Thread(
+                target=lambda: results.append(cache.get_or_set("a", lambda: pytest.fail("recomputed")))
+            )
+            waiter.start()
+            time.sleep(0.05)
+            claim.land("a", "batch")
+            waiter.join(timeout=2)
+            claim.land("b", "batch")
+        assert results == ["batch"]
+        assert cache.get("b") == "batch"
+
+    def test_cached_and_inflight_keys_not_claimed(self):
+        cache.set("cached", 1)
+        release = threading.Event()
+        leader = threading.Thread(target=cache.get_or_set, args=("busy", lambda: release.wait(2) and 2))
+        leader.start()
+        time.sleep(0.05)
+        with cache.claimed(["cached", "busy", "free"]) as claim:
+            assert claim.keys == ["free"]
+            claim.land("free", 3)
+        release.set()
+        leader.join(timeout=2)
+
+    def test_unlanded_keys_fail_their_waiters(self):
+        errors = []
+
+        def wait():
+            try:
+                cache.get_or_set("a", lambda: pytest.fail("recomputed"))
+            except ValueError as exc:
+                errors.append(exc)
+
+        with pytest.raises(ValueError):
+            with cache.claimed(["a"]):
+                waiter = threading.Thread(target=wait)
+                waiter.start()
+                time.sleep(0.05)
+                raise ValueError("upstream down")
+        waiter.join(timeout=2)
+        assert len(errors) == 1
+        assert cache.get_or_set("a", lambda: "recovered") == "recovered"
+
+
+class TestCacheGetOrSetAsync:
+    def test_miss_computes_and_stores(self):
+        async def compute():
+            return "computed"
+
+        assert asyncio.run(cache.get_or_set_async("k", compute)) == "computed"
+        assert cache.get("k") == "computed"
+
+    def test_hit_skips_compute(self):
+        cache.set("k", "cached")
+        result = asyncio.run(cache.get_or_set_async("k", lambda: pytest.fail("should not compute")))
+        assert result == "cached"
+
+    def test_resolve_reports_hit_miss_and_coalesced(self):
+        async def slow_compute():
+            await asyncio.sleep(0.1)
+            return "v"
+
+        async def run():
+            first = await asyncio.gather(*(cache.resolve_async("k", slow_compute) for _ in range(3)))
+            return first, await cache.resolve_async("k", slow_compute)
+
+        first, again = asyncio.run(run())
+        assert [outcome for _, outcome in first] == ["miss", "coalesced", "coalesced"]
+        assert again == ("v", "hit")
+
+    def test_concurrent_coroutines_compute_once(self):
+        calls = {"n": 0}
+
+        async def slow_compute():
+            calls["n"] += 1
+            await asyncio.sleep(0.1)
+            return "shared"
+
+        async def herd():
+            return await asyncio.gather(*(cache.get_or_set_async("herd", slow_compute) for _ in range(8)))
+
+        assert asyncio.run(herd()) == ["shared"] * 8
+        assert calls["n"] == 1
+
+    def test_coroutine_joins_thread_flight(self):
+        release = threading.Event()
+
+        def slow_compute():
+            release.wait(timeout=2)
+            return "from thread"
+
+        leader = threading.Thread(target=lambda: cache.get_or_set("k", slow_compute))
+        leader.start()
+        time.sleep(0.05)
+
+        async def join():
+            asyncio.get_running_loop().call_later(0.05, release.set)
+            return await cache.get_or_set_async("k", lambda: pytest.fail("should not compute"))
+
+        assert asyncio.run(join()) == "from thread"
+        leader.join(timeout=2)
+
+    def test_thread_joins_coroutine_flight(self):
+        results = []
+
+        async def slow_compute():
+            await asyncio.sleep(0.1)
+            return "from loop"
+
+        async def lead():
+            follower = threading.Thread(
+                target=lambda: results.append(cache.get_or_set("k", lambda: pytest.fail("no")))
+            )
+            task = asyncio.ensure_future(cache.get_or_set_async("k", slow_compute))
+            await asyncio.sleep(0.02)
+            follower.start()
+            value = await task
+            await asyncio.to_thread(follower.join, 2)
+            return value
+
+        assert asyncio.run(lead()) == "from loop"
+        assert results == ["from loop"]
+
+    def test_error_reaches_waiters_and_is_not_cached(self):
+        async def boom():
+            await asyncio.sleep(0.05)
+            raise RuntimeError("upstream down")
+
+        async def herd():
+            return await asyncio.gather(
+                *(cache.get_or_set_async("k", boom) for _ in range(3)), return_exceptions=True
+            )
+
+        assert all(isinstance(r, RuntimeError) for r in asyncio.run(herd()))
+        assert cache.get("k") is None
+
+
+class TestCacheDiskTier:
+    @pytest.fixture
+    def disk_path(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite3")
+        cache.configure(disk_path=path)
+        yield path
+        cache.configure(disk_path="")
+
+    def test_memory_miss_falls_through_to_disk(self, disk_path):
+        cache.set("ranking:x", {"ranking": [1, 2, 3]})
+        cache.flush()
+        cache._store.clear()                  # simulate a fresh process
+        assert cache.get("ranking:x") == {"ranking": [1, 2, 3]}
+
+    def test_disk_hit_is_promoted_to_memory(self, disk_path):
+        cache.set("k", "v")
+        cache.flush()
+        cache._store.clear()
+        cache.get("k")
+        assert cache._store.get("k") == "v"
+
+    def test_survives_restart(self, disk_path):
+        cache.set("k", "persisted", ttl=60)
+        cache.flush()
+        fresh = cache.DiskCache(disk_path)
+        value, expires_at = fresh.get_entry("k")
+        assert value == "persisted"
+        assert expires_at > time.time()
+
+    def test_expired_rows_are_not_served(self, disk_path):
+        cache.set("k", "old", ttl=0)
+        cache.flush()
+        cache._store.clear()
+        time.sleep(0.05)
+        assert cache.get("k") is None
+
+    def test_clear_wipes_disk(self, disk_path):
+        cache.set("k", "v")
+        cache.clear()
+        assert cache.get("k") is None
+        assert cache.stats(deep=True)["disk_keys"] == 0
+
+
+class TestSQLiteBackend:
+    @pytest.fixture
+    def sqlite_path(self, tmp_path):
+        path = str(tmp_path / "shared.sqlite3")
+        cache.SQLITE_PATH, original = path, cache.SQLITE_PATH
+        cache.configure(backend="sqlite")
+        yield path
+        cache.configure(backend="memory")
+        cache.SQLITE_PATH = original
+
+    def test_set_and_get(self, sqlite_path):
+        cache.set("k", {"ranking": [1, 2]})
+        assert cache.get("k") == {"ranking": [1, 2]}
+        assert cache.stats()["backend"] == "SQLiteCache"
+
+    def test_expiry_matches_memory_backend(self, sqlite_path):
+        cache.set("soon_gone", "bye", ttl=0)
+        time.sleep(0.05)
+        assert cache.stats(deep=True)["expired_keys"] == 1
+        assert cache.get("soon_gone") is None
+        assert cache.stats(deep=True)["total_keys"] == 0
+
+    def test_workers_share_one_store(self, sqlite_path):
+        other_worker = cache.SQLiteCache(sqlite_path)
+        other_worker.set("ranking:season_rpg", "from another worker")
+        assert cache.get("ranking:season_rpg") == "from another worker"
+
+    def test_entry_limit_drops_soonest_to_expire(self, sqlite_path):
+        cache.configure(max_entries=2)
+        cache.set("short", 1, ttl=10)
+        cache.set("long", 2, ttl=100)
+        cache.set("longer", 3, ttl=200)
+        assert cache.get("short") is None
+        assert cache.stats(deep=True)["total_keys"] == 2
+
+    def test_leased_is_exclusive_and_released(self, sqlite_path):
+        with cache.leased("k") as first:
+            with cache.leased("k") as second:
+                assert (first, second) == (True, False)
+        with cache.leased("k") as again:
+            assert again
+
+    def test_plain_stats_never_scan(self, sqlite_path, monkeypatch):
+        cache.set("k", "v")
+        monkeypatch.setattr(cache.SQLiteCache, "_conn", lambda self: pytest.fail("scanned"))
+        s = cache.stats()
+        assert "total_keys" not in s
+        assert s["sets"] == 1
+
+    def test_async_path_keeps_sqlite_off_the_loop(self, sqlite_path, monkeypatch):
+        loop_thread = threading.get_ident()
+        store = cache._store
+        for name in ("get", "set", "acquire_lease", "release_lease"):
+            real = getattr(store, name)
+
+            def guarded(*args, _real=real, _name=name):
+                assert threading.get_ident() != loop_thread, f"{_name} ran on the event loop"
+                return _real(*args)
+
+            monkeypatch.setattr(store, name, guarded)
+
+        async def compute():
+            return "v"
+
+        async def run():
+            first = await cache.get_or_set_async("k", compute)
+            await cache.set_async("other", "w")
+            return first, await cache.get_or_set_async("k", compute), await cache.get_async("other")
+
+        assert asyncio.run(run()) == ("v", "v", "w")
+
+    def test_claimed_skips_keys_leased_by_another_worker(self, sqlite_path):
+        assert cache.SQLiteCache(sqlite_path).acquire_lease("theirs", 60)
+        with cache.claimed(["theirs", "ours"]) as claim:
+            assert claim.keys == ["ours"]
+            claim.land("ours", 1)
+        # Landing released our lease
+        assert cache.SQLiteCache(sqlite_path).acquire_lease("ours", 60)
+
+    def test_lease_is_exclusive(self, sqlite_path):
+        a = cache.SQLiteCache(sqlite_path)
+        b = cache.SQLiteCache(sqlite_path)
+        assert a.acquire_lease("k", 60) is True
+        assert b.acquire_lease("k", 60) is False
+        a.release_lease("k")
+        assert b.acquire_lease("k", 60) is True
+
+    def test_rows_are_json_not_pickles(self, sqlite_path):
+        import json
+        import sqlite3
+
+        cache.set("k", {"body": b"\x00\xff", "pair": (1, "a")})
+        assert cache.get("k") == {"body": b"\x00\xff", "pair": (1, "a")}
+        blob = sqlite3.connect(sqlite_path).execute("SELECT value FROM cache").fetchone()[0]
+        json.loads(blob)
+
+    def test_registered_namedtuples_round_trip(self, sqlite_path):
+        import responses
+
+        encoded = responses.encode({"a": 1})
+        cache.set("k", (encoded, [encoded]))
+        value = cache.get("k")
+        assert value == (encoded, [encoded])
+        assert type(value[0]) is responses.EncodedBody
+
+    def test_unregistered_type_refused(self, sqlite_path):
+        from typing import NamedTuple
+
+        class Stranger(NamedTuple):
+            x: int
+
+        with pytest.raises(TypeError):
+            cache.set("k", Stranger(1))
+
+    def test_planted_pickle_is_a_miss_and_never_runs(self, sqlite_path, tmp_path):
+        import pickle
+        import sqlite3
+
+        marker = tmp_path / "pwned"
+
+        class Exploit:
+            def __reduce__(self):
+                return (open, (str(marker), "w"))
+
+        with sqlite3.connect(sqlite_path) as conn:
+            conn.execute("INSERT INTO cache VALUES (?, ?, ?)",
+                         ("k", pickle.dumps(Exploit()), time.time() + 60))
+        assert cache.get("k") is None
+        assert not marker.exists()
+
+    def test_file_is_owner_only(self, tmp_path):
+        import os
+        import stat
+
+        path = tmp_path / "private" / "c.sqlite3"
+        cache.SQLiteCache(str(path))
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        assert stat.S_IMODE(os.stat(path.parent).st_mode) == 0o700
+
+    def test_default_path_is_not_shared_tmp(self):
+        import tempfile
+
+        assert not cache.SQLITE_PATH.startswith(tempfile.gettempdir())
+
+    def test_get_or_set_waits_for_other_worker(self, sqlite_path):
+        other_worker = cache.SQLiteCache(sqlite_path)
+        other_worker.acquire_lease("k", 60)
+
+        def finish_elsewhere():
+            time.sleep(0.1)
+            other_worker.set("k", "computed elsewhere")
+            other_worker.release_lease("k")
+
+        threading.Thread(target=finish_elsewhere).start()
+        result = cache.get_or_set("k", lambda: pytest.fail("should not compute"))
+        assert result == "computed elsewhere"
+
+
+class TestCacheMetrics:
+    def test_hits_and_misses_are_counted(self):
+        cache.set("k", 1)
+        cache.get("k")
+        cache.get("k")
+        cache.get("missing")
+        s = cache.stats()
+        assert s["hits"] == 2
+        assert s["misses"] == 1
+        assert s["sets"] == 1
+        assert s["hit_rate"] == pytest.approx(2 / 3, abs=1e-3)
+
+    def test_expirations_are_counted(self):
+        cache.set("k", 1, ttl=0)
+        time.sleep(0.05)
+        cache.get("k")
+        assert cache.stats()["expirations"] == 1
+
+    def test_evictions_are_counted(self):
+        cache.configure(max_entries=1)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.stats()["evictions"] == 1
+
+    def test_prefix_breakdown(self):
+        cache.set("ranking:season_rpg:10", {"x": 1})
+        cache.set("ranking:season_rpg:5", {"x": 1})
+        cache.set("ranking:chaos_index:10", {"x": 1})
+        cache.get("ranking:season_rpg:10")
+        prefixes = cache.stats()["prefixes"]
+        assert prefixes["ranking:season_rpg"]["keys"] == 2
+        assert prefixes["ranking:season_rpg"]["hits"] == 1
+        assert prefixes["ranking:chaos_index"]["keys"] == 1
+        assert prefixes["ranking:season_rpg"]["bytes"] > 0
+
+    def test_byte_gauge_tracks_removals(self):
+        cache.set("k", "x" * 1_000, ttl=0)
+        time.sleep(0.05)
+        cache.get("k")
+        s = cache.stats()
+        assert s["bytes"] == 0
+        assert s["prefixes"]["k"]["bytes"] == 0
+
+    def test_compute_latency_is_recorded(self):
+        cache.get_or_set("ranking:x:10", lambda: "v")
+        s = cache.stats()
+        assert s["compute_count"] == 1
+        assert sum(s["compute_seconds"].values()) == 1
+        assert s["prefixes"]["ranking:x"]["compute_count"] == 1
+
+    def test_clear_resets_counters(self):
+        cache.set("k", 1)
+        cache.get("k")
+        cache.clear()
+        s = cache.stats()
+        assert s["hits"] == 0
+        assert s["sets"] == 0
+        assert s["prefixes"] == {}
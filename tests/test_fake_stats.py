@@ -0,0 +1,179 @@
+"""
+test_fake_stats.py — Unit tests for fake_stats.py
+
+Covers: synthetic and recorded payloads, fault rates, hangs that honour the
+        caller's timeout, the httpx transport, the ASGI app, and install()
+        driving fetch_ranking end to end.
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+import pytest
+
+import fake_stats
+import feats as feats_catalog
+import nba_client
+import stats_client
+
+
+@pytest.fixture(autouse=True)
+def clean_upstream_state(monkeypatch):
+    nba_client.clear_leader_store()
+    nba_client._breaker.reset()
+    monkeypatch.setattr(nba_client, "_limiter", nba_client.RateLimiter(rate=1e6, burst=1000))
+    yield
+    nba_client.clear_leader_store()
+    nba_client._breaker.reset()
+
+
+class TestPayloads:
+    def test_synthetic_is_deterministic_and_parseable(self):
+        payload = fake_stats.synthetic_payload("1991-92", "REB")
+        assert payload == fake_stats.synthetic_payload("1991-92", "REB")
+        rows = nba_client._payload_rows(payload, "1991-92", "REB", 3, float)
+        assert rows[0]["player"] == "Dennis Rodman"
+        assert rows[0]["value"] >= rows[1]["value"] >= rows[2]["value"]
+
+    def test_recordings_are_replayed(self, tmp_path):
+        recorded = {"resultSet": {"headers": ["PLAYER", "TEAM", "REB"], "rowSet": [["X", "Y", 1]]}}
+        (tmp_path / "leagueleaders_1991-92_REB_PerGame.json").write_text(json.dumps(recorded))
+        fake = fake_stats.FakeStats(recordings=str(tmp_path))
+        assert fake.request_leaders("1991-92", "REB", "PerGame") == recorded
+        # Anything not recorded falls back to synthetic data
+        assert fake.request_leaders("1992-93", "REB", "PerGame")["resultSet"]["rowSet"]
+
+
+class TestFaults:
+    def test_error_and_throttle(self):
+        with pytest.raises(ConnectionError):
+            fake_stats.FakeStats(error_rate=1).request_leaders("1991-92", "REB", "PerGame")
+        with pytest.raises(nba_client.Throttled):
+            fake_stats.FakeStats(throttle_rate=1).request_leaders("1991-92", "REB", "PerGame")
+
+    def test_rates_are_respected(self):
+        fake = fake_stats.FakeStats(error_rate=0.2, throttle_rate=0.1, seed=7)
+        for _ in range(2000):
+            try:
+                fake.request_leaders("1991-92", "REB", "PerGame")
+            except Exception:
+                pass
+        counts = fake.stats()
+        assert counts["calls"] == 2000
+        assert 300 < counts["errors"] < 500
+        assert 120 < counts["throttled"] < 280
+
+    def test_latency_range(self):
+        fake = fake_stats.FakeStats(latency=(0.02, 0.04))
+        start = time.monotonic()
+        fake.request_leaders("1991-92", "REB", "PerGame")
+        assert 0.02 <= time.monotonic() - start < 0.2
+
+    def test_hang_waits_out_the_timeout(self, monkeypatch):
+        monkeypatch.setattr(stats_client, "TIMEOUT", 0.05)
+        start = time.monotonic()
+        with pytest.raises(TimeoutError):
+            fake_stats.FakeStats(hang_rate=1).request_leaders("1991-92", "REB", "PerGame")
+        assert 0.05 <= time.monotonic() - start < 0.5
+
+
+class TestTransport:
+    def _fetch(self, fake, timeout=None):
+        stats_client.use_transport(fake.transport())
+        try:
+            return asyncio.run(stats_client.league_leaders("1991-92", "REB", "PerGame", timeout=timeout))
+        finally:
+            stats_client.use_transport(None)
+
+    def test_serves_payload(self):
+        assert self._fetch(fake_stats.FakeStats()) == fake_stats.synthetic_payload("1991-92", "REB")
+
+    def test_429_status(self):
+        with pytest.raises(httpx.HTTPStatusError) as err:
+            self._fetch(fake_stats.FakeStats(throttle_rate=1))
+        assert err.value.response.status_code == 429
+
+    def test_hang_times_out(self):
+        start = time.monotonic()
+        with pytest.raises(httpx.ReadTimeout):
+            self._fetch(fake_stats.FakeStats(hang_rate=1), timeout=0.05)
+        assert time.monotonic() - start < 0.5
+
+
+class TestAsgiApp:
+    def _get(self, fake, path):
+        async def go():
+            transport = httpx.ASGITransport(app=fake.asgi_app())
+            async with httpx.AsyncClient(transport=transport, base_url="http://fake") as client:
+                return await client.get(path, params={"Season": "1991-92", "StatCategory": "OREB",
+                                                      "PerMode": "Totals"})
+        return asyncio.run(go())
+
+    def test_leagueleaders(self):
+        resp = self._get(fake_stats.FakeStats(), "/stats/leagueleaders")
+        assert resp.status_code == 200
+        assert resp.json() == fake_stats.synthetic_payload("1991-92", "OREB")
+
+    def test_unknown_path(self):
+        assert self._get(fake_stats.FakeStats(), "/stats/boxscore").status_code == 404
+
+    def test_error_status(self):
+        assert self._get(fake_stats.FakeStats(error_rate=1), "/stats/leagueleaders").status_code == 500
+
+
+class TestInstall:
+    def test_live_path_runs_offline(self):
+        with fake_stats.install(fake_stats.FakeStats()) as fake:
+            ranking, source = nba_client.fetch_ranking(feats_catalog.get_feat("season_rpg"))
+        assert source == "live"
+        assert ranking[0]["is_rodman"] is True
+        assert fake.stats()["calls"] == len(nba_client.LIVE_QUERIES["season_rpg"]["seasons"])
+
+    def test_async_path_runs_offline(self):
+        with fake_stats.install(fake_stats.FakeStats()):
+            _, source = asyncio.run(nba_client.fetch_ranking_async(feats_catalog.get_feat("season_rpg")))
+        assert source == "live"
+
+    def test_restores_real_upstream(self):
+        real = nba_client._request_leaders
+        with fake_stats.install(fake_stats.FakeStats()):
+            assert nba_client._request_leaders is not real
+        assert nba_client._request_leaders is real
+
+    def test_hanging_upstream_falls_back_within_deadline(self, monkeypatch):
+        monkeypatch.setattr(nba_client, "RANKING_DEADLINE", 0.2)
+        monkeypatch.setattr(stats_client, "TIMEOUT", 1)
+        # The abandoned calls' timeouts land in these, not the shared guards
+        monkeypatch.setattr(nba_client, "_breaker", nba_client.CircuitBreaker(5, 60))
+        monkeypatch.setattr(nba_client, "_limiter", nba_client.RateLimiter(rate=1e6, burst=1000))
+        fake = fake_stats.FakeStats(hang_rate=1)
+        start = time.monotonic()
+        with fake_stats.install(fake):
+            _, source = nba_client.fetch_ranking(feats_catalog.get_feat("season_rpg"))
+            elapsed = time.monotonic() - start
+        assert source == "mock"
+        assert elapsed < 1.0
+
+    def test_leaving_install_joins_hung_calls(self, monkeypatch):
+        monkeypatch.setattr(stats_client, "TIMEOUT", 30)
+        fake = fake_stats.FakeStats(hang_rate=1)
+        errors = []
+
+        def call():
+            try:
+                fake.request_leaders("1991-92", "REB", "PerGame")
+            except TimeoutError as exc:
+                errors.append(exc)
+
+        thread = threading.Thread(target=call)
+        start = time.monotonic()
+        with fake_stats.install(fake):
+            thread.start()
+            time.sleep(0.05)
+        assert fake.settle(timeout=0)
+        assert time.monotonic() - start < 5
+        thread.join(timeout=1)
+        assert len(errors) == 1
@@ -18,7 +18,7 @@ EXPECTED_FEAT_IDS = {
 REQUIRED_FEAT_KEYS = {"id", "title", "subtitle", "description", "icon", "unit",
                       "source_strategy", "mock_file"}
 
-VALID_STRATEGIES = {"live", "mock"}
+VALID_STRATEGIES = {"live", "store", "mock"}
 
 
 class TestFeatCatalog:
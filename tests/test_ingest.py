@@ -0,0 +1,114 @@
+"""
+test_ingest.py — Unit tests for ingest.py
+
+Covers: catalog stat discovery, season range, resumable crawl, compaction,
+        failure accounting.
+"""
+
+import pytest
+
+import ingest
+import nba_client
+import player_store
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch, tmp_path):
+    monkeypatch.setattr(player_store, "STORE_DIR", str(tmp_path))
+    monkeypatch.setattr(nba_client, "_limiter", nba_client.RateLimiter(rate=1e6, burst=1000))
+    nba_client.clear_leader_store()
+    nba_client._breaker.reset()
+    player_store.clear_loaded()
+    yield
+    nba_client.clear_leader_store()
+    nba_client._breaker.reset()
+    player_store.clear_loaded()
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    calls = []
+
+    def fake_request(season, stat, per_mode):
+        calls.append((season, stat, per_mode))
+        return {"resultSet": {
+            "headers": ["PLAYER_ID", "PLAYER", "TEAM", stat],
+            "rowSet": [[1, "Dennis Rodman", "DET", 18.7], [2, f"Other {season}", "HOU", 14.0]],
+        }}
+
+    monkeypatch.setattr(nba_client, "_request_leaders", fake_request)
+    return calls
+
+
+class TestPlan:
+    def test_catalog_stats_cover_live_feats(self):
+        pairs = ingest.catalog_stats()
+        assert ("REB", "PerGame") in pairs
+        assert ("OREB", "Totals") in pairs
+
+    def test_seasons_run_to_current(self):
+        seasons = ingest.seasons_since(1980)
+        assert seasons[0] == "1980-81"
+        assert seasons[-1] == nba_client.current_season()
+
+
+class TestIngest:
+    SEASONS = ["1990-91", "1991-92", "1992-93"]
+
+    def test_stores_every_season_and_compacts(self, upstream):
+        counts = ingest.ingest([("REB", "PerGame")], self.SEASONS)
+        assert counts == {"fetched": 3, "skipped": 0, "failed": 0}
+        assert len(player_store.load_table("REB", "PerGame").value) == 6
+
+    def test_rerun_skips_stored_seasons(self, upstream):
+        ingest.ingest([("REB", "PerGame")], self.SEASONS)
+        nba_client.clear_leader_store()
+        upstream.clear()
+        counts = ingest.ingest([("REB", "PerGame")], self.SEASONS + ["1993-94"])
+        assert counts["skipped"] == 3
+        assert upstream == [("1993-94", "REB", "PerGame")]
+
+    def test_current_season_always_refetched(self, upstream):
+        current = nba_client.current_season()
+        ingest.ingest([("REB", "PerGame")], [current])
+        nba_client.clear_leader_store()
+        counts = ingest.ingest([("REB", "PerGame")], [current])
+        assert counts["fetched"] == 1
+
+    def test_failed_season_is_retried_next_run(self, monkeypatch, upstream):
+        real = nba_client._request_leaders
+
+        def flaky(season, stat, per_mode):
+            if season == "1991-92":
+                raise ConnectionError("timeout")
+            return real(season, stat, per_mode)
+
+        monkeypatch.setattr(nba_client, "_request_leaders", flaky)
+        assert ingest.ingest([("REB", "PerGame")], self.SEASONS)["failed"] == 1
+        monkeypatch.setattr(nba_client, "_request_leaders", real)
+        counts = ingest.ingest([("REB", "PerGame")], self.SEASONS)
+        assert counts == {"fetched": 1, "skipped": 2, "failed": 0}
+
+    def test_payloads_not_kept_in_leader_store(self, upstream):
+        ingest.ingest([("REB", "PerGame")], self.SEASONS)
+        assert nba_client.leader_store_stats()["entries"] == 0
+
+    def test_stops_calling_upstream_once_breaker_opens(self, monkeypatch, upstream):
+        def down(season, stat, per_mode):
+            upstream.append((season, stat, per_mode))
+            raise ConnectionError("down")
+
+        monkeypatch.setattr(nba_client, "_request_leaders", down)
+        monkeypatch.setattr(nba_client, "_breaker", nba_client.CircuitBreaker(threshold=2, cooldown=60))
+        counts = ingest.ingest([("REB", "PerGame"), ("OREB", "Totals")], self.SEASONS)
+        assert len(upstream) == 2
+        assert counts == {"fetched": 0, "skipped": 0, "failed": 6}
+
+    def test_cli_rate_paces_upstream(self, upstream):
+        ingest.main(["--stat", "OREB:Totals", "--since", "2023", "--rate", "250"])
+        assert nba_client.upstream_stats()["limiter"]["max_rate"] == 250
+        assert nba_client.upstream_stats()["limiter"]["burst"] == 1
+
+    def test_cli_exit_code(self, upstream):
+        assert ingest.main(["--stat", "OREB:Totals", "--since", "2020"]) == 0
+        assert player_store.stored_seasons("OREB", "Totals")[0] == "2020-21"
@@ -2,13 +2,24 @@
 test_nba_client.py — Unit tests for nba_client.py
 
 Covers: mock loading, normalisation, rank injection, fallback behaviour,
-        is_rodman detection, Rodman-is-first contract.
+        is_rodman detection, Rodman-is-first contract, parallel season fetch,
+        async fetch path, per-season leader store, raw result-set parsing,
+        streaming top-K merge, cross-feat live query planning, ranking
+        deadline, upstream circuit breaker, adaptive rate limiter,
+        preloaded mock index, store strategy.
 """
 
+import asyncio
 import json
 import os
+import random
+import threading
+import time
+
+import httpx
 import pytest
 import nba_client
+import stats_client
 import feats as feats_catalog
 
 BACKEND_DIR = os.path.dirname(os.path.abspath(nba_client.__file__))
@@ -82,6 +93,124 @@ class TestMockFiles:
             )
 
 
+# ---------------------------------------------------------------------------
+# Preloaded mock index
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def counted_loads(monkeypatch):
+    """Count real mock file reads."""
+    loads = []
+    real_load = nba_client._load_mock
+
+    def counting_load(filename):
+        loads.append(filename)
+        return real_load(filename)
+
+    nba_client.clear_mock_index()
+    monkeypatch.setattr(nba_client, "_load_mock", counting_load)
+    yield loads
+    nba_client.clear_mock_index()
+
+
+class TestMockIndex:
+    def test_file_read_once(self, counted_loads):
+        feat = feats_catalog.get_feat("chaos_index")
+        first, _ = nba_client.fetch_ranking(feat, top_n=5)
+        second, _ = nba_client.fetch_ranking(feat, top_n=3)
+        assert counted_loads == ["chaos_index.json"]
+        assert second == first[:3]
+
+    def test_entries_normalised_and_ranked(self, counted_loads):
+        with open(os.path.join(MOCKS_DIR, "season_rpg.json")) as f:
+            raw = json.load(f)["ranking"]
+        expected = nba_client._add_ranks([nba_client._normalise(p) for p in raw])
+        assert list(nba_client._mock_entries("season_rpg.json")) == expected
+
+    def test_preload_indexes_every_catalog_mock(self, counted_loads):
+        assert nba_client.preload_mocks() == len(feats_catalog.FEATS)
+        nba_client.fetch_ranking(feats_catalog.get_feat("rebounding_titles"))
+        assert len(counted_loads) == len(feats_catalog.FEATS)
+
+    def test_changed_file_is_reloaded(self, monkeypatch, tmp_path, counted_loads):
+        monkeypatch.setattr(nba_client, "MOCKS_DIR", str(tmp_path))
+        path = tmp_path / "feat.json"
+        path.write_text(json.dumps({"ranking": [{"player": "Dennis Rodman", "value": 1}]}))
+        assert nba_client._mock_ranking("feat.json", 5)[0]["value"] == 1
+
+        path.write_text(json.dumps({"ranking": [{"player": "Dennis Rodman", "value": 2}]}))
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert nba_client._mock_ranking("feat.json", 5)[0]["value"] == 2
+        assert counted_loads == ["feat.json", "feat.json"]
+
+    def test_async_mock_path_uses_index(self, counted_loads):
+        feat = feats_catalog.get_feat("chaos_index")
+        nba_client.fetch_ranking(feat)
+        _, source = asyncio.run(nba_client.fetch_ranking_async(feat))
+        assert source == "mock"
+        assert counted_loads == ["chaos_index.json"]
+
+
+# ---------------------------------------------------------------------------
+# "store" source strategy
+# ---------------------------------------------------------------------------
+
+STORE_FEAT = {
+    **feats_catalog.get_feat("season_rpg"),
+    "source_strategy": "store",
+    "store_query": {"stat": "REB", "per_mode": "PerGame", "value": "round1"},
+}
+
+
+@pytest.fixture
+def player_seasons(monkeypatch, tmp_path):
+    import player_store
+
+    monkeypatch.setattr(player_store, "STORE_DIR", str(tmp_path))
+    player_store.clear_loaded()
+    player_store.save_season("REB", "PerGame", "1991-92",
+                             [("Dennis Rodman", "DET", 18.74), ("Kevin Willis", "ATL", 15.48)])
+    player_store.save_season("REB", "PerGame", "1992-93",
+                             [("Dennis Rodman", "DET", 18.32), ("Shaquille O'Neal", "ORL", 13.9)])
+    player_store.compact("REB", "PerGame")
+    yield
+    player_store.clear_loaded()
+
+
+class TestStoreStrategy:
+    def test_ranks_from_store(self, monkeypatch, player_seasons):
+        monkeypatch.setattr(nba_client, "_request_leaders",
+                            lambda *a: pytest.fail("store feats must not hit the network"))
+        ranking, source = nba_client.fetch_ranking(STORE_FEAT, top_n=5)
+        assert source == "store"
+        assert [(p["player"], p["value"], p["season"]) for p in ranking] == [
+            ("Dennis Rodman", 18.7, "1991-92"),
+            ("Kevin Willis", 15.5, "1991-92"),
+            ("Shaquille O'Neal", 13.9, "1992-93"),
+        ]
+        assert [p["rank"] for p in ranking] == [1, 2, 3]
+
+    def test_season_restriction(self, player_seasons):
+        feat = {**STORE_FEAT, "store_query": {**STORE_FEAT["store_query"], "seasons": ["1992-93"]}}
+        ranking, _ = nba_client.fetch_ranking(feat)
+        assert ranking[0]["value"] == 18.3
+
+    def test_missing_store_falls_back_to_mock(self, monkeypatch, tmp_path):
+        import player_store
+
+        monkeypatch.setattr(player_store, "STORE_DIR", str(tmp_path / "empty"))
+        player_store.clear_loaded()
+        ranking, source = nba_client.fetch_ranking(STORE_FEAT)
+        assert source == "mock"
+        assert ranking[0]["is_rodman"] is True
+
+    def test_async_and_batch_paths(self, player_seasons):
+        sync_result = nba_client.fetch_ranking(STORE_FEAT)
+        assert asyncio.run(nba_client.fetch_ranking_async(STORE_FEAT)) == sync_result
+        assert nba_client.fetch_rankings([STORE_FEAT])["season_rpg"] == sync_result
+
+
 # ---------------------------------------------------------------------------
 # Normalisation
 # ---------------------------------------------------------------------------
@@ -230,3 +359,688 @@ class TestRodmanIsFirst:
         assert first["is_rodman"] is True, (
             f"Feat '{feat_id}': rank #1 is '{first['player']}', not Rodman"
         )
+
+
+# ---------------------------------------------------------------------------
+# Parallel per-season fetching
+# ---------------------------------------------------------------------------
+
+def _leaders_table(season, stat):
+    """Deterministic fake LeagueLeaders rows for one season."""
+    seed = sum(map(ord, season + stat))
+    names = ["Dennis Rodman", "Moses Malone", "Hakeem Olajuwon", "Dikembe Mutombo",
+             "Charles Oakley", "Shaquille O'Neal", "Ben Wallace"]
+    rng = random.Random(seed)
+    rng.shuffle(names)
+    base = 18.7 if stat == "REB" else 523
+    return [
+        {"PLAYER": n, "TEAM": "TST", stat: round(base - i * rng.uniform(0.5, 1.5), 1)}
+        for i, n in enumerate(names)
+    ]
+
+
+def _leaders_payload(season, stat):
+    """A raw leagueleaders payload wrapping _leaders_table(season, stat)."""
+    rows = _leaders_table(season, stat)
+    headers = ["PLAYER_ID", "RANK", "PLAYER", "TEAM", stat]
+    return {
+        "resultSet": {
+            "name": "LeagueLeaders",
+            "headers": headers,
+            "rowSet": [[i, i + 1, r["PLAYER"], r["TEAM"], r[stat]] for i, r in enumerate(rows)],
+        }
+    }
+
+
+@pytest.fixture(autouse=True)
+def empty_leader_store(monkeypatch):
+    nba_client.clear_leader_store()
+    nba_client._breaker.reset()
+    # Offline fakes answer instantly; don't pace them like the real upstream
+    monkeypatch.setattr(nba_client, "_limiter", nba_client.RateLimiter(rate=1e6, burst=1000))
+    yield
+    nba_client.clear_leader_store()
+    nba_client._breaker.reset()
+
+
+@pytest.fixture
+def fake_leagueleaders(monkeypatch):
+    """Replace the blocking leagueleaders call with an offline fake that sleeps a little."""
+    state = {"calls": 0, "in_flight": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def fake_request(season, stat, per_mode):
+        with lock:
+            state["calls"] += 1
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+        time.sleep(random.uniform(0.01, 0.05))
+        with lock:
+            state["in_flight"] -= 1
+        return _leaders_payload(season, stat)
+
+    monkeypatch.setattr(nba_client, "_request_leaders", fake_request)
+    return state
+
+
+class TestParallelSeasonFetch:
+    def test_rows_come_back_in_season_order(self):
+        def fetch_one(season):
+            time.sleep(random.uniform(0, 0.03))
+            return [{"season": season}]
+
+        seasons = [f"{y}-{str(y + 1)[2:]}" for y in range(1990, 2000)]
+        rows = nba_client._fetch_seasons(seasons, fetch_one)
+        assert [r["season"] for r in rows] == seasons
+
+    def test_failing_season_is_skipped(self):
+        def fetch_one(season):
+            if season == "b":
+                raise ConnectionError("timeout")
+            return [{"season": season}]
+
+        rows = nba_client._fetch_seasons(["a", "b", "c"], fetch_one)
+        assert [r["season"] for r in rows] == ["a", "c"]
+
+    def test_fanout_is_bounded(self, monkeypatch, fake_leagueleaders):
+        monkeypatch.setattr(nba_client, "SEASON_FANOUT", 3)
+        nba_client.LIVE_FETCHERS["season_rpg"](top_n=10)
+        assert fake_leagueleaders["calls"] == 13
+        assert 1 < fake_leagueleaders["peak"] <= 3
+
+    def test_output_matches_sequential_crawl(self, monkeypatch, fake_leagueleaders):
+        monkeypatch.setattr(nba_client, "SEASON_FANOUT", 1)
+        sequential = nba_client.LIVE_FETCHERS["offensive_rebounds_season"](top_n=25)
+        nba_client.clear_leader_store()
+        monkeypatch.setattr(nba_client, "SEASON_FANOUT", 8)
+        parallel = nba_client.LIVE_FETCHERS["offensive_rebounds_season"](top_n=25)
+        assert parallel == sequential
+        assert [p["rank"] for p in parallel] == list(range(1, len(parallel) + 1))
+
+
+# ---------------------------------------------------------------------------
+# Async fetch path (stats_client)
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def fake_stats_transport():
+    def handler(request):
+        params = request.url.params
+        return httpx.Response(200, json=_leaders_payload(params["Season"], params["StatCategory"]))
+
+    stats_client.use_transport(httpx.MockTransport(handler))
+    yield
+    stats_client.use_transport(None)
+
+
+class TestFetchRankingAsync:
+    def test_async_matches_sync_ranking(self, fake_leagueleaders, fake_stats_transport):
+        sync_rows = nba_client.LIVE_FETCHERS["season_rpg"](top_n=25)
+        nba_client.clear_leader_store()
+        async_rows = asyncio.run(nba_client.LIVE_FETCHERS_ASYNC["season_rpg"](top_n=25))
+        assert async_rows == sync_rows
+
+    def test_live_source_when_upstream_answers(self, fake_stats_transport):
+        feat = feats_catalog.get_feat("offensive_rebounds_season")
+        ranking, source = asyncio.run(nba_client.fetch_ranking_async(feat, top_n=5))
+        assert source == "live"
+        assert [p["rank"] for p in ranking] == [1, 2, 3, 4, 5]
+
+    def test_falls_back_to_mock(self, monkeypatch):
+        async def explode(top_n=10):
+            raise ConnectionError("Simulated timeout")
+
+        monkeypatch.setitem(nba_client.LIVE_FETCHERS_ASYNC, "season_rpg", explode)
+        feat = feats_catalog.get_feat("season_rpg")
+        ranking, source = asyncio.run(nba_client.fetch_ranking_async(feat))
+        assert source == "mock"
+        assert ranking[0]["is_rodman"] is True
+
+    def test_mock_strategy_never_calls_live(self, monkeypatch):
+        async def should_not_run(top_n=10):
+            pytest.fail("live fetcher called for mock feat")
+
+        monkeypatch.setitem(nba_client.LIVE_FETCHERS_ASYNC, "chaos_index", should_not_run)
+        feat = feats_catalog.get_feat("chaos_index")
+        _, source = asyncio.run(nba_client.fetch_ranking_async(feat))
+        assert source == "mock"
+
+
+def _collect(feat_id, top_n=10):
+    async def run():
+        return [step async for step in nba_client.stream_ranking(feats_catalog.get_feat(feat_id), top_n)]
+    return asyncio.run(run())
+
+
+class TestStreamRanking:
+    def test_mock_first_then_partials_then_live(self, fake_stats_transport):
+        steps = _collect("season_rpg", top_n=5)
+        assert steps[0]["source"] == "mock" and not steps[0]["final"]
+        assert {s["source"] for s in steps[1:-1]} == {"partial"}
+        assert steps[-1]["source"] == "live" and steps[-1]["final"]
+        assert [s["final"] for s in steps].count(True) == 1
+
+    def test_progress_counts_seasons(self, fake_stats_transport):
+        steps = _collect("season_rpg")
+        total = len(nba_client.LIVE_QUERIES["season_rpg"]["seasons"])
+        assert all(s["seasons_total"] == total for s in steps)
+        done = [s["seasons_done"] for s in steps[1:]]
+        assert done == sorted(done) and done[-1] == total
+
+    def test_final_matches_non_streamed_ranking(self, fake_stats_transport):
+        streamed = _collect("season_rpg", top_n=25)[-1]["ranking"]
+        nba_client.clear_leader_store()
+        fetched, _ = asyncio.run(nba_client.fetch_ranking_async(feats_catalog.get_feat("season_rpg"), 25))
+        assert streamed == fetched
+
+    def test_failed_crawl_ends_on_mock(self, monkeypatch):
+        async def down(*args):
+            raise ConnectionError("Simulated timeout")
+
+        monkeypatch.setattr(nba_client, "_leaders_payload_async", down)
+        steps = _collect("season_rpg")
+        assert [s["source"] for s in steps] == ["mock", "mock"]
+        assert steps[-1]["final"]
+
+    def test_mock_feat_is_one_final_step(self):
+        steps = _collect("chaos_index")
+        assert len(steps) == 1
+        assert steps[0]["source"] == "mock" and steps[0]["final"]
+
+    def test_open_breaker_skips_live(self, monkeypatch):
+        monkeypatch.setattr(nba_client, "_leaders_payload_async", lambda *a: pytest.fail("called upstream"))
+        for _ in range(nba_client._breaker.threshold):
+            nba_client._breaker.record_failure()
+        assert [s["source"] for s in _collect("season_rpg")] == ["mock"]
+
+
+# ---------------------------------------------------------------------------
+# Live query planner
+# ---------------------------------------------------------------------------
+
+def _query(stat, seasons, depth=5, per_mode="PerGame", value="round1"):
+    return {"stat": stat, "per_mode": per_mode, "seasons": seasons, "depth": depth, "value": value}
+
+
+class TestQueryPlanner:
+    def test_catalog_queries_name_known_transforms(self):
+        assert nba_client.LIVE_QUERIES
+        for feat_id, query in nba_client.LIVE_QUERIES.items():
+            assert query["value"] in nba_client.VALUE_TRANSFORMS, feat_id
+            assert feats_catalog.get_feat(feat_id)["source_strategy"] == "live"
+
+    def test_live_fetchers_built_from_specs(self):
+        assert set(nba_client.LIVE_FETCHERS) == set(nba_client.LIVE_QUERIES)
+        assert set(nba_client.LIVE_FETCHERS_ASYNC) == set(nba_client.LIVE_QUERIES)
+
+    def test_plan_merges_overlapping_queries(self):
+        keys = nba_client.plan_queries([
+            _query("REB", ["1991-92", "1992-93"], depth=5),
+            _query("REB", ["1992-93", "1993-94"], depth=2),
+            _query("OREB", ["1992-93"], per_mode="Totals"),
+        ])
+        assert keys == [
+            ("1991-92", "REB", "PerGame"),
+            ("1992-93", "REB", "PerGame"),
+            ("1993-94", "REB", "PerGame"),
+            ("1992-93", "OREB", "Totals"),
+        ]
+
+    def test_shared_seasons_fetched_once(self, monkeypatch, fake_leagueleaders):
+        monkeypatch.setattr(nba_client, "LIVE_QUERIES", {
+            "deep":    _query("REB", ["1991-92", "1992-93"], depth=5),
+            "shallow": _query("REB", ["1992-93", "1993-94"], depth=2),
+        })
+        rankings = nba_client.fetch_live_rankings(["deep", "shallow"], top_n=10)
+        assert fake_leagueleaders["calls"] == 3
+        assert set(rankings) == {"deep", "shallow"}
+
+    def test_fan_out_matches_single_feat_fetch(self, fake_leagueleaders):
+        live_ids = list(nba_client.LIVE_QUERIES)
+        planned = nba_client.fetch_live_rankings(live_ids, top_n=25)
+        nba_client.clear_leader_store()
+        for feat_id in live_ids:
+            assert planned[feat_id] == nba_client.LIVE_FETCHERS[feat_id](top_n=25)
+
+    def test_depth_limits_rows_per_season(self, monkeypatch, fake_leagueleaders):
+        monkeypatch.setattr(nba_client, "LIVE_QUERIES", {
+            "one": _query("REB", ["1991-92"], depth=2),
+        })
+        assert len(nba_client.fetch_live_rankings(["one"], top_n=10)["one"]) == 2
+
+    def test_async_plan_matches_sync(self, fake_leagueleaders, fake_stats_transport):
+        live_ids = list(nba_client.LIVE_QUERIES)
+        sync_rankings = nba_client.fetch_live_rankings(live_ids, top_n=25)
+        nba_client.clear_leader_store()
+        async_rankings = asyncio.run(nba_client.fetch_live_rankings_async(live_ids, top_n=25))
+        assert async_rankings == sync_rankings
+
+    def test_batch_falls_back_per_feat(self, monkeypatch):
+        def fake_request(season, stat, per_mode):
+            if stat == "OREB":
+                raise ConnectionError("Simulated timeout")
+            return _leaders_payload(season, stat)
+
+        monkeypatch.setattr(nba_client, "_request_leaders", fake_request)
+        results = nba_client.fetch_rankings(list(feats_catalog.FEATS.values()), top_n=5)
+        assert set(results) == feats_catalog.FEAT_IDS
+        assert results["season_rpg"][1] == "live"
+        assert results["offensive_rebounds_season"][1] == "mock"
+        assert results["chaos_index"][1] == "mock"
+        assert all(ranking for ranking, _ in results.values())
+
+
+# ---------------------------------------------------------------------------
+# Ranking deadline and circuit breaker
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def slow_season(monkeypatch):
+    """Upstream where one season ("1992-93") hangs far past any deadline."""
+    def fake_request(season, stat, per_mode):
+        if season == "1992-93":
+            time.sleep(1.0)
+        return _leaders_payload(season, stat)
+
+    monkeypatch.setattr(nba_client, "_request_leaders", fake_request)
+
+
+class TestDeadline:
+    def test_budget_drops_late_seasons(self):
+        def fetch_one(season):
+            if season == "b":
+                time.sleep(0.5)
+            return [{"season": season}]
+
+        start = time.monotonic()
+        rows = nba_client._fetch_seasons(["a", "b", "c"], fetch_one, budget=0.1)
+        assert time.monotonic() - start < 0.4
+        assert [r["season"] for r in rows] == ["a", "c"]
+
+    def test_async_budget_drops_late_seasons(self):
+        async def fetch_one(season):
+            if season == "b":
+                await asyncio.sleep(0.5)
+            return [{"season": season}]
+
+        rows = asyncio.run(nba_client._fetch_seasons_async(["a", "b", "c"], fetch_one, budget=0.1))
+        assert [r["season"] for r in rows] == ["a", "c"]
+
+    def test_partial_live_ranking_within_deadline(self, monkeypatch, slow_season):
+        monkeypatch.setattr(nba_client, "RANKING_DEADLINE", 0.2)
+        start = time.monotonic()
+        ranking, source = nba_client.fetch_ranking(feats_catalog.get_feat("season_rpg"))
+        assert time.monotonic() - start < 0.8
+        assert source == "live"
+        assert all(p["season"] != "1992-93" for p in ranking)
+
+    def test_too_few_seasons_serves_mock(self, monkeypatch, slow_season):
+        monkeypatch.setattr(nba_client, "RANKING_DEADLINE", 0.2)
+        monkeypatch.setattr(nba_client, "PARTIAL_MIN", 1.0)
+        _, source = nba_client.fetch_ranking(feats_catalog.get_feat("season_rpg"))
+        assert source == "mock"
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold(self):
+        breaker = nba_client.CircuitBreaker(threshold=2, cooldown=60)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert not breaker.allow()
+        assert breaker.stats()["state"] == "open"
+
+    def test_success_resets_failure_count(self):
+        breaker = nba_client.CircuitBreaker(threshold=2, cooldown=60)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.allow()
+
+    def test_half_open_after_cooldown(self):
+        breaker = nba_client.CircuitBreaker(threshold=1, cooldown=0.05)
+        breaker.record_failure()
+        assert not breaker.allow()
+        time.sleep(0.06)
+        assert breaker.allow()
+        assert breaker.stats()["state"] == "half_open"
+        breaker.record_failure()
+        assert not breaker.allow()
+        time.sleep(0.06)
+        breaker.record_success()
+        assert breaker.stats()["state"] == "closed"
+
+    def test_half_open_lets_one_probe_through(self):
+        breaker = nba_client.CircuitBreaker(threshold=1, cooldown=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        assert breaker.ready()
+        assert breaker.allow()
+        assert not breaker.allow()  # probe still out
+        assert breaker.ready()      # but a crawl may still start and wait its turn
+        breaker.record_success()
+        assert breaker.allow() and breaker.allow()
+
+    def test_abandoned_probe_is_replaced(self):
+        breaker = nba_client.CircuitBreaker(threshold=1, cooldown=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        assert breaker.allow()
+        assert not breaker.allow()
+        time.sleep(0.06)
+        assert breaker.allow()
+
+    def test_half_open_crawl_makes_one_call(self, monkeypatch):
+        calls = {"n": 0}
+
+        def failing_request(season, stat, per_mode):
+            calls["n"] += 1
+            raise ConnectionError("still down")
+
+        breaker = nba_client.CircuitBreaker(threshold=1, cooldown=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        monkeypatch.setattr(nba_client, "_breaker", breaker)
+        monkeypatch.setattr(nba_client, "_request_leaders", failing_request)
+        assert nba_client.fetch_ranking(feats_catalog.get_feat("season_rpg"))[1] == "mock"
+        assert calls["n"] == 1
+
+    def test_failing_upstream_trips_breaker(self, monkeypatch):
+        calls = {"n": 0}
+
+        def failing_request(season, stat, per_mode):
+            calls["n"] += 1
+            raise ConnectionError("Simulated timeout")
+
+        monkeypatch.setattr(nba_client, "_request_leaders", failing_request)
+        monkeypatch.setattr(nba_client, "_breaker", nba_client.CircuitBreaker(3, 60))
+        feat = feats_catalog.get_feat("season_rpg")
+        assert nba_client.fetch_ranking(feat)[1] == "mock"
+        first = calls["n"]
+        assert 3 <= first < len(nba_client.LIVE_QUERIES["season_rpg"]["seasons"])
+
+        ranking, source = nba_client.fetch_ranking(feat)
+        assert source == "mock"
+        assert calls["n"] == first
+        assert ranking[0]["is_rodman"] is True
+
+    def test_open_breaker_skips_async_live(self, monkeypatch):
+        async def should_not_run(top_n=10):
+            pytest.fail("live fetcher called while circuit open")
+
+        breaker = nba_client.CircuitBreaker(threshold=1, cooldown=60)
+        breaker.record_failure()
+        monkeypatch.setattr(nba_client, "_breaker", breaker)
+        monkeypatch.setitem(nba_client.LIVE_FETCHERS_ASYNC, "season_rpg", should_not_run)
+        _, source = asyncio.run(nba_client.fetch_ranking_async(feats_catalog.get_feat("season_rpg")))
+        assert source == "mock"
+
+    def test_upstream_stats_shape(self):
+        stats = nba_client.upstream_stats()
+        assert stats["breaker"]["state"] == "closed"
+        assert {"entries", "final", "current"} <= stats["leader_store"].keys()
+
+
+class TestRateLimiter:
+    def test_set_rate_changes_pace_in_place(self):
+        limiter = nba_client.RateLimiter(rate=1, burst=5, floor=0.5)
+        limiter.record_throttle()
+        limiter.set_rate(0.25, burst=1)
+        assert (limiter.rate, limiter.max_rate, limiter.floor, limiter.burst) == (0.25, 0.25, 0.25, 1)
+        assert limiter.stats()["tokens"] <= 1
+
+    def test_burst_passes_without_waiting(self):
+        limiter = nba_client.RateLimiter(rate=1, burst=5)
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.acquire()
+        assert time.monotonic() - start < 0.05
+
+    def test_caps_calls_per_second(self):
+        limiter = nba_client.RateLimiter(rate=20, burst=1)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        assert time.monotonic() - start >= 0.24
+
+    def test_async_acquire_paces(self):
+        limiter = nba_client.RateLimiter(rate=20, burst=1)
+
+        async def scenario():
+            await asyncio.gather(*(limiter.acquire_async() for _ in range(6)))
+
+        start = time.monotonic()
+        asyncio.run(scenario())
+        assert time.monotonic() - start >= 0.24
+
+    def test_queue_depth_counts_waiters(self):
+        limiter = nba_client.RateLimiter(rate=5, burst=1)
+        limiter.acquire()
+        threads = [threading.Thread(target=limiter.acquire) for _ in range(3)]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        assert limiter.stats()["queue_depth"] == 3
+        for t in threads:
+            t.join()
+        assert limiter.stats()["queue_depth"] == 0
+
+    def test_throttle_halves_rate_down_to_floor(self):
+        limiter = nba_client.RateLimiter(rate=4, burst=4, floor=1)
+        limiter.record_throttle()
+        assert limiter.stats()["rate"] == 2
+        for _ in range(5):
+            limiter.record_throttle()
+        assert limiter.stats()["rate"] == 1
+
+    def test_successes_recover_rate(self):
+        limiter = nba_client.RateLimiter(rate=4, burst=4, floor=1)
+        limiter.record_throttle()
+        for _ in range(20):
+            limiter.record_success()
+        assert limiter.stats()["rate"] == 4
+
+    def test_sync_429_backs_off(self, monkeypatch):
+        def throttled(season, stat, per_mode):
+            raise nba_client.Throttled("429")
+
+        monkeypatch.setattr(nba_client, "_request_leaders", throttled)
+        with pytest.raises(nba_client.Throttled):
+            nba_client._leaders_payload("1991-92", "REB", "PerGame")
+        assert nba_client._limiter.rate < nba_client._limiter.max_rate
+
+    def test_async_429_backs_off(self):
+        stats_client.use_transport(httpx.MockTransport(lambda r: httpx.Response(429)))
+        try:
+            with pytest.raises(httpx.HTTPStatusError):
+                asyncio.run(nba_client._leaders_payload_async("1991-92", "REB", "PerGame"))
+        finally:
+            stats_client.use_transport(None)
+        assert nba_client._limiter.rate < nba_client._limiter.max_rate
+
+    def test_other_errors_keep_rate(self, monkeypatch):
+        def broken(season, stat, per_mode):
+            raise ValueError("bad payload")
+
+        monkeypatch.setattr(nba_client, "_request_leaders", broken)
+        with pytest.raises(ValueError):
+            nba_client._leaders_payload("1991-92", "REB", "PerGame")
+        assert nba_client._limiter.rate == nba_client._limiter.max_rate
+
+    def test_reported_in_upstream_stats(self):
+        stats = nba_client.upstream_stats()["limiter"]
+        assert {"rate", "max_rate", "burst", "tokens", "queue_depth"} <= stats.keys()
+
+
+# ---------------------------------------------------------------------------
+# Per-season leader store
+# ---------------------------------------------------------------------------
+
+class TestLeaderStore:
+    @pytest.mark.parametrize("today, expected", [
+        (__import__("datetime").date(2026, 10, 17), "2026-27"),
+        (__import__("datetime").date(2026, 4, 1),   "2025-26"),
+        (__import__("datetime").date(1999, 12, 31), "1999-00"),
+    ])
+    def test_current_season(self, today, expected):
+        assert nba_client.current_season(today) == expected
+
+    def test_historical_refresh_makes_no_upstream_calls(self, fake_leagueleaders):
+        first = nba_client.LIVE_FETCHERS["season_rpg"](top_n=10)
+        calls = fake_leagueleaders["calls"]
+        second = nba_client.LIVE_FETCHERS["season_rpg"](top_n=10)
+        assert fake_leagueleaders["calls"] == calls
+        assert second == first
+
+    def test_completed_seasons_never_expire(self, fake_leagueleaders):
+        nba_client.LIVE_FETCHERS["offensive_rebounds_season"](top_n=10)
+        stats = nba_client.leader_store_stats()
+        assert stats["entries"] == len(nba_client.LIVE_QUERIES["offensive_rebounds_season"]["seasons"])
+        assert stats["final"] == stats["entries"]
+
+    def test_current_season_expires(self, monkeypatch, fake_leagueleaders):
+        monkeypatch.setattr(nba_client, "CURRENT_SEASON_TTL", 0)
+        season = nba_client.current_season()
+        nba_client._leaders_payload(season, "REB", "PerGame")
+        time.sleep(0.05)
+        nba_client._leaders_payload(season, "REB", "PerGame")
+        assert fake_leagueleaders["calls"] == 2
+        assert nba_client.leader_store_stats()["current"] == 1
+
+    def test_async_path_shares_the_store(self, fake_leagueleaders, fake_stats_transport):
+        nba_client.LIVE_FETCHERS["season_rpg"](top_n=10)
+        upstream = []
+        stats_client.use_transport(httpx.MockTransport(
+            lambda r: upstream.append(r) or httpx.Response(500)
+        ))
+        asyncio.run(nba_client.LIVE_FETCHERS_ASYNC["season_rpg"](top_n=10))
+        assert upstream == []
+
+
+# ---------------------------------------------------------------------------
+# Raw result-set parsing (no pandas)
+# ---------------------------------------------------------------------------
+
+class TestPayloadRows:
+    PAYLOAD = {
+        "resultSet": {
+            "headers": ["PLAYER_ID", "RANK", "PLAYER", "TEAM", "OREB", "REB"],
+            "rowSet": [
+                [1, 1, "Dennis Rodman", "DET", 523, 18.73],
+                [2, 2, "Moses Malone", "HOU", 450, 14.7],
+                [3, 3, "Charles Oakley", "NYK", 400, 12.1],
+            ],
+        }
+    }
+
+    def test_reads_named_columns(self):
+        rows = nba_client._payload_rows(self.PAYLOAD, "1991-92", "REB", 5, lambda v: round(float(v), 1))
+        assert rows[0] == {
+            "player": "Dennis Rodman", "team": "DET", "value": 18.7,
+            "is_rodman": True, "season": "1991-92",
+        }
+
+    def test_head_limits_rows(self):
+        rows = nba_client._payload_rows(self.PAYLOAD, "1991-92", "OREB", 2, int)
+        assert [r["player"] for r in rows] == ["Dennis Rodman", "Moses Malone"]
+
+    def test_matches_dataframe_parse(self):
+        pd = pytest.importorskip("pandas")
+        headers = self.PAYLOAD["resultSet"]["headers"]
+        df = pd.DataFrame(self.PAYLOAD["resultSet"]["rowSet"], columns=headers)
+        expected = [
+            (str(r.get("PLAYER")), str(r.get("TEAM")), int(r.get("OREB")))
+            for _, r in df.head(3).iterrows()
+        ]
+        rows = nba_client._payload_rows(self.PAYLOAD, "x", "OREB", 3, int)
+        assert [(r["player"], r["team"], r["value"]) for r in rows] == expected
+
+    def test_live_path_does_not_import_pandas(self):
+        import subprocess
+        import sys
+
+        code = (
+            "import sys; sys.path.insert(0, %r); import nba_client; "
+            "from nba_api.stats.library.http import NBAStatsHTTP; "
+            "print('pandas' in sys.modules)" % BACKEND_DIR
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        assert out.stdout.strip() == "False"
+
+
+# ---------------------------------------------------------------------------
+# Streaming top-K merge
+# ---------------------------------------------------------------------------
+
+def _reference_rank(rows, top_n):
+    """The pre-TopK algorithm: stable sort, first-seen dedupe, truncate."""
+    ordered = sorted(rows, key=lambda r: r["value"], reverse=True)
+    seen, unique = set(), []
+    for row in ordered:
+        if row["player"] not in seen:
+            seen.add(row["player"])
+            unique.append(row)
+        if len(unique) >= top_n:
+            break
+    return [(r["player"], r["value"], r["season"]) for r in unique]
+
+
+def _random_rows(n, players=30, seed=0):
+    rng = random.Random(seed)
+    return [
+        {"player": f"P{rng.randrange(players)}", "value": rng.randint(1, 40), "season": str(i)}
+        for i in range(n)
+    ]
+
+
+class TestTopK:
+    @pytest.mark.parametrize("seed", range(20))
+    @pytest.mark.parametrize("k", [1, 5, 25])
+    def test_matches_sort_then_dedupe(self, seed, k):
+        rows = _random_rows(300, seed=seed)       # small value range → plenty of ties
+        top = nba_client.TopK(k)
+        top.extend(rows)
+        got = [(r["player"], r["value"], r["season"]) for r in top.result()]
+        assert got == _reference_rank(rows, k)
+
+    def test_out_of_order_arrival_with_explicit_order(self):
+        rows = _random_rows(200, seed=7)
+        shuffled = list(enumerate(rows))
+        random.Random(1).shuffle(shuffled)
+        top = nba_client.TopK(10)
+        for order, row in shuffled:
+            top.push(row, order=order)
+        got = [(r["player"], r["value"], r["season"]) for r in top.result()]
+        assert got == _reference_rank(rows, 10)
+
+    def test_keeps_best_row_per_player(self):
+        top = nba_client.TopK(5)
+        top.push({"player": "Dennis Rodman", "value": 14.9, "season": "1996-97"})
+        top.push({"player": "Dennis Rodman", "value": 18.7, "season": "1991-92"})
+        top.push({"player": "Dennis Rodman", "value": 16.8, "season": "1994-95"})
+        result = top.result()
+        assert len(result) == 1
+        assert result[0]["season"] == "1991-92"
+
+    def test_memory_stays_bounded(self):
+        top = nba_client.TopK(5)
+        for row in _random_rows(5_000, players=1_000, seed=3):
+            top.push(row)
+        assert len(top) == 5
+        assert len(top._heap) <= 2 * 5 + 16 + 1
+
+    def test_push_reports_changes(self):
+        top = nba_client.TopK(1)
+        assert top.push({"player": "A", "value": 10}) is True
+        assert top.push({"player": "B", "value": 5}) is False
+        assert top.push({"player": "B", "value": 11}) is True
+
+    def test_result_is_ranked(self):
+        top = nba_client.TopK(3)
+        top.extend(_random_rows(50, seed=2))
+        assert [r["rank"] for r in top.result()] == [1, 2, 3]
+
+    def test_zero_k_is_empty(self):
+        top = nba_client.TopK(0)
+        top.extend(_random_rows(10))
+        assert top.result() == []
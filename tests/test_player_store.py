@@ -0,0 +1,110 @@
+"""
+test_player_store.py — Unit tests for player_store.py
+
+Covers: per-season parts, compaction, table reload, vectorised top-k with
+        best-per-player dedupe (checked against the live TopK).
+"""
+
+import os
+import random
+
+import pytest
+
+import nba_client
+import player_store
+
+
+@pytest.fixture(autouse=True)
+def store_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(player_store, "STORE_DIR", str(tmp_path))
+    player_store.clear_loaded()
+    yield tmp_path
+    player_store.clear_loaded()
+
+
+def _fill(stat="REB", per_mode="PerGame", seasons=("1991-92", "1992-93", "1993-94"), seed=0):
+    """Store random leader tables where players repeat across seasons."""
+    rng = random.Random(seed)
+    names = [f"Player {i}" for i in range(40)] + ["Dennis Rodman"]
+    for season in seasons:
+        rows = [(n, "TST", round(rng.uniform(5, 19), 1)) for n in rng.sample(names, 25)]
+        rows.sort(key=lambda r: -r[2])
+        player_store.save_season(stat, per_mode, season, rows)
+    player_store.compact(stat, per_mode)
+
+
+class TestWriteAndCompact:
+    def test_saved_season_is_reported(self):
+        player_store.save_season("REB", "PerGame", "1991-92", [("Dennis Rodman", "DET", 18.7)])
+        assert player_store.has_season("REB", "PerGame", "1991-92")
+        assert not player_store.has_season("REB", "PerGame", "1992-93")
+        assert player_store.stored_seasons("REB", "PerGame") == ["1991-92"]
+
+    def test_compact_concatenates_in_season_order(self):
+        player_store.save_season("REB", "PerGame", "1992-93", [("B", "DET", 18.3)])
+        player_store.save_season("REB", "PerGame", "1991-92", [("A", "DET", 18.7), ("C", "SEA", 16.0)])
+        assert player_store.compact("REB", "PerGame") == 3
+        table = player_store.load_table("REB", "PerGame")
+        assert list(table.season) == ["1991-92", "1991-92", "1992-93"]
+        assert list(table.player) == ["A", "C", "B"]
+
+    def test_no_temp_files_left(self, store_dir):
+        _fill()
+        leftovers = [f for _, _, files in os.walk(store_dir) for f in files if f.endswith(".tmp")]
+        assert leftovers == []
+
+    def test_missing_table_raises(self):
+        with pytest.raises(FileNotFoundError):
+            player_store.load_table("BLK", "Totals")
+
+    def test_recompacted_table_is_reloaded(self):
+        player_store.save_season("REB", "Totals", "1991-92", [("A", "DET", 1523.0)])
+        player_store.compact("REB", "Totals")
+        assert len(player_store.load_table("REB", "Totals").value) == 1
+        player_store.save_season("REB", "Totals", "1992-93", [("B", "DET", 1232.0)])
+        player_store.compact("REB", "Totals")
+        path = player_store.table_path("REB", "Totals")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert len(player_store.load_table("REB", "Totals").value) == 2
+
+
+def _reference(k, seasons=None):
+    """Live-path ranking over the same rows: TopK in table order."""
+    table = player_store.load_table("REB", "PerGame")
+    top = nba_client.TopK(k)
+    for season, player, value in zip(table.season, table.player, table.value):
+        if seasons is None or season in seasons:
+            top.push({"player": str(player), "value": float(value), "season": str(season)})
+    return [(r["player"], r["season"], r["value"]) for r in top.result()]
+
+
+class TestTopK:
+    @pytest.mark.parametrize("k", [1, 3, 10, 25, 100])
+    def test_matches_streaming_topk(self, k):
+        _fill(seasons=[f"{y}-{str(y + 1)[2:]}" for y in range(1980, 2000)])
+        got = [(p, s, v) for p, _, s, v in player_store.top_k("REB", "PerGame", k)]
+        assert got == _reference(k)
+
+    def test_one_row_per_player(self):
+        _fill(seasons=[f"{y}-{str(y + 1)[2:]}" for y in range(1980, 2000)])
+        players = [p for p, *_ in player_store.top_k("REB", "PerGame", 30)]
+        assert len(players) == len(set(players))
+
+    def test_ties_go_to_earlier_row(self):
+        player_store.save_season("REB", "PerGame", "1991-92", [("A", "DET", 15.0), ("B", "DET", 14.0)])
+        player_store.save_season("REB", "PerGame", "1992-93", [("C", "DET", 15.0), ("A", "DET", 15.0)])
+        player_store.compact("REB", "PerGame")
+        top = player_store.top_k("REB", "PerGame", 3)
+        assert [(p, s) for p, _, s, _ in top] == [("A", "1991-92"), ("C", "1992-93"), ("B", "1991-92")]
+
+    def test_season_filter(self):
+        _fill()
+        top = player_store.top_k("REB", "PerGame", 5, seasons=["1992-93"])
+        assert {s for _, _, s, _ in top} == {"1992-93"}
+        assert [(p, s, v) for p, _, s, v in top] == _reference(5, {"1992-93"})
+
+    def test_k_larger_than_players(self):
+        player_store.save_season("REB", "PerGame", "1991-92", [("A", "DET", 15.0), ("B", "DET", 14.0)])
+        player_store.compact("REB", "PerGame")
+        assert len(player_store.top_k("REB", "PerGame", 10)) == 2
@@ -0,0 +1,195 @@
+"""
+test_responses.py — Unit tests for responses.py
+
+Covers: JSON encoding parity with FastAPI, content hashing, raw Response wrapping,
+ETag/304 handling, TTL-aligned freshness headers, SSE framing,
+encoding negotiation and cached compressed variants.
+"""
+
+import asyncio
+import hashlib
+import gzip
+import json
+import threading
+import time
+
+import pytest
+
+import cache
+import responses
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _large():
+    return responses.encode({"ranking": [{"player": f"Player {i}", "value": i} for i in range(100)]})
+
+
+class TestEncode:
+    def test_body_is_compact_utf8_json(self):
+        encoded = responses.encode({"player": "Dennis Rodman", "icon": "🐛"})
+        assert encoded.body == '{"player":"Dennis Rodman","icon":"🐛"}'.encode("utf-8")
+
+    def test_round_trips(self):
+        payload = {"ranking": [{"rank": 1, "value": 18.7, "is_rodman": True}]}
+        assert json.loads(responses.encode(payload).body) == payload
+
+    def test_digest_is_sha256_of_body(self):
+        encoded = responses.encode({"a": 1})
+        assert encoded.digest == hashlib.sha256(encoded.body).hexdigest()
+
+    def test_matches_stdlib_json(self):
+        payload = {"ranking": [{"player": "Nikola Jokić", "value": 13.8, "team": None}], "n": 1}
+        expected = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        assert responses.encode(payload).body == expected
+
+    def test_equal_payloads_share_digest(self):
+        assert responses.encode({"a": 1}).digest == responses.encode({"a": 1}).digest
+        assert responses.encode({"a": 1}).digest != responses.encode({"a": 2}).digest
+
+
+class TestToResponse:
+    def test_wraps_stored_bytes(self):
+        encoded = responses.encode({"a": 1})
+        res = responses.to_response(encoded)
+        assert res.body == encoded.body
+        assert res.media_type == "application/json"
+
+    def test_strong_etag_from_digest(self):
+        encoded = responses.encode({"a": 1})
+        res = responses.to_response(encoded)
+        assert res.headers["etag"] == f'"{encoded.digest[:32]}"'
+
+    def test_matching_if_none_match_is_304(self):
+        encoded = responses.encode({"a": 1})
+        res = responses.to_response(encoded, if_none_match=f'"x", W/{encoded.etag}')
+        assert res.status_code == 304
+        assert res.body == b""
+        assert res.headers["etag"] == encoded.etag
+
+    def test_stale_if_none_match_sends_body(self):
+        encoded = responses.encode({"a": 1})
+        res = responses.to_response(encoded, if_none_match=responses.encode({"a": 2}).etag)
+        assert res.status_code == 200
+        assert res.body == encoded.body
+
+    def test_no_ttl_no_freshness_headers(self):
+        res = responses.to_response(responses.encode({"a": 1}))
+        assert "cache-control" not in res.headers
+
+
+class TestFreshness:
+    def test_age_counts_from_encode(self):
+        encoded = responses.encode({"a": 1})._replace(created_at=time.time() - 120)
+        headers = responses.freshness(encoded, 600)
+        assert headers["Cache-Control"] == "public, max-age=600"
+        assert headers["Age"] == "120"
+
+    def test_age_capped_at_ttl(self):
+        encoded = responses.encode({"a": 1})._replace(created_at=time.time() - 5000)
+        assert responses.freshness(encoded, 600)["Age"] == "600"
+
+    def test_unknown_age_must_revalidate(self):
+        encoded = responses.EncodedBody(b"{}", "0" * 64)
+        assert responses.freshness(encoded, 600) == {"Cache-Control": "no-cache"}
+
+    def test_304_carries_freshness(self):
+        encoded = responses.encode({"a": 1})
+        res = responses.to_response(encoded, if_none_match=encoded.etag, ttl=600)
+        assert res.status_code == 304
+        assert res.headers["cache-control"] == "public, max-age=600"
+        assert res.headers["age"] == "0"
+
+
+class TestSse:
+    def test_frames_event_and_json(self):
+        assert responses.sse("update", {"a": 1}) == b'event: update\ndata: {"a":1}\n\n'
+
+    def test_data_stays_on_one_line(self):
+        frame = responses.sse("final", {"text": "line\nbreak"})
+        assert frame.count(b"\n") == 3
+
+
+class TestCompression:
+    def test_large_body_gzipped_when_accepted(self):
+        encoded = _large()
+        res = responses.to_response(encoded, accept_encoding="gzip, deflate")
+        assert res.headers["content-encoding"] == "gzip"
+        assert res.headers["vary"] == "Accept-Encoding"
+        assert gzip.decompress(res.body) == encoded.body
+
+    def test_identity_without_accept_encoding(self):
+        encoded = _large()
+        res = responses.to_response(encoded)
+        assert "content-encoding" not in res.headers
+        assert res.body == encoded.body
+
+    def test_small_body_never_compressed(self):
+        res = responses.to_response(responses.encode({"a": 1}), accept_encoding="gzip")
+        assert "content-encoding" not in res.headers
+        assert "vary" not in res.headers
+
+    def test_etag_differs_per_encoding(self):
+        encoded = _large()
+        gzipped = responses.to_response(encoded, accept_encoding="gzip").headers["etag"]
+        plain = responses.to_response(encoded).headers["etag"]
+        assert gzipped == encoded.etag_for("gzip") != plain
+        assert responses.to_response(encoded, if_none_match=gzipped, accept_encoding="gzip").status_code == 304
+        assert responses.to_response(encoded, if_none_match=gzipped).status_code == 200
+
+    def test_variant_compressed_once(self, monkeypatch):
+        calls = []
+        real = responses._compress
+        monkeypatch.setattr(responses, "_compress", lambda body, enc: calls.append(enc) or real(body, enc))
+        encoded = _large()
+        for _ in range(3):
+            responses.to_response(encoded, accept_encoding="gzip")
+        assert calls == ["gzip"]
+        assert cache.get(f"encoded:gzip:{encoded.digest}") is not None
+
+    def test_one_off_bodies_not_cached(self):
+        encoded = _large()
+        responses.to_response(encoded, accept_encoding="gzip", reuse=False)
+        assert cache.get(f"encoded:gzip:{encoded.digest}") is None
+
+    def test_async_matches_sync(self):
+        encoded = _large()
+        res = asyncio.run(responses.to_response_async(encoded, accept_encoding="gzip"))
+        assert res.body == responses.to_response(encoded, accept_encoding="gzip").body
+        assert res.headers["etag"] == encoded.etag_for("gzip")
+
+    def test_async_compresses_off_the_loop(self, monkeypatch):
+        loop_thread = threading.get_ident()
+        threads = []
+        real = responses._compress
+        monkeypatch.setattr(responses, "_compress",
+                            lambda body, enc: threads.append(threading.get_ident()) or real(body, enc))
+        encoded = _large()
+        for reuse in (True, False):
+            asyncio.run(responses.to_response_async(encoded, accept_encoding="gzip", reuse=reuse))
+        assert len(threads) == 2 and loop_thread not in threads
+
+    def test_async_304_skips_compression(self, monkeypatch):
+        encoded = _large()
+        monkeypatch.setattr(responses, "_compress", lambda *a: pytest.fail("compressed"))
+        res = asyncio.run(responses.to_response_async(
+            encoded, if_none_match=encoded.etag_for("gzip"), accept_encoding="gzip"))
+        assert res.status_code == 304
+
+
+class TestNegotiate:
+    @pytest.mark.parametrize("header, expected", [
+        (None, "identity"),
+        ("gzip", "gzip"),
+        ("br, gzip", "br"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("identity;q=0, gzip;q=0", "identity"),
+        ("*", "br"),
+    ])
+    def test_preference_and_q_values(self, header, expected):
+        assert responses.negotiate(header, ("br", "gzip", "identity")) == expected
@@ -0,0 +1,119 @@
+"""
+test_scheduler.py — Unit tests for scheduler.py
+
+Covers: startup prewarm, periodic refresh of live feats, concurrency limit,
+        jittered refresh delay, error isolation.
+"""
+
+import asyncio
+import threading
+import time
+
+import scheduler
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def _make(warm=None, refresh=None, **overrides):
+    options = dict(
+        warm=warm or (lambda f: None),
+        refresh=refresh or (lambda f: None),
+        feat_ids=["a", "b", "c"],
+        live_feat_ids=["b"],
+        ttl=600,
+        concurrency=2,
+        lead=60,
+        jitter=0,
+    )
+    options.update(overrides)
+    return scheduler.RefreshScheduler(**options)
+
+
+class TestPrewarm:
+    def test_warms_every_feat(self):
+        warmed = []
+
+        async def scenario():
+            s = _make(warm=warmed.append)
+            await s.start()
+            await asyncio.sleep(0.1)
+            await s.stop()
+
+        _run(scenario())
+        assert sorted(warmed) == ["a", "b", "c"]
+
+    def test_respects_concurrency_limit(self):
+        state = {"running": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def slow_warm(feat_id):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.05)
+            with lock:
+                state["running"] -= 1
+
+        async def scenario():
+            s = _make(warm=slow_warm, feat_ids=list("abcdef"), concurrency=2)
+            await s.start()
+            await asyncio.sleep(0.3)
+            await s.stop()
+
+        _run(scenario())
+        assert state["peak"] == 2
+
+    def test_one_failure_does_not_stop_the_rest(self):
+        warmed = []
+
+        def flaky_warm(feat_id):
+            if feat_id == "a":
+                raise RuntimeError("upstream down")
+            warmed.append(feat_id)
+
+        async def scenario():
+            s = _make(warm=flaky_warm)
+            await s.start()
+            await asyncio.sleep(0.1)
+            await s.stop()
+
+        _run(scenario())
+        assert sorted(warmed) == ["b", "c"]
+
+    def test_warm_many_replaces_per_feat_warm(self):
+        batches, warmed = [], []
+
+        async def scenario():
+            s = _make(warm=warmed.append, warm_many=batches.append)
+            await s.start()
+            await asyncio.sleep(0.1)
+            await s.stop()
+
+        _run(scenario())
+        assert batches == [["a", "b", "c"]]
+        assert warmed == []
+
+
+class TestRefresh:
+    def test_refreshes_live_feats_before_ttl(self):
+        refreshed = []
+
+        async def scenario():
+            s = _make(refresh=refreshed.append, ttl=0.15, lead=0.1)
+            await s.start()
+            await asyncio.sleep(0.2)
+            await s.stop()
+
+        _run(scenario())
+        assert refreshed.count("b") >= 2
+        assert "a" not in refreshed
+
+    def test_delay_leads_ttl_with_jitter(self):
+        s = _make(ttl=600, lead=60, jitter=30)
+        delays = [s.next_delay() for _ in range(50)]
+        assert all(510 <= d <= 540 for d in delays)
+
+    def test_delay_never_negative(self):
+        assert _make(ttl=10, lead=60).next_delay() == 0
@@ -0,0 +1,116 @@
+"""
+test_static_assets.py — Unit tests for static_assets.py
+
+Covers: Accept-Encoding negotiation, fingerprinting and HTML rewriting,
+        precompressed variants, ETag / 304, cache headers.
+"""
+
+import gzip
+
+import pytest
+
+import static_assets
+
+CSS = "body { color: #c00; }\n" * 200
+JS = "console.log('worm');\n" * 200
+HTML = '<link rel="stylesheet" href="/style.css" />\n<script src="/app.js"></script>\n'
+
+
+@pytest.fixture
+def store(tmp_path):
+    (tmp_path / "style.css").write_text(CSS)
+    (tmp_path / "app.js").write_text(JS)
+    (tmp_path / "index.html").write_text(HTML)
+    (tmp_path / "tiny.txt").write_text("x")
+    return static_assets.AssetStore(str(tmp_path))
+
+
+class TestNegotiate:
+    AVAILABLE = {"identity": b"", "gzip": b"", "br": b""}
+
+    @pytest.mark.parametrize("header, expected", [
+        (None, "identity"),
+        ("", "identity"),
+        ("gzip", "gzip"),
+        ("gzip, deflate, br", "br"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("gzip;q=0, br;q=0", "identity"),
+        ("*", "br"),
+        ("deflate", "identity"),
+    ])
+    def test_choice(self, header, expected):
+        assert static_assets.negotiate(header, self.AVAILABLE) == expected
+
+    def test_only_offers_available_variants(self):
+        assert static_assets.negotiate("br, gzip", {"identity": b"", "gzip": b""}) == "gzip"
+
+
+class TestAssetStore:
+    def test_fingerprinted_urls(self, store):
+        assert store.urls["style.css"].startswith("/assets/style.")
+        assert store.urls["style.css"].endswith(".css")
+        assert store.get(store.urls["app.js"]).cache_control == static_assets.IMMUTABLE
+
+    def test_html_rewritten_to_fingerprints(self, store):
+        html = store.get("/index.html").variants["identity"].decode()
+        assert f'href="{store.urls["style.css"]}"' in html
+        assert f'src="{store.urls["app.js"]}"' in html
+        assert store.get("/index.html").cache_control == static_assets.REVALIDATE
+
+    def test_plain_names_still_served(self, store):
+        assert store.get("/style.css").variants == store.get(store.urls["style.css"]).variants
+        assert store.get("/style.css").cache_control == static_assets.REVALIDATE
+
+    def test_gzip_variant_round_trips(self, store):
+        asset = store.get("/app.js")
+        assert gzip.decompress(asset.variants["gzip"]).decode() == JS
+        assert len(asset.variants["gzip"]) < len(asset.variants["identity"])
+
+    def test_incompressible_file_has_identity_only(self, store):
+        assert set(store.get("/tiny.txt").variants) == {"identity"}
+
+    def test_content_change_changes_fingerprint(self, tmp_path, store):
+        before = store.urls["style.css"]
+        (tmp_path / "style.css").write_text(CSS + "p {}\n")
+        store.load()
+        assert store.urls["style.css"] != before
+        assert store.get(before) is None
+
+
+class TestRespond:
+    def test_gzip_response_headers(self, store):
+        resp = store.respond("/app.js", "gzip", None)
+        assert resp.headers["content-encoding"] == "gzip"
+        assert resp.headers["vary"] == "Accept-Encoding"
+        assert resp.headers["etag"].endswith('-gzip"')
+        assert "javascript" in resp.headers["content-type"]
+
+    def test_identity_response(self, store):
+        resp = store.respond("/style.css", None, None)
+        assert "content-encoding" not in resp.headers
+        assert resp.body == CSS.encode()
+
+    def test_304_on_matching_etag(self, store):
+        etag = store.respond("/app.js", "gzip", None).headers["etag"]
+        resp = store.respond("/app.js", "gzip", etag)
+        assert resp.status_code == 304
+        assert resp.body == b""
+        assert resp.headers["etag"] == etag
+
+    def test_weak_and_listed_etags_match(self, store):
+        etag = store.respond("/app.js", None, None).headers["etag"]
+        assert store.respond("/app.js", None, f'"other", W/{etag}').status_code == 304
+
+    def test_etag_is_per_encoding(self, store):
+        etag = store.respond("/app.js", "gzip", None).headers["etag"]
+        assert store.respond("/app.js", None, etag).status_code == 200
+
+    def test_etag_matches_api_bodies(self, store):
+        import responses
+        asset = store.get("/app.js")
+        body = responses.EncodedBody(asset.variants["identity"], asset.digest)
+        assert asset.etag("gzip") == body.etag_for("gzip")
+        assert asset.etag("identity") == body.etag
+
+    def test_unknown_path(self, store):
+        assert store.respond("/nope.js", None, None) is None
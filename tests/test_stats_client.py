@@ -0,0 +1,87 @@
+"""
+test_stats_client.py — Unit tests for stats_client.py
+
+All traffic goes through httpx.MockTransport — no real network.
+Covers: request shape, shared pooled client, timeouts, result-set parsing.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+import stats_client
+
+PAYLOAD = {
+    "resource": "leagueleaders",
+    "resultSet": {
+        "name": "LeagueLeaders",
+        "headers": ["PLAYER_ID", "RANK", "PLAYER", "TEAM", "REB"],
+        "rowSet": [[23, 1, "Dennis Rodman", "DET", 18.7]],
+    },
+}
+
+
+@pytest.fixture
+def transport():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json=PAYLOAD)
+
+    stats_client.use_transport(httpx.MockTransport(handler))
+    yield seen
+    stats_client.use_transport(None)
+
+
+class TestLeagueLeaders:
+    def test_returns_raw_payload(self, transport):
+        payload = asyncio.run(stats_client.league_leaders("1991-92", "REB", "PerGame"))
+        assert payload == PAYLOAD
+
+    def test_sends_expected_query(self, transport):
+        asyncio.run(stats_client.league_leaders("1991-92", "OREB", "Totals"))
+        request = transport[0]
+        assert request.url.path.endswith("/leagueleaders")
+        assert request.url.params["Season"] == "1991-92"
+        assert request.url.params["StatCategory"] == "OREB"
+        assert request.url.params["PerMode"] == "Totals"
+        assert request.headers["Referer"] == "https://www.nba.com/"
+
+    def test_http_error_raises(self):
+        stats_client.use_transport(httpx.MockTransport(lambda r: httpx.Response(429)))
+        try:
+            with pytest.raises(httpx.HTTPStatusError):
+                asyncio.run(stats_client.league_leaders("1991-92", "REB", "PerGame"))
+        finally:
+            stats_client.use_transport(None)
+
+
+class TestSharedClient:
+    def test_client_is_reused(self, transport):
+        assert stats_client.get_client() is stats_client.get_client()
+
+    def test_custom_transport_honoured(self, transport):
+        assert isinstance(stats_client.get_client()._transport, httpx.MockTransport)
+
+    def test_aclose_resets_client(self, transport):
+        first = stats_client.get_client()
+        asyncio.run(stats_client.aclose())
+        assert first.is_closed
+        assert stats_client.get_client() is not first
+
+
+class TestResultSet:
+    def test_reads_single_result_set(self):
+        headers, rows = stats_client.result_set(PAYLOAD)
+        assert headers[2] == "PLAYER"
+        assert rows[0][2] == "Dennis Rodman"
+
+    def test_reads_result_sets_list(self):
+        payload = {"resultSets": [PAYLOAD["resultSet"]]}
+        assert stats_client.result_set(payload)[1] == PAYLOAD["resultSet"]["rowSet"]
+
+    def test_missing_result_set_raises(self):
+        with pytest.raises(ValueError):
+            stats_client.result_set({})